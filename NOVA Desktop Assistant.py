@@ -1,27 +1,18 @@
+import time
+_STARTED = time.perf_counter()      # for NOVA_STARTUP_TRACE
+
 import customtkinter as ctk
-import speech_recognition as sr
-import pyttsx3
-import webbrowser
-import threading
 import os
 import sys
-import subprocess
-import json
-import math
-import re
-import difflib
-
-try:
-    import pythoncom
-except ImportError:
-    pythoncom = None
 
-try:
-    import win32gui
-    import win32con
-except ImportError:
-    win32gui = None
-    win32con = None
+# Only what the first window needs is imported here. Speech recognition,
+# audio capture, TTS, numpy, psutil and the win32 modules are imported by
+# NovaEngine.load_voice_stack() when the assistant is first activated.
+from nova.animation import Animator, ButtonGlow, PulseRing
+from nova.engine import NovaEngine, LISTENING, PROCESSING, STANDBY
+from nova.storage import user_data_dir
+from nova.ui_bus import UiBus
+from nova.virtual_list import VirtualList, filter_commands
 
 
 def resource_path(relative_path):
@@ -33,19 +24,16 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 
-def user_data_path(filename):
-    """Get path for writable user data files (config, settings).
-    Stored in %APPDATA%/NOVA/ so they persist across EXE updates."""
-    appdata = os.environ.get("APPDATA", os.path.expanduser("~"))
-    nova_dir = os.path.join(appdata, "NOVA")
-    os.makedirs(nova_dir, exist_ok=True)
-    return os.path.join(nova_dir, filename)
-
-
-CONFIG_FILE = user_data_path("nova_commands.json")
-SETTINGS_FILE = user_data_path("nova_settings.json")
 ICON_PATH = resource_path("nova.ico")
 
+# Where commands lived before they moved to %APPDATA%\NOVA
+LEGACY_COMMAND_FILES = [
+    os.path.join(os.path.dirname(sys.executable if getattr(sys, 'frozen', False) else __file__), "nova_commands.json"),
+    "nova_commands.json",
+    "stark_commands.json",
+    "anna_commands.json",
+]
+
 
 COLORS = {
     "bg":           "#0A0A0F",   # Deep space background
@@ -69,6 +57,8 @@ COLORS = {
     "warn_hover":   "#FB8C00",
 }
 
+UI_FRAME_MS = 33
+
 FONT = "Segoe UI"
 SPACING = {
     "xs": 4,
@@ -79,16 +69,94 @@ SPACING = {
     "xxl": 32,
 }
 
+COMMAND_ROW_HEIGHT = 72      # one command card plus the gap below it
 
-class NovaAssistant(ctk.CTk):
-    WAKE_TRIGGERS = [
-        "nova", "noah", "nora", "novah", "nover", "novar",
-        "know va", "now a", "no va", "now va", "nor va",
-        "nova.", "no ah", "nova!", "noaa", "over",
-        "novaa", "novas", "novo", "nava", "neva",
-        "norva", "nova's", "knova", "gnova",
-    ]
 
+class CommandRow:
+    """One recyclable card in the command library list.
+
+    The widgets are built once; bind() only swaps the texts, so a row can
+    show any command as the list scrolls.
+    """
+
+    def __init__(self, app, parent):
+        self.app = app
+        self.key = None
+        self.card = ctk.CTkFrame(
+            parent,
+            fg_color=COLORS["surface2"],
+            corner_radius=12,
+            border_width=1,
+            border_color=COLORS["border"],
+            height=COMMAND_ROW_HEIGHT - SPACING["sm"]
+        )
+        self.card.pack_propagate(False)
+
+        content = ctk.CTkFrame(self.card, fg_color="transparent")
+        content.pack(fill="both", expand=True, padx=SPACING["md"], pady=SPACING["sm"])
+
+        info_frame = ctk.CTkFrame(content, fg_color="transparent")
+        info_frame.pack(side="left", fill="x", expand=True)
+
+        self.name_label = ctk.CTkLabel(
+            info_frame, text="",
+            font=app.font(13, "bold"),
+            text_color=COLORS["text"], anchor="w"
+        )
+        self.name_label.pack(anchor="w")
+
+        self.link_label = ctk.CTkLabel(
+            info_frame, text="",
+            font=app.font(11),
+            text_color=COLORS["text_dim"], anchor="w"
+        )
+        self.link_label.pack(anchor="w", pady=(2, 0))
+
+        actions = ctk.CTkFrame(content, fg_color="transparent")
+        actions.pack(side="right")
+
+        ctk.CTkButton(
+            actions, text="✎",
+            width=36, height=36, corner_radius=8,
+            font=app.font(14, family=None),
+            fg_color=COLORS["surface3"],
+            hover_color=COLORS["warn"],
+            text_color=COLORS["text_dim"],
+            border_width=1,
+            border_color=COLORS["border_focus"],
+            command=lambda: app.open_add_edit_dialog(
+                self.key, app.engine.custom_commands.get(self.key), app._menu_win
+            )
+        ).pack(side="left", padx=2)
+
+        ctk.CTkButton(
+            actions, text="×",
+            width=36, height=36, corner_radius=8,
+            font=app.font(18, family=None),
+            fg_color=COLORS["surface3"],
+            hover_color=COLORS["danger"],
+            text_color=COLORS["text_dim"],
+            border_width=1,
+            border_color=COLORS["border_focus"],
+            command=lambda: app.delete_function(self.key)
+        ).pack(side="left", padx=2)
+
+        for widget in (self.card, content, info_frame, self.name_label, self.link_label):
+            widget.bind("<MouseWheel>", app._on_funcs_wheel)
+
+    def bind(self, key, link):
+        self.key = key
+        self.name_label.configure(text=key.title())
+        self.link_label.configure(text=link if len(link) < 40 else link[:37] + "...")
+
+    def place(self, y):
+        self.card.place(x=0, y=y, relwidth=1)
+
+    def hide(self):
+        self.card.place_forget()
+
+
+class NovaAssistant(ctk.CTk):
     def __init__(self):
         super().__init__()
 
@@ -105,26 +173,20 @@ class NovaAssistant(ctk.CTk):
             self.after(200, lambda: self.iconbitmap(ICON_PATH))
 
 
-        self.is_running = False
-        self.recognizer = sr.Recognizer()
-        self.thread = None
-        self.apps = {}
-        self.custom_commands = {}
-        self._pulse_after_id = None
-        self._glow_after_id = None
-        self._pulse_angle = 0
-
-
-        self.recognizer.energy_threshold = 250
-        self.recognizer.dynamic_energy_threshold = True
-        self.recognizer.dynamic_energy_adjustment_damping = 0.15
-        self.recognizer.dynamic_energy_ratio = 1.1
-        self.recognizer.pause_threshold = 0.5
-        self.recognizer.non_speaking_duration = 0.4
+        self._menu_win = None        # dialogs are built on first open, then reused
+        self._guide_win = None
+        self._fonts = {}
+        self.funcs_list = None
+        # Status widgets are only configured on the Tk thread, via this bus
+        self.ui = UiBus()
 
-
-        self.load_custom_commands()
-        self.load_settings()
+        # Everything but the window: commands, settings, matching, the voice loop
+        self.engine = NovaEngine(
+            user_data_dir(),
+            legacy_paths=LEGACY_COMMAND_FILES,
+            on_state=self._show_state,
+            on_log=lambda text: self.ui.post("status_log", text=text),
+        )
 
 
         self.grid_rowconfigure(1, weight=1)
@@ -132,10 +194,21 @@ class NovaAssistant(ctk.CTk):
         self.grid_columnconfigure(0, weight=1)
 
         self._build_ui()
-        threading.Thread(target=self.load_installed_apps, daemon=True).start()
+        self._ui_widgets = {
+            "header_status": self.header_status,
+            "subtitle_label": self.subtitle_label,
+            "status_badge": self.status_badge,
+            "status_log": self.status_log,
+        }
+        self._pump_ui()
+
+        # Catalog and folder indexes load once the window is up, off the Tk thread
+        self.after(300, self.engine.start_background_loads)
+
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # Auto-activate if enabled
-        if self.stay_active:
+        if self.engine.stay_active:
             self.after(600, self.start_assistant)
 
 
@@ -261,95 +334,62 @@ class NovaAssistant(ctk.CTk):
         )
         self.status_log.pack(pady=SPACING["md"], padx=SPACING["lg"])
 
-    def _start_pulse(self):
-        self._pulse_angle = 0
-        self._pulse_tick()
-
-    def _pulse_tick(self):
-        if not self.is_running:
-            self.ring_canvas.delete("pulse")
-            return
-
-        center = 120
-        radius = 100
-        self._pulse_angle = (self._pulse_angle + 2) % 360
-
-
-        self.ring_canvas.delete("pulse")
-
-
-        start_angle = self._pulse_angle
-        extent = 120
-        self.ring_canvas.create_arc(
-            center - radius, center - radius,
-            center + radius, center + radius,
-            start=start_angle, extent=extent,
-            outline=COLORS["accent_glow"], width=3,
-            style="arc", tags="pulse"
-        )
-
-
-        start_angle2 = (self._pulse_angle + 180) % 360
-        extent2 = 80
-        self.ring_canvas.create_arc(
-            center - radius, center - radius,
-            center + radius, center + radius,
-            start=start_angle2, extent=extent2,
-            outline=COLORS["accent_dim"], width=2,
-            style="arc", tags="pulse"
+        # Ring pulse and button glow: items are created once and only updated per frame
+        self.animator = Animator(
+            self,
+            is_minimized=lambda: self.state() == "iconic",
+            has_focus=lambda: self.focus_displayof() is not None,
         )
+        self.animator.add(PulseRing(
+            self.ring_canvas, center, 100, COLORS["accent_glow"], COLORS["accent_dim"]
+        ))
+        self.animator.add(ButtonGlow(self.toggle_btn, COLORS["danger"], COLORS["danger_hover"]))
+
+    def _show_dialog(self, win, parent, width, height):
+        """Center a dialog on its parent, show it and make it modal."""
+        x = parent.winfo_x() + (parent.winfo_width() // 2) - width // 2
+        y = parent.winfo_y() + (parent.winfo_height() // 2) - height // 2
+        win.geometry(f"+{x}+{y}")
+        win.deiconify()
+        win.lift()
+        win.grab_set()
 
+    def _hide_dialog(self, win):
+        """Withdraw a cached dialog instead of destroying it."""
+        win.grab_release()
+        win.withdraw()
+
+    def _cached_dialog(self, win):
+        return win is not None and win.winfo_exists()
+
+    def font(self, size, weight="normal", family=FONT):
+        """A shared CTkFont, created once per (family, size, weight)."""
+        key = (family, size, weight)
+        font = self._fonts.get(key)
+        if font is None:
+            if family is None:
+                font = ctk.CTkFont(size=size, weight=weight)
+            else:
+                font = ctk.CTkFont(family=family, size=size, weight=weight)
+            self._fonts[key] = font
+        return font
 
-        pulse_phase = (self._pulse_angle % 360) / 360.0
-        inner_radius = 95 + 5 * math.sin(pulse_phase * 2 * math.pi)
-        alpha = int(50 + 30 * math.sin(pulse_phase * 2 * math.pi))
-        
-        self._pulse_after_id = self.after(20, self._pulse_tick)  # 50 fps
-
-    def _stop_pulse(self):
-        if self._pulse_after_id:
-            self.after_cancel(self._pulse_after_id)
-            self._pulse_after_id = None
-        self.ring_canvas.delete("pulse")
-
-    def _start_button_glow(self):
-        self._glow_phase = 0
-        self._button_glow_tick()
-
-    def _button_glow_tick(self):
-        if not self.is_running:
+    def open_menu(self):
+        # Built on first open, then hidden and re-shown
+        if self._cached_dialog(self._menu_win):
+            self.stay_active_var.set(self.engine.stay_active)
+            self._show_dialog(self._menu_win, self, 560, 520)
             return
 
-        self._glow_phase = (self._glow_phase + 1) % 120
-        intensity = 0.5 + 0.5 * math.sin((self._glow_phase / 120) * 2 * math.pi)
-        
-
-        if intensity > 0.7:
-            self.toggle_btn.configure(fg_color=COLORS["danger"])
-        else:
-            self.toggle_btn.configure(fg_color=COLORS["danger_hover"])
-
-        self._glow_after_id = self.after(50, self._button_glow_tick)
-
-    def _stop_button_glow(self):
-        if self._glow_after_id:
-            self.after_cancel(self._glow_after_id)
-            self._glow_after_id = None
-
-
-    def open_menu(self):
         win = ctk.CTkToplevel(self)
         win.title("Settings")
         win.geometry("560x520")
         win.configure(fg_color=COLORS["bg"])
         win.transient(self)
-        win.grab_set()
         win.resizable(False, False)
-
-        # Center on parent
-        x = self.winfo_x() + (self.winfo_width() // 2) - 280
-        y = self.winfo_y() + (self.winfo_height() // 2) - 260
-        win.geometry(f"+{x}+{y}")
+        win.protocol("WM_DELETE_WINDOW", lambda: self._hide_dialog(win))
+        self._menu_win = win
+        self._show_dialog(win, self, 560, 520)
 
 
         header = ctk.CTkFrame(win, fg_color=COLORS["surface"], corner_radius=0, height=64)
@@ -370,6 +410,19 @@ class NovaAssistant(ctk.CTk):
         btn_container.pack(side="right", pady=SPACING["md"])
 
 
+        ctk.CTkButton(
+            btn_container, text="Import",
+            font=self.font(13, "bold"),
+            width=80, height=38, corner_radius=10,
+            fg_color=COLORS["surface3"],
+            hover_color=COLORS["accent_dim"],
+            text_color=COLORS["text_dim"],
+            border_width=1,
+            border_color=COLORS["border"],
+            command=lambda: self._import_dialog(win)
+        ).pack(side="left", padx=(0, SPACING["sm"]))
+
+
         ctk.CTkButton(
             btn_container, text="\U0001F4D6 Guide",
             font=ctk.CTkFont(family=FONT, size=13, weight="bold"),
@@ -394,20 +447,54 @@ class NovaAssistant(ctk.CTk):
         ).pack(side="left")
 
 
-        list_frame = ctk.CTkFrame(win, fg_color="transparent")
-        list_frame.pack(fill="both", expand=True, padx=SPACING["lg"], pady=SPACING["md"])
+        self.funcs_search = ctk.CTkEntry(
+            win, height=36, corner_radius=10,
+            font=self.font(13),
+            fg_color=COLORS["surface2"],
+            border_width=1,
+            border_color=COLORS["border"],
+            text_color=COLORS["text"],
+            placeholder_text="Search commands"
+        )
+        self.funcs_search.pack(fill="x", padx=SPACING["lg"], pady=(SPACING["md"], 0))
+        self.funcs_search.bind("<KeyRelease>", lambda e: self.refresh_functions_list())
 
-        self.funcs_scroll = ctk.CTkScrollableFrame(
-            list_frame,
+        list_frame = ctk.CTkFrame(
+            win,
             fg_color=COLORS["surface"],
             corner_radius=12,
             border_width=1,
-            border_color=COLORS["border"],
-            scrollbar_button_color=COLORS["border"],
-            scrollbar_button_hover_color=COLORS["accent"]
+            border_color=COLORS["border"]
         )
-        self.funcs_scroll.pack(fill="both", expand=True)
-        self.refresh_functions_list(self.funcs_scroll, win)
+        list_frame.pack(fill="both", expand=True, padx=SPACING["lg"], pady=SPACING["md"])
+
+        self.funcs_scrollbar = ctk.CTkScrollbar(
+            list_frame,
+            button_color=COLORS["border"],
+            button_hover_color=COLORS["accent"],
+            command=self._on_funcs_scrollbar
+        )
+        self.funcs_scrollbar.pack(side="right", fill="y", padx=(0, SPACING["xs"]), pady=SPACING["sm"])
+
+        # Only the cards in view exist; they are reused as the list scrolls
+        self.funcs_view = ctk.CTkFrame(list_frame, fg_color="transparent")
+        self.funcs_view.pack(side="left", fill="both", expand=True, padx=(SPACING["sm"], 0), pady=SPACING["sm"])
+        self.funcs_view.bind("<Configure>", self._on_funcs_resize)
+        self.funcs_view.bind("<MouseWheel>", self._on_funcs_wheel)
+
+        self.funcs_empty = ctk.CTkLabel(
+            self.funcs_view, text="",
+            font=self.font(15, "bold"),
+            text_color=COLORS["text_dim"]
+        )
+        self.funcs_list = VirtualList(
+            create=lambda: CommandRow(self, self.funcs_view),
+            bind=lambda row, key: row.bind(key, self.engine.custom_commands.get(key, "")),
+            place=lambda row, y: row.place(y),
+            hide=lambda row: row.hide(),
+            row_height=COMMAND_ROW_HEIGHT
+        )
+        self.refresh_functions_list()
 
 
         footer = ctk.CTkFrame(win, fg_color=COLORS["surface2"], corner_radius=12, height=70)
@@ -421,7 +508,7 @@ class NovaAssistant(ctk.CTk):
         left_frame = ctk.CTkFrame(footer_content, fg_color="transparent")
         left_frame.pack(side="left", fill="y")
 
-        self.stay_active_var = ctk.BooleanVar(value=self.stay_active)
+        self.stay_active_var = ctk.BooleanVar(value=self.engine.stay_active)
         stay_switch = ctk.CTkSwitch(
             left_frame, text="",
             width=48, height=24,
@@ -448,19 +535,27 @@ class NovaAssistant(ctk.CTk):
             text_color=COLORS["text_muted"], anchor="w"
         ).pack(anchor="w")
 
+    def _close_commands_guide(self, guide):
+        self._hide_dialog(guide)
+        # Hand the grab back to the settings window underneath
+        if self._cached_dialog(self._menu_win) and self._menu_win.winfo_viewable():
+            self._menu_win.grab_set()
+
     def _open_commands_guide(self, parent_window):
+        # The guide is static: build it once and re-show it afterwards
+        if self._cached_dialog(self._guide_win):
+            self._show_dialog(self._guide_win, parent_window, 520, 580)
+            return
+
         guide = ctk.CTkToplevel(self)
         guide.title("Commands Guide")
         guide.geometry("520x580")
         guide.configure(fg_color=COLORS["bg"])
         guide.transient(parent_window)
-        guide.grab_set()
         guide.resizable(False, False)
-
-        # Center on parent
-        x = parent_window.winfo_x() + (parent_window.winfo_width() // 2) - 260
-        y = parent_window.winfo_y() + (parent_window.winfo_height() // 2) - 290
-        guide.geometry(f"+{x}+{y}")
+        guide.protocol("WM_DELETE_WINDOW", lambda: self._close_commands_guide(guide))
+        self._guide_win = guide
+        self._show_dialog(guide, parent_window, 520, 580)
 
         # Header
         header = ctk.CTkFrame(guide, fg_color=COLORS["surface"], corner_radius=0, height=60)
@@ -479,7 +574,7 @@ class NovaAssistant(ctk.CTk):
             fg_color="transparent",
             hover_color=COLORS["danger"],
             text_color=COLORS["text_dim"],
-            command=guide.destroy
+            command=lambda: self._close_commands_guide(guide)
         ).pack(side="right", padx=SPACING["lg"])
 
 
@@ -589,94 +684,40 @@ class NovaAssistant(ctk.CTk):
             text_color=COLORS["text_dim"]
         ).pack(expand=True)
 
-    def refresh_functions_list(self, scroll_frame, parent_window):
-        for w in scroll_frame.winfo_children():
-            w.destroy()
-
-        if not self.custom_commands:
-            empty_frame = ctk.CTkFrame(scroll_frame, fg_color="transparent")
-            empty_frame.pack(pady=60)
-
-            ctk.CTkLabel(
-                empty_frame, text="📋",
-                font=ctk.CTkFont(size=48),
-                text_color=COLORS["text_muted"]
-            ).pack()
-
-            ctk.CTkLabel(
-                empty_frame, text="No commands yet",
-                font=ctk.CTkFont(family=FONT, size=15, weight="bold"),
-                text_color=COLORS["text_dim"]
-            ).pack(pady=(SPACING["sm"], 0))
-
-            ctk.CTkLabel(
-                empty_frame, text="Click 'Add New' to create your first command",
-                font=ctk.CTkFont(family=FONT, size=12),
-                text_color=COLORS["text_muted"]
-            ).pack()
+    def refresh_functions_list(self, changed=()):
+        """Re-filter the command list. Rows for keys in `changed` are rebound;
+        every other visible row is only moved."""
+        if self.funcs_list is None or not self._cached_dialog(self._menu_win):
             return
+        items = filter_commands(self.engine.custom_commands, self.funcs_search.get())
+        self.funcs_list.set_items(items, changed)
+        self._sync_funcs_scrollbar()
 
-        for idx, (name, link) in enumerate(self.custom_commands.items()):
-            # Command card
-            card = ctk.CTkFrame(
-                scroll_frame,
-                fg_color=COLORS["surface2"],
-                corner_radius=12,
-                border_width=1,
-                border_color=COLORS["border"]
-            )
-            card.pack(fill="x", pady=SPACING["xs"], padx=SPACING["sm"])
-
-
-            content = ctk.CTkFrame(card, fg_color="transparent")
-            content.pack(fill="x", padx=SPACING["md"], pady=SPACING["md"])
+        if items:
+            self.funcs_empty.place_forget()
+        else:
+            text = "No matching commands" if self.engine.custom_commands else "No commands yet — click '+ Add New'"
+            self.funcs_empty.configure(text=text)
+            self.funcs_empty.place(relx=0.5, rely=0.4, anchor="center")
 
+    def _sync_funcs_scrollbar(self):
+        self.funcs_scrollbar.set(*self.funcs_list.fraction())
 
-            info_frame = ctk.CTkFrame(content, fg_color="transparent")
-            info_frame.pack(side="left", fill="x", expand=True)
+    def _on_funcs_resize(self, event):
+        self.funcs_list.resize(event.height)
+        self._sync_funcs_scrollbar()
 
-            ctk.CTkLabel(
-                info_frame, text=name.title(),
-                font=ctk.CTkFont(family=FONT, size=13, weight="bold"),
-                text_color=COLORS["text"], anchor="w"
-            ).pack(anchor="w")
+    def _on_funcs_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.funcs_list.scroll_to_fraction(float(args[1]))
+        elif args[0] == "scroll":
+            step = self.funcs_list.height if args[2] == "pages" else COMMAND_ROW_HEIGHT
+            self.funcs_list.scroll_by(int(args[1]) * step)
+        self._sync_funcs_scrollbar()
 
-            link_display = link if len(link) < 40 else link[:37] + "..."
-            ctk.CTkLabel(
-                info_frame, text=link_display,
-                font=ctk.CTkFont(family=FONT, size=11),
-                text_color=COLORS["text_dim"], anchor="w"
-            ).pack(anchor="w", pady=(2, 0))
-
-
-            actions = ctk.CTkFrame(content, fg_color="transparent")
-            actions.pack(side="right")
-
-
-            ctk.CTkButton(
-                actions, text="✎",
-                width=36, height=36, corner_radius=8,
-                font=ctk.CTkFont(size=14),
-                fg_color=COLORS["surface3"],
-                hover_color=COLORS["warn"],
-                text_color=COLORS["text_dim"],
-                border_width=1,
-                border_color=COLORS["border_focus"],
-                command=lambda n=name, l=link: self.open_add_edit_dialog(n, l, parent_window)
-            ).pack(side="left", padx=2)
-
-
-            ctk.CTkButton(
-                actions, text="×",
-                width=36, height=36, corner_radius=8,
-                font=ctk.CTkFont(size=18),
-                fg_color=COLORS["surface3"],
-                hover_color=COLORS["danger"],
-                text_color=COLORS["text_dim"],
-                border_width=1,
-                border_color=COLORS["border_focus"],
-                command=lambda n=name: self.delete_function(n, scroll_frame, parent_window)
-            ).pack(side="left", padx=2)
+    def _on_funcs_wheel(self, event):
+        self.funcs_list.scroll_by(-int(event.delta / 120) * COMMAND_ROW_HEIGHT // 2)
+        self._sync_funcs_scrollbar()
 
     def open_add_edit_dialog(self, edit_name, edit_link, parent_window):
         dlg = ctk.CTkToplevel(self)
@@ -758,12 +799,11 @@ class NovaAssistant(ctk.CTk):
             if not new_name or not new_link:
                 return
             if edit_name and edit_name != new_name:
-                self.custom_commands.pop(edit_name, None)
-            self.custom_commands[new_name] = new_link
-            self.save_custom_commands()
+                self.engine.custom_commands.pop(edit_name, None)
+            self.engine.custom_commands[new_name] = new_link
+            self.engine.save_custom_commands()
             dlg.destroy()
-            if hasattr(self, "funcs_scroll") and self.funcs_scroll.winfo_exists():
-                self.refresh_functions_list(self.funcs_scroll, parent_window)
+            self.refresh_functions_list(changed=[new_name])
 
 
         ctk.CTkButton(
@@ -776,571 +816,135 @@ class NovaAssistant(ctk.CTk):
             command=save
         ).pack(fill="x")
 
-    def delete_function(self, name, scroll_frame, parent_window):
-        self.custom_commands.pop(name, None)
-        self.save_custom_commands()
-        self.refresh_functions_list(scroll_frame, parent_window)
+    def delete_function(self, name):
+        self.engine.custom_commands.pop(name, None)
+        self.engine.save_custom_commands()
+        self.refresh_functions_list()
 
 
-    def load_custom_commands(self):
-        if not os.path.exists(CONFIG_FILE):
+    def _import_dialog(self, parent_window):
+        from tkinter import filedialog
 
-            old_locations = [
-                os.path.join(os.path.dirname(sys.executable if getattr(sys, 'frozen', False) else __file__), "nova_commands.json"),
-                "nova_commands.json",
-                "stark_commands.json",
-                "anna_commands.json",
+        path = filedialog.askopenfilename(
+            parent=parent_window,
+            title="Import commands",
+            filetypes=[
+                ("Command libraries", "*.jsonl *.ndjson *.csv *.html *.htm"),
+                ("All files", "*.*"),
             ]
-            for legacy in old_locations:
-                if os.path.exists(legacy):
-                    try:
-                        with open(legacy, "r") as f:
-                            self.custom_commands = json.load(f)
-                        # Save to new location
-                        self.save_custom_commands()
-                        break
-                    except:
-                        pass
-        else:
-            try:
-                with open(CONFIG_FILE, "r") as f:
-                    self.custom_commands = json.load(f)
-            except:
-                self.custom_commands = {}
-
-    def save_custom_commands(self):
-        try:
-            with open(CONFIG_FILE, "w") as f:
-                json.dump(self.custom_commands, f, indent=4)
-        except:
-            pass
-
-    def load_installed_apps(self):
-        try:
-            paths = [
-                os.path.join(os.environ.get("ProgramData", ""), "Microsoft", "Windows", "Start Menu", "Programs"),
-                os.path.join(os.environ.get("APPDATA", ""), "Microsoft", "Windows", "Start Menu", "Programs"),
-            ]
-            for p in paths:
-                if not os.path.exists(p):
-                    continue
-                for root, _, files in os.walk(p):
-                    for f in files:
-                        if f.lower().endswith((".lnk", ".exe", ".url")):
-                            self.apps[os.path.splitext(f)[0].lower()] = os.path.join(root, f)
-
-            ps = "Get-StartApps | Select-Object Name, AppID | ConvertTo-Json -Compress"
-            res = subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps],
-                capture_output=True, text=True, encoding="utf-8", errors="ignore"
-            )
-            if res.returncode == 0 and res.stdout.strip():
-                data = json.loads(res.stdout)
-                if isinstance(data, dict):
-                    data = [data]
-                for item in data:
-                    n, i = item.get("Name", "").lower(), item.get("AppID")
-                    if n and i:
-                        self.apps[n] = i
-        except:
-            pass
-
-
-    def _find_folder_on_drive(self, folder_name, drive_letter):
-        """Find a folder on any drive by name using fuzzy matching.
-        Works with any drive letter (M, C, E, D, etc.)."""
-        drive_root = f"{drive_letter.upper()}:\\"
-        if not os.path.exists(drive_root):
-            return None
+        )
+        if not path:
+            return
         try:
+            report = self.engine.import_commands(path)
+        except (OSError, ValueError) as e:
+            print(f"[Nova] Import failed: {e}")
+            self.ui.post("status_log", text="Import failed")
+            return
+        self.refresh_functions_list(changed=report.updated)
+        self.ui.post("status_log", text=f"Import: {report.summary()}")
 
-            folders = {}
-            for entry in os.scandir(drive_root):
-                if entry.is_dir():
-                    folders[entry.name.lower()] = entry.path
-
-            name = folder_name.lower().strip()
-
-
-            if name in folders:
-                return folders[name]
-
-
-            matches = difflib.get_close_matches(name, folders.keys(), n=1, cutoff=0.5)
-            if matches:
-                return folders[matches[0]]
-
-
-            for fname, fpath in folders.items():
-                if name in fname or fname in name:
-                    return fpath
-        except Exception:
-            pass
-        return None
-
-    def _parse_drive_command(self, command):
-        """Parse commands like 'open internship from m drive' or 'open photos from e drive'.
-        Returns (folder_name, drive_letter) or (None, None)."""
-
-        pattern = r'^open\s+(.+?)\s+from\s+([a-z])\s*drive$'
-        match = re.match(pattern, command.lower().strip())
-        if match:
-            return match.group(1).strip(), match.group(2).strip()
-        return None, None
-
-
-    def _get_window_keywords(self, app_name):
-        """Return a list of window-title keywords to search for a given app."""
-        app_lower = app_name.lower()
-        keyword_map = {
-            "chrome":        ["google chrome", "chrome"],
-            "google chrome":  ["google chrome", "chrome"],
-            "firefox":       ["mozilla firefox", "firefox"],
-            "edge":          ["microsoft edge", "edge"],
-            "microsoft edge": ["microsoft edge", "edge"],
-            "file explorer":  ["file explorer", "explorer"],
-            "explorer":      ["file explorer", "explorer"],
-            "notepad":       ["notepad"],
-            "vs code":       ["visual studio code"],
-            "visual studio code": ["visual studio code"],
-            "code":          ["visual studio code"],
-            "word":          ["word"],
-            "excel":         ["excel"],
-            "powerpoint":    ["powerpoint"],
-            "spotify":       ["spotify"],
-            "discord":       ["discord"],
-            "telegram":      ["telegram"],
-            "whatsapp":      ["whatsapp"],
-            "calculator":    ["calculator"],
-            "cmd":           ["command prompt", "cmd.exe"],
-            "command prompt": ["command prompt", "cmd.exe"],
-            "terminal":      ["terminal", "windows terminal", "command prompt"],
-        }
-        return keyword_map.get(app_lower, [app_lower])
-
-    def _switch_to_window(self, app_name):
-        """Try to bring an already-open window of the app to the foreground.
-        Returns True if a window was found and activated, False otherwise."""
-        if not win32gui or not win32con:
-            return False
-
-        keywords = self._get_window_keywords(app_name)
-        found_hwnd = None
-
-        def enum_handler(hwnd, _):
-            nonlocal found_hwnd
-            if found_hwnd:
-                return
-            if not win32gui.IsWindowVisible(hwnd):
-                return
-            title = win32gui.GetWindowText(hwnd).lower()
-            if not title:
-                return
-            for kw in keywords:
-                if kw in title:
-                    found_hwnd = hwnd
-                    return
-
-        try:
-            win32gui.EnumWindows(enum_handler, None)
-        except Exception:
-            pass
-
-        if found_hwnd:
-            try:
-
-                if win32gui.IsIconic(found_hwnd):
-                    win32gui.ShowWindow(found_hwnd, win32con.SW_RESTORE)
-
-                win32gui.SetForegroundWindow(found_hwnd)
-                return True
-            except Exception:
-                return False
-        return False
-
-    def load_settings(self):
-        self.stay_active = False
-        if os.path.exists(SETTINGS_FILE):
-            try:
-                with open(SETTINGS_FILE, "r") as f:
-                    data = json.load(f)
-                self.stay_active = data.get("stay_active", False)
-            except:
-                pass
-
-    def save_settings(self):
-        try:
-            with open(SETTINGS_FILE, "w") as f:
-                json.dump({"stay_active": self.stay_active}, f, indent=4)
-        except:
-            pass
+    def _on_close(self):
+        self.engine.close()
+        self.destroy()
 
     def toggle_stay_active(self):
-        self.stay_active = self.stay_active_var.get()
-        self.save_settings()
+        self.engine.stay_active = self.stay_active_var.get()
+        self.engine.save_settings()
 
 
     def toggle_assistant(self):
-        if not self.is_running:
+        if not self.engine.is_running:
             self.start_assistant()
         else:
             self.stop_assistant()
 
     def start_assistant(self):
-        self.is_running = True
-
-
         self.toggle_btn.configure(
             text="LISTENING",
             fg_color=COLORS["danger"],
             hover_color=COLORS["danger_hover"]
         )
-        self.subtitle_label.configure(
-            text='Listening for "Nova" command',
-            text_color=COLORS["success_glow"]
-        )
-        self.status_badge.configure(
-            text="Online",
-            text_color=COLORS["success"],
-            fg_color=COLORS["surface2"]
-        )
-        self.header_status.configure(
-            text="● Online",
-            text_color=COLORS["success_glow"]
-        )
-
-
-        self._start_pulse()
-        self._start_button_glow()
-
-        self.speak("Nova online.")
-
-
-        self.thread = threading.Thread(target=self.run_loop, daemon=True)
-        self.thread.start()
+        self.animator.start()
+        self.engine.start()
 
     def stop_assistant(self):
-        self.is_running = False
-
-
-        self._stop_pulse()
-        self._stop_button_glow()
+        self.engine.stop()
 
+        self.animator.stop()
+        print(f"[Nova] Animation: {self.animator.stats.snapshot()}")
+        print(f"[Nova] UI updates: {self.ui.stats()}")
 
         self.toggle_btn.configure(
             text="ACTIVATE",
             fg_color=COLORS["accent"],
             hover_color=COLORS["accent_hover"]
         )
-        self.subtitle_label.configure(
-            text="Desktop Voice Assistant",
-            text_color=COLORS["text_dim"]
-        )
-        self.status_badge.configure(
-            text="Ready",
-            text_color=COLORS["text_muted"],
-            fg_color=COLORS["surface2"]
-        )
-        self.header_status.configure(
-            text="● Standby",
-            text_color=COLORS["text_dim"]
-        )
-        self.status_log.configure(text='Say  "Nova"  to begin')
-
-    def init_engine(self):
-        engine = pyttsx3.init()
-        engine.setProperty("rate", 165)
-        voices = engine.getProperty("voices")
-        for v in voices:
-            if "zira" in v.name.lower() or "female" in v.name.lower():
-                engine.setProperty("voice", v.id)
-                break
-        return engine
-
-    def speak(self, text):
-        self.status_log.configure(text=f"Nova: {text}")
-        try:
-            if pythoncom:
-                pythoncom.CoInitialize()
-            engine = self.init_engine()
-            engine.say(text)
-            engine.runAndWait()
-            if pythoncom:
-                pythoncom.CoUninitialize()
-        except:
-            pass
-
-    def speak_async(self, text):
-        self.status_log.configure(text=f"Nova: {text}")
-        threading.Thread(target=self._speak_worker, args=(text,), daemon=True).start()
-
-    def _speak_worker(self, text):
-        try:
-            if pythoncom:
-                pythoncom.CoInitialize()
-            engine = self.init_engine()
-            engine.say(text)
-            engine.runAndWait()
-            if pythoncom:
-                pythoncom.CoUninitialize()
-        except:
-            pass
-
-
-    def close_application(self, app_name):
-
-        self.speak(f"Closing {app_name}")
-
-
-        process_map = {
-            "chrome":       ["chrome.exe"],
-            "google chrome": ["chrome.exe"],
-            "firefox":      ["firefox.exe"],
-            "edge":         ["msedge.exe"],
-            "microsoft edge": ["msedge.exe"],
-            "notepad":      ["notepad.exe"],
-            "calculator":   ["CalculatorApp.exe", "Calculator.exe"],
-            "calc":         ["CalculatorApp.exe", "Calculator.exe"],
-            "spotify":      ["Spotify.exe"],
-            "discord":      ["Discord.exe"],
-            "telegram":     ["Telegram.exe"],
-            "whatsapp":     ["WhatsApp.exe"],
-            "vs code":      ["Code.exe"],
-            "visual studio code": ["Code.exe"],
-            "code":         ["Code.exe"],
-            "word":         ["WINWORD.EXE"],
-            "excel":        ["EXCEL.EXE"],
-            "powerpoint":   ["POWERPNT.EXE"],
-            "file explorer": ["explorer.exe"],
-            "explorer":     ["explorer.exe"],
-            "vlc":          ["vlc.exe"],
-            "obs":          ["obs64.exe", "obs32.exe"],
-            "teams":        ["ms-teams.exe", "Teams.exe"],
-            "zoom":         ["Zoom.exe"],
-            "slack":        ["slack.exe"],
-            "skype":        ["Skype.exe"],
-        }
-
-        app_lower = app_name.lower().strip()
-        killed = False
-
-
-        for key, proc_names in process_map.items():
-            if key in app_lower or app_lower in key:
-                for proc in proc_names:
-                    try:
-                        subprocess.run(
-                            f"taskkill /F /IM {proc}",
-                            shell=True, capture_output=True
-                        )
-                        killed = True
-                    except:
-                        pass
-                if killed:
-                    return
 
-        try:
-            search_name = re.sub(r'[^a-zA-Z0-9]', '', app_lower)
-            ps_cmd = f'Get-Process | Where-Object {{$_.ProcessName -like "*{search_name}*"}} | Stop-Process -Force'
-            subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_cmd],
-                capture_output=True, timeout=5
+    def _show_state(self, state):
+        """Engine callback, from any thread: reflect the state in the status widgets."""
+        if state == LISTENING:
+            self.ui.post(
+                "subtitle_label",
+                text='Listening for "Nova" command',
+                text_color=COLORS["success_glow"]
             )
-        except:
-            pass
-
-
-        try:
-            proc = app_lower
-            if not proc.endswith(".exe"):
-                proc += ".exe"
-            subprocess.run(
-                f"taskkill /F /IM {proc}",
-                shell=True, capture_output=True
+            self.ui.post(
+                "status_badge",
+                text="Online",
+                text_color=COLORS["success"],
+                fg_color=COLORS["surface2"]
             )
-        except:
-            pass
-
-    def process_command(self, command):
-        command = command.lower()
-
-
-        if command.startswith("close "):
-            self.close_application(command.replace("close ", "").strip())
-            return
-
-
-        for key, link in self.custom_commands.items():
-            if f"open {key}" in command or key in command:
-                self.speak(f"Opening {key}")
-                if link.startswith("http") or link.startswith("www"):
-                    webbrowser.open(link)
-                else:
-                    try:
-                        os.startfile(link)
-                    except:
-                        subprocess.Popen(["explorer", link], shell=True)
-                return
-
-
-        folder_name, drive_letter = self._parse_drive_command(command)
-        if folder_name and drive_letter:
-            folder_path = self._find_folder_on_drive(folder_name, drive_letter)
-            if folder_path:
-                folder_display = os.path.basename(folder_path)
-                self.speak(f"Opening {folder_display} from {drive_letter.upper()} drive")
-                subprocess.Popen(["explorer", folder_path])
-            else:
-                self.speak(f"Could not find {folder_name} on {drive_letter.upper()} drive")
-            return
-
-
-        drive_root_match = re.match(r'^open\s+([a-z])\s*drive$', command.strip())
-        if drive_root_match:
-            dl = drive_root_match.group(1).upper()
-            drive_path = f"{dl}:\\"
-            if os.path.exists(drive_path):
-                self.speak(f"Opening {dl} drive")
-                subprocess.Popen(["explorer", drive_path])
-            else:
-                self.speak(f"{dl} drive not found")
-            return
-
-
-        if command.startswith("open "):
-            target = command.replace("open ", "").strip()
-
-
-            if self._switch_to_window(target):
-                self.speak(f"Switching to {target}")
-                return
-
-
-            launch_path = self.apps.get(target)
-            if not launch_path:
-                matches = sorted([k for k in self.apps if target in k], key=len)
-                if matches:
-                    launch_path = self.apps[matches[0]]
-                    target = matches[0]
-            if launch_path:
-                self.speak(f"Opening {target}")
-                try:
-                    if os.path.exists(launch_path):
-                        os.startfile(launch_path)
-                    else:
-                        subprocess.Popen(["explorer", f"shell:AppsFolder\\{launch_path}"])
-                except:
-                    pass
-                return
-
-
-        if "command prompt" in command or "terminal" in command:
-
-            if self._switch_to_window("terminal"):
-                self.speak("Switching to Terminal")
-            else:
-                self.speak("Opening Terminal")
-                os.system("start cmd")
-
-
-    def _is_wake_word(self, heard_text):
-
-        heard = heard_text.lower().strip()
-
-
-        for trigger in self.WAKE_TRIGGERS:
-            if trigger in heard:
-                return True
-
-
-        words = heard.split()
-        for w in words:
-
-            w_clean = re.sub(r'[^a-z]', '', w)
-            if not w_clean:
-                continue
-            ratio = difflib.SequenceMatcher(None, w_clean, "nova").ratio()
-            if ratio >= 0.6:  # 60% similarity threshold
-                return True
-
-        return False
-
-    def run_loop(self):
-        if pythoncom:
-            pythoncom.CoInitialize()
-
-        try:
-
-            with sr.Microphone() as source:
-
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.8)
-                print(f"[Nova] Calibrated. Energy threshold: {self.recognizer.energy_threshold}")
-
-                while self.is_running:
-                    try:
-
-                        try:
-                            audio = self.recognizer.listen(
-                                source, timeout=3, phrase_time_limit=3
-                            )
-                        except sr.WaitTimeoutError:
-                            continue
-
-                        if not self.is_running:
-                            break
-
-                        try:
-                            word = self.recognizer.recognize_google(audio).lower()
-                            print(f"Heard: {word}")
-                        except (sr.UnknownValueError, sr.RequestError):
-                            continue
-
-
-                        if self._is_wake_word(word):
-
-                            self.speak_async("Yes boss!")
-                            self.subtitle_label.configure(
-                                text="Processing command...",
-                                text_color=COLORS["warn"]
-                            )
-                            self.status_badge.configure(
-                                text="Processing",
-                                text_color=COLORS["warn"]
-                            )
-
-
-                            try:
-                                a2 = self.recognizer.listen(
-                                    source, timeout=5, phrase_time_limit=8
-                                )
-                                cmd = self.recognizer.recognize_google(a2)
-                                self.status_log.configure(text=f"Command: {cmd}")
-                                self.process_command(cmd)
-                            except sr.WaitTimeoutError:
-                                self.speak("Timed out.")
-                            except sr.UnknownValueError:
-                                self.speak("Could not understand.")
-
-
-                            self.subtitle_label.configure(
-                                text='Listening for "Nova" command',
-                                text_color=COLORS["success_glow"]
-                            )
-                            self.status_badge.configure(
-                                text="Online",
-                                text_color=COLORS["success"]
-                            )
-
-                    except Exception as e:
-                        print(f"Error in loop: {e}")
-
-        except Exception as e:
-            print(f"Microphone error: {e}")
+            self.ui.post(
+                "header_status",
+                text="● Online",
+                text_color=COLORS["success_glow"]
+            )
+        elif state == PROCESSING:
+            self.ui.post(
+                "subtitle_label",
+                text="Processing command...",
+                text_color=COLORS["warn"]
+            )
+            self.ui.post(
+                "status_badge",
+                text="Processing",
+                text_color=COLORS["warn"]
+            )
+        elif state == STANDBY:
+            self.ui.post(
+                "subtitle_label",
+                text="Desktop Voice Assistant",
+                text_color=COLORS["text_dim"]
+            )
+            self.ui.post(
+                "status_badge",
+                text="Ready",
+                text_color=COLORS["text_muted"],
+                fg_color=COLORS["surface2"]
+            )
+            self.ui.post(
+                "header_status",
+                text="● Standby",
+                text_color=COLORS["text_dim"]
+            )
+            self.ui.post("status_log", text='Say  "Nova"  to begin')
 
-        if pythoncom:
-            pythoncom.CoUninitialize()
+    def _pump_ui(self):
+        """Apply everything background threads posted since the last frame."""
+        self.engine.drain_action_results()
+        self.ui.apply(lambda name, options: self._ui_widgets[name].configure(**options))
+        self.after(UI_FRAME_MS, self._pump_ui)
 
 
 if __name__ == "__main__":
     app = NovaAssistant()
+    # NOVA_STARTUP_TRACE=1 prints the time to the first drawn window; =exit also quits
+    trace = os.environ.get("NOVA_STARTUP_TRACE")
+    if trace:
+        app.update()
+        print(f"[Nova] First window after {(time.perf_counter() - _STARTED) * 1000:.0f} ms")
+        if trace == "exit":
+            app.destroy()
+            sys.exit(0)
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""Fire many commands at the action executor at once and check the outcomes.
+
+Headless: fake actions sleep like app launches, TTS or PowerShell calls,
+some raise, and some hang past their timeout. A burst of submitters then
+checks four things. Every accepted action reports exactly one outcome.
+Overflow is rejected, not blocked. Hung actions don't starve the pool.
+And the submitting thread (run_loop) never waits on an action.
+
+Usage: python benchmarks/bench_action_executor.py [--commands 400] [--threads 8]
+"""
+import argparse
+import collections
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.actions import ActionExecutor  # noqa: E402
+
+
+def fake_action(kind, duration):
+    if kind == "fail":
+        raise RuntimeError("launch failed")
+    time.sleep(duration)
+    return kind
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=8, help="concurrent submitters")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--queue", type=int, default=64)
+    parser.add_argument("--interval-ms", type=float, default=20.0, help="pause between one thread's submits")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    plan = []
+    for _ in range(args.commands):
+        r = rng.random()
+        if r < 0.02:
+            plan.append(("hang", 2.0, 0.3))       # exceeds its 0.3 s timeout
+        elif r < 0.07:
+            plan.append(("fail", 0.0, None))
+        else:
+            plan.append(("open", rng.uniform(0.001, 0.02), None))
+
+    executor = ActionExecutor(workers=args.workers, max_queue=args.queue, default_timeout=5.0).start()
+    accepted = []
+    lock = threading.Lock()
+    submit_times = []
+
+    def submitter(items):
+        local, times = [], []
+        for kind, duration, timeout in items:
+            start = time.perf_counter()
+            action = executor.submit(kind, fake_action, kind, duration, timeout=timeout)
+            times.append(time.perf_counter() - start)
+            if action is not None:
+                local.append(action)
+            time.sleep(args.interval_ms / 1000.0)
+        with lock:
+            accepted.extend(local)
+            submit_times.extend(times)
+
+    chunks = [plan[i::args.threads] for i in range(args.threads)]
+    threads = [threading.Thread(target=submitter, args=(c,)) for c in chunks]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for action in accepted:
+        action.wait(10)
+    elapsed = time.perf_counter() - start
+
+    reported = collections.Counter()
+    while not executor.results.empty():
+        reported[executor.results.get().id] += 1
+    outcomes = collections.Counter(a.status for a in accepted)
+    duplicates = sum(1 for n in reported.values() if n > 1)
+    missing = sum(1 for a in accepted if a.id not in reported)
+
+    print(f"{args.commands} commands from {args.threads} threads, {args.workers} workers, queue {args.queue}")
+    print(f"accepted {len(accepted)}, rejected {executor.rejected}, max queue depth {executor.max_depth}")
+    print(f"outcomes: {dict(outcomes)}")
+    print(f"results reported: {sum(reported.values())}, missing {missing}, duplicated {duplicates}")
+    print(f"submit latency: max {max(submit_times) * 1e6:.0f} us, "
+          f"mean {sum(submit_times) / len(submit_times) * 1e6:.1f} us")
+    print(f"wall time {elapsed:.2f} s, live workers {len(executor._threads)}")
+    for name, s in sorted(executor.stats.snapshot().items()):
+        print(f"  {name:5s} n={s['count']:4d} avg run {s['avg_run'] * 1000:7.1f} ms  "
+              f"avg wait {s['avg_wait'] * 1000:7.1f} ms  max wait {s['wait_max'] * 1000:7.1f} ms")
+    executor.shutdown(wait=False)
+    if missing or duplicates:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Canvas/widget calls and frame time of the ring animation, old ticks vs Animator.
+
+Replays a simulated session on a virtual clock with fake canvas and button
+objects that count calls. Each call is charged --call-us of busy time, a
+stand-in for the Tcl round trip plus redraw. The old code ran
+_pulse_tick every 20 ms (delete + two create_arc) and _button_glow_tick every
+50 ms (configure every time). The Animator updates items in place, only
+configures the button when its colour flips, and drops its rate when the
+window loses focus or is minimised.
+
+Usage: python benchmarks/bench_animation.py [--seconds 60] [--unfocused 0.5] [--minimized 0.2]
+"""
+import argparse
+import heapq
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.animation import Animator, ButtonGlow, PulseRing  # noqa: E402
+
+
+def busy(us):
+    end = time.perf_counter() + us / 1e6
+    while time.perf_counter() < end:
+        pass
+
+
+class FakeRoot:
+    """after()/after_cancel() on a virtual clock."""
+
+    def __init__(self):
+        self.now = 0.0
+        self._queue = []
+        self._seq = 0
+        self._cancelled = set()
+
+    def after(self, ms, fn):
+        self._seq += 1
+        heapq.heappush(self._queue, (self.now + ms / 1000.0, self._seq, fn))
+        return self._seq
+
+    def after_cancel(self, ident):
+        self._cancelled.add(ident)
+
+    def run_until(self, end):
+        while self._queue and self._queue[0][0] <= end:
+            when, seq, fn = heapq.heappop(self._queue)
+            if seq in self._cancelled:
+                continue
+            self.now = when
+            fn()
+        self.now = end
+
+
+class FakeCanvas:
+    def __init__(self, cost_us):
+        self.calls = 0
+        self.cost_us = cost_us
+        self._next = 1
+
+    def _call(self):
+        self.calls += 1
+        busy(self.cost_us)
+
+    def create_arc(self, *args, **kwargs):
+        self._call()
+        self._next += 1
+        return self._next
+
+    def delete(self, tag):
+        self._call()
+
+    def itemconfigure(self, item, **kwargs):
+        self._call()
+
+
+class FakeButton:
+    def __init__(self, cost_us):
+        self.calls = 0
+        self.cost_us = cost_us
+
+    def configure(self, **kwargs):
+        self.calls += 1
+        busy(self.cost_us)
+
+
+def window_state(t, seconds, unfocused, minimized):
+    """(minimized, focused) for a session that loses focus, then gets minimised."""
+    if t >= seconds * (1 - minimized):
+        return True, False
+    if t >= seconds * (1 - minimized - unfocused):
+        return False, False
+    return False, True
+
+
+def legacy(seconds, cost_us, state):
+    """The old _pulse_tick / _button_glow_tick pair. Neither knew about window state."""
+    root, canvas, button = FakeRoot(), FakeCanvas(cost_us), FakeButton(cost_us)
+    cpu = [0.0]
+    angle = [0]
+    glow = [0]
+
+    def pulse():
+        c0 = time.process_time()
+        angle[0] = (angle[0] + 2) % 360
+        canvas.delete("pulse")
+        canvas.create_arc(0, 0, 200, 200, start=angle[0], extent=120)
+        canvas.create_arc(0, 0, 200, 200, start=(angle[0] + 180) % 360, extent=80)
+        phase = (angle[0] % 360) / 360.0
+        95 + 5 * math.sin(phase * 2 * math.pi)
+        int(50 + 30 * math.sin(phase * 2 * math.pi))
+        cpu[0] += time.process_time() - c0
+        root.after(20, pulse)
+
+    def button_glow():
+        c0 = time.process_time()
+        glow[0] = (glow[0] + 1) % 120
+        intensity = 0.5 + 0.5 * math.sin((glow[0] / 120) * 2 * math.pi)
+        button.configure(fg_color="a" if intensity > 0.7 else "b")
+        cpu[0] += time.process_time() - c0
+        root.after(50, button_glow)
+
+    pulse()
+    button_glow()
+    root.run_until(seconds)
+    return canvas.calls, button.calls, cpu[0]
+
+
+def animated(seconds, cost_us, state):
+    root, canvas, button = FakeRoot(), FakeCanvas(cost_us), FakeButton(cost_us)
+    anim = Animator(
+        root,
+        is_minimized=lambda: state(root.now)[0],
+        has_focus=lambda: state(root.now)[1],
+        clock=lambda: root.now,
+    )
+    anim.add(PulseRing(canvas, 120, 100, "a", "b"))
+    anim.add(ButtonGlow(button, "a", "b"))
+    anim.start()
+    root.run_until(seconds)
+    frames = anim.stats.frames
+    cpu = anim.stats.cpu
+    anim.stop()
+    return canvas.calls, button.calls, cpu, frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--unfocused", type=float, default=0.5, help="fraction of the session unfocused")
+    parser.add_argument("--minimized", type=float, default=0.2, help="fraction of the session minimised")
+    parser.add_argument("--call-us", type=float, default=40.0)
+    args = parser.parse_args()
+
+    def state(t):
+        return window_state(t, args.seconds, args.unfocused, args.minimized)
+
+    lc, lb, lcpu = legacy(args.seconds, args.call_us, state)
+    nc, nb, ncpu, frames = animated(args.seconds, args.call_us, state)
+    print(f"{args.seconds:.0f} s session: {1 - args.unfocused - args.minimized:.0%} focused, "
+          f"{args.unfocused:.0%} unfocused, {args.minimized:.0%} minimised; {args.call_us:.0f} us per call")
+    print(f"legacy   canvas calls {lc:6d}  button configures {lb:5d}  cpu {lcpu * 1000:7.0f} ms "
+          f"({lcpu / args.seconds:.1%} of a core)")
+    print(f"animator canvas calls {nc:6d}  button configures {nb:5d}  cpu {ncpu * 1000:7.0f} ms "
+          f"({ncpu / args.seconds:.1%} of a core)  {frames} frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Check the app catalog's cache and incremental rescans on a generated tree.
+
+Headless: two temp Start Menu roots with --dirs nested folders of
+shortcuts, a scanner that counts the directories it reads, and a fake
+enumerator standing in for Get-StartApps. It checks:
+
+    build     every shortcut and enumerator app is in the catalog, and an
+              enumerator entry wins over a shortcut of the same name
+    cache     save_cache() then load_cache() in a new catalog gives the
+              same apps, and an unchanged tree rescans nothing
+    rescan    a shortcut added to one folder rescans only that folder; a
+              removed folder rescans only its parent and its apps go
+    diff      refresh_enumerator() reports exactly what was added, changed
+              and removed, and nothing on a second call
+
+Exits 1 if any check fails.
+
+Usage: python benchmarks/bench_app_catalog.py [--dirs 300] [--per-dir 5]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.apps import AppCatalog, scan_directory  # noqa: E402
+
+WORDS = ["studio", "player", "editor", "viewer", "manager", "tools", "cloud", "office",
+         "paint", "notes", "mail", "chat", "music", "photos", "maps", "code"]
+
+
+def generate(root, dirs, per_dir, rng):
+    """`dirs` nested folders under `root`, each with `per_dir` shortcuts."""
+    folders = [root]
+    names = set()
+    for i in range(dirs):
+        path = os.path.join(rng.choice(folders), f"{rng.choice(WORDS)} {i}")
+        os.mkdir(path)
+        folders.append(path)
+    for folder in folders:
+        for _ in range(per_dir):
+            name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {len(names)}"
+            with open(os.path.join(folder, name + rng.choice((".lnk", ".url"))), "w"):
+                pass
+            names.add(name)
+    return folders[1:], names
+
+
+def touch(path):
+    """Move a directory's mtime on by a second, so coarse file systems see the change."""
+    mtime = os.stat(path).st_mtime_ns + 1_000_000_000
+    os.utime(path, ns=(mtime, mtime))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dirs", type=int, default=300)
+    parser.add_argument("--per-dir", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base = tempfile.mkdtemp(prefix="nova-apps-")
+    failures = []
+
+    def check(ok, message):
+        if not ok:
+            failures.append(message)
+
+    try:
+        roots = [os.path.join(base, "machine"), os.path.join(base, "user")]
+        folders, names = [], set()
+        for root in roots:
+            os.mkdir(root)
+            f, n = generate(root, args.dirs // 2, args.per_dir, rng)
+            folders += f
+            names |= n
+        shortcut = sorted(names)[0]
+        start_apps = {"calculator": "Microsoft.WindowsCalculator_8wekyb3d8bbwe!App",
+                      "photos": "Microsoft.Windows.Photos_8wekyb3d8bbwe!App",
+                      shortcut: "Contoso.App_1!App"}
+        scanned = []
+
+        def scanner(path):
+            scanned.append(path)
+            return scan_directory(path)
+
+        def make():
+            return AppCatalog(roots, os.path.join(base, "apps.json"), scanner=scanner,
+                              enumerator=lambda: dict(start_apps))
+
+        catalog = make()
+        start = time.perf_counter()
+        catalog.refresh_dirs()
+        catalog.refresh_enumerator()
+        cold = time.perf_counter() - start
+        print(f"cold build:        {cold * 1000:7.1f} ms  ({len(scanned)} dirs scanned, {len(catalog.apps)} apps)")
+        check(names <= set(catalog.apps), f"{len(names - set(catalog.apps))} shortcuts missing after the build")
+        check(all(catalog.apps.get(k) == v for k, v in start_apps.items()),
+              "enumerator apps missing or overridden by a shortcut")
+        catalog.save_cache()
+
+        warm = make()
+        start = time.perf_counter()
+        loaded = warm.load_cache()
+        load = time.perf_counter() - start
+        check(loaded and warm.apps == catalog.apps, "the cache did not round-trip")
+        del scanned[:]
+        start = time.perf_counter()
+        changed = warm.refresh_dirs()
+        unchanged = time.perf_counter() - start
+        print(f"cache load:        {load * 1000:7.1f} ms")
+        print(f"unchanged refresh: {unchanged * 1000:7.1f} ms  ({len(scanned)} dirs rescanned, changed={changed})")
+        check(not changed and not scanned, f"an unchanged tree rescanned {len(scanned)} dirs")
+
+        folder = rng.choice(folders)
+        with open(os.path.join(folder, "fresh app.lnk"), "w"):
+            pass
+        touch(folder)
+        del scanned[:]
+        warm.refresh_dirs()
+        print(f"one new shortcut:  {len(scanned)} dirs rescanned")
+        check(scanned == [folder], f"a new shortcut rescanned {len(scanned)} dirs, expected 1")
+        check("fresh app" in warm.apps, "the new shortcut is not in the catalog")
+
+        leaf = next(f for f in reversed(folders) if not any(g.startswith(f + os.sep) for g in folders))
+        gone = {os.path.splitext(e)[0].lower() for e in os.listdir(leaf)}
+        shutil.rmtree(leaf)
+        touch(os.path.dirname(leaf))
+        del scanned[:]
+        warm.refresh_dirs()
+        print(f"one folder gone:   {len(scanned)} dirs rescanned, {len(gone & set(warm.apps))} of its apps left")
+        check(scanned == [os.path.dirname(leaf)], f"a removed folder rescanned {len(scanned)} dirs, expected 1")
+        check(not (gone - set(start_apps)) & set(warm.apps), "apps of the removed folder are still listed")
+
+        del start_apps["calculator"]
+        start_apps["photos"] = "Microsoft.Windows.Photos_8wekyb3d8bbwe!App2"
+        start_apps["terminal"] = "Microsoft.WindowsTerminal_8wekyb3d8bbwe!App"
+        added, removed = warm.refresh_enumerator()
+        print(f"enumerator diff:   added {sorted(added)}, removed {sorted(removed)}")
+        check(added == {"photos", "terminal"} and removed == {"calculator"}, "wrong enumerator diff")
+        check("calculator" not in warm.apps and warm.apps.get("terminal") == start_apps["terminal"],
+              "the enumerator diff was not applied")
+        check(warm.refresh_enumerator() == (set(), set()), "an unchanged enumerator reported a diff")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
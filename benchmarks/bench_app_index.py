@@ -0,0 +1,94 @@
+"""Benchmark "open X" app resolution against a synthetic app catalog.
+
+Compares the fuzzy trigram index with the old substring scan + sort over
+every app name, and reports how many misheard names each one resolves.
+
+Usage: python benchmarks/bench_app_index.py [--apps 50000] [--queries 2000]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.matching import FuzzyIndex  # noqa: E402
+
+VENDORS = ["microsoft", "adobe", "google", "jetbrains", "mozilla", "autodesk", "oracle", ""]
+PRODUCTS = ["studio", "player", "editor", "viewer", "manager", "tools", "cloud", "office"]
+
+
+def make_apps(n, rng):
+    apps = set()
+    while len(apps) < n:
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9)))
+        parts = [rng.choice(VENDORS), word, rng.choice(PRODUCTS) if rng.random() < 0.5 else ""]
+        apps.add(" ".join(p for p in parts if p))
+    return sorted(apps)
+
+
+def mishear(name, rng):
+    """Drop, swap or replace one letter, like a speech-recognition slip."""
+    chars = list(name)
+    i = rng.randrange(len(chars))
+    op = rng.randrange(3)
+    if op == 0:
+        del chars[i]
+    elif op == 1 and i + 1 < len(chars):
+        chars[i], chars[i + 1] = chars[i + 1], chars[i]
+    else:
+        chars[i] = rng.choice(string.ascii_lowercase)
+    return "".join(chars)
+
+
+def linear_lookup(apps, target):
+    """What process_command used to do after an exact-key miss."""
+    if target in apps:
+        return target
+    matches = sorted([k for k in apps if target in k], key=len)
+    return matches[0] if matches else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--apps", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = make_apps(args.apps, rng)
+    apps = dict.fromkeys(names, "path")
+
+    start = time.perf_counter()
+    index = FuzzyIndex(names)
+    build = time.perf_counter() - start
+
+    picks = [rng.choice(names) for _ in range(args.queries)]
+    typos = [(mishear(n, rng), n) for n in picks]
+    exact = list(picks)
+
+    def timed(fn, queries):
+        t = time.perf_counter()
+        out = [fn(q) for q in queries]
+        return (time.perf_counter() - t) / len(queries), out
+
+    t_lin_exact, _ = timed(lambda q: linear_lookup(apps, q), exact[:200])
+    t_idx_exact, _ = timed(index.best, exact)
+    t_lin_typo, lin_out = timed(lambda q: linear_lookup(apps, q), [q for q, _ in typos[:200]])
+    t_idx_typo, idx_out = timed(index.best, [q for q, _ in typos])
+
+    lin_hits = sum(1 for out, (_, want) in zip(lin_out, typos) if out == want)
+    idx_hits = sum(1 for out, (_, want) in zip(idx_out, typos) if out == want)
+
+    print(f"apps={len(names)} queries={len(picks)}")
+    print(f"index build:        {build * 1000:.0f} ms")
+    print(f"exact  linear/index: {t_lin_exact * 1e6:9.1f} / {t_idx_exact * 1e6:7.1f} us/query")
+    print(f"typo   linear/index: {t_lin_typo * 1e6:9.1f} / {t_idx_typo * 1e6:7.1f} us/query")
+    print(f"typo resolved:       linear {lin_hits / len(lin_out):.0%}, index {idx_hits / len(idx_out):.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Close-by-name against real dummy processes, compared with spawning killers.
+
+Starts N sleeping processes under made-up image names (symlinks to the
+Python interpreter), then closes them by spoken name through
+ProcessController. The legacy path spawned several taskkill processes and
+one PowerShell per command. As a floor for that cost, the same number of
+trivial shell spawns is timed here; the PowerShell start-up (seconds on
+Windows) comes on top.
+
+Usage: python benchmarks/bench_close_app.py [--procs 8] [--rounds 5]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.processes import ProcessController  # noqa: E402
+
+APPS = {"dummy chrome": ["novachrome.exe"], "dummy spotify": ["novaspotify.exe"]}
+LEGACY_SPAWNS = 3   # taskkill per mapped name + PowerShell + final taskkill
+
+
+def spawn(bin_dir, image, count):
+    link = os.path.join(bin_dir, image)
+    if not os.path.exists(link):
+        os.symlink(sys.executable, link)
+    return [subprocess.Popen([link, "-c", "import time; time.sleep(120)"]) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--procs", type=int, default=8, help="dummy processes per app")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    if os.name == "nt":
+        parser.error("uses symlinked interpreters for process names; run on Linux or macOS")
+
+    controller = ProcessController(process_map=APPS)
+    bin_dir = tempfile.mkdtemp(prefix="nova-procs-")
+    try:
+        times, lookups, closed_total, stray = [], [], 0, 0
+        for _ in range(args.rounds):
+            chrome = spawn(bin_dir, "novachrome", args.procs)
+            spotify = spawn(bin_dir, "novaspotify", args.procs)
+            time.sleep(0.3)
+            start = time.perf_counter()
+            controller.resolve("dummy chrome", controller.snapshot())
+            lookups.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            result = controller.close("dummy chrome")
+            times.append(time.perf_counter() - start)
+            closed_total += len(result.closed)
+            for p in chrome:
+                p.wait(5)
+            stray += sum(p.poll() is not None for p in spotify)
+            # an unmapped name through the fuzzy path ("spotfy" -> novaspotify)
+            controller.close("nova spotfy")
+            for p in spotify:
+                p.wait(5)
+
+        start = time.perf_counter()
+        for _ in range(args.rounds * LEGACY_SPAWNS):
+            subprocess.run("true", shell=True, capture_output=True)
+        spawn_floor = (time.perf_counter() - start) / args.rounds
+
+        print(f"{args.procs} target + {args.procs} bystander processes, {args.rounds} rounds")
+        print(f"enumerate+resolve:{sum(lookups) / len(lookups) * 1000:7.1f} ms/command")
+        print(f"in-process close:  {sum(times) / len(times) * 1000:7.1f} ms/command  "
+              f"closed {closed_total}/{args.procs * args.rounds}, bystanders hit {stray} "
+              f"(includes waiting for exit)")
+        print(f"legacy spawn floor: {spawn_floor * 1000:5.1f} ms/command for {LEGACY_SPAWNS} shell spawns "
+              f"(excludes PowerShell start-up)")
+    finally:
+        shutil.rmtree(bin_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
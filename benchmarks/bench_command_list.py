@@ -0,0 +1,156 @@
+"""Widget work for the command library list, full rebuilds vs VirtualList.
+
+Headless: rows are fakes that count widget creations, configures and
+placements and charge a fixed cost for each (--create-us, --call-us). The
+session opens Settings on N commands, edits and deletes some of them,
+scrolls from top to bottom and runs a few searches. The old
+refresh_functions_list destroyed and rebuilt every card (nine widgets and
+five fonts per command) after each change. The virtual list builds cards
+only for rows in view, reuses them while scrolling and rebinds only the
+rows that changed.
+
+Usage: python benchmarks/bench_command_list.py [--commands 500] [--view 360]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.virtual_list import VirtualList, filter_commands  # noqa: E402
+
+WIDGETS_PER_CARD = 9
+FONTS_PER_CARD = 5
+ROW_HEIGHT = 72
+
+
+class Cost:
+    def __init__(self, create_us, call_us):
+        self.create_us = create_us
+        self.call_us = call_us
+        self.created = 0
+        self.calls = 0
+        self.seconds = 0.0
+
+    def create(self, n=1):
+        self.created += n
+        self.seconds += n * self.create_us / 1e6
+
+    def call(self, n=1):
+        self.calls += n
+        self.seconds += n * self.call_us / 1e6
+
+
+def make_commands(n, rng):
+    words = ["google", "mail", "docs", "drive", "music", "notes", "work", "repo", "news", "maps"]
+    out = {}
+    while len(out) < n:
+        name = f"{rng.choice(words)} {rng.choice(words)} {len(out)}"
+        out[name] = f"https://example.com/{name.replace(' ', '/')}"
+    return out
+
+
+def session(commands, rng):
+    """The list of (event, argument) steps both implementations replay."""
+    steps = [("open", None)]
+    names = sorted(commands)
+    for name in rng.sample(names, 20):
+        steps.append(("edit", name))
+    for name in rng.sample(names, 10):
+        steps.append(("delete", name))
+    steps.append(("scroll", None))
+    for query in ("mail", "repo 1", "zzz", "docs", ""):
+        steps.append(("search", query))
+    return steps
+
+
+def legacy(commands, steps, cost):
+    commands = dict(commands)
+    live = [0]
+
+    def rebuild(query=""):
+        cost.call(live[0])                   # destroy every child
+        items = filter_commands(commands, query)
+        cost.create(len(items) * (WIDGETS_PER_CARD + FONTS_PER_CARD))
+        live[0] = len(items)
+
+    for event, arg in steps:
+        if event == "open":
+            rebuild()
+        elif event == "edit":
+            commands[arg] = commands[arg] + "?v=2"
+            rebuild()
+        elif event == "delete":
+            commands.pop(arg)
+            rebuild()
+        elif event == "search":
+            rebuild(arg)                     # the old list had no search; count it as a rebuild
+    return cost
+
+
+def virtual(commands, steps, cost, view):
+    commands = dict(commands)
+    fonts_made = [False]
+
+    def create():
+        if not fonts_made[0]:
+            cost.create(FONTS_PER_CARD)      # shared fonts, built once
+            fonts_made[0] = True
+        cost.create(WIDGETS_PER_CARD)
+        return {}
+
+    def bind(row, key):
+        row["key"] = key
+        cost.call(2)                         # name and link labels
+
+    vlist = VirtualList(create, bind, lambda row, y: cost.call(), lambda row: cost.call(),
+                        row_height=ROW_HEIGHT)
+    query = ""
+    for event, arg in steps:
+        if event == "open":
+            vlist.resize(view)
+            vlist.set_items(filter_commands(commands, query))
+        elif event == "edit":
+            commands[arg] = commands[arg] + "?v=2"
+            vlist.set_items(filter_commands(commands, query), changed=[arg])
+        elif event == "delete":
+            commands.pop(arg)
+            vlist.set_items(filter_commands(commands, query))
+        elif event == "scroll":
+            while vlist.offset < vlist.max_offset:
+                vlist.scroll_by(ROW_HEIGHT // 2)   # one wheel notch
+        elif event == "search":
+            query = arg
+            vlist.set_items(filter_commands(commands, query))
+    return cost, vlist
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=500)
+    parser.add_argument("--view", type=int, default=360, help="list viewport height in pixels")
+    parser.add_argument("--create-us", type=float, default=400.0, help="cost of creating one widget or font")
+    parser.add_argument("--call-us", type=float, default=30.0, help="cost of one configure/place/destroy")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    commands = make_commands(args.commands, rng)
+    steps = session(commands, rng)
+
+    start = time.perf_counter()
+    old = legacy(commands, steps, Cost(args.create_us, args.call_us))
+    new, vlist = virtual(commands, steps, Cost(args.create_us, args.call_us), args.view)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.commands} commands, {len(steps)} steps (open, 20 edits, 10 deletes, full scroll, 5 searches)")
+    print(f"rebuild  widgets created {old.created:7d}  calls {old.calls:7d}  est. Tk time {old.seconds:7.2f} s")
+    print(f"virtual  widgets created {new.created:7d}  calls {new.calls:7d}  est. Tk time {new.seconds:7.2f} s")
+    print(f"virtual list: {vlist.stats()}")
+    print(f"(model overhead for both runs: {elapsed * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Compare the custom-command automaton against the old linear scan.
+
+Usage: python benchmarks/bench_command_matcher.py [--keys 10000] [--queries 2000]
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.matching import CommandMatcher  # noqa: E402
+
+
+def linear_match(commands, command):
+    """The loop process_command used to run: first dict-order hit wins."""
+    for key in commands:
+        if f"open {key}" in command or key in command:
+            return key
+    return None
+
+
+def make_keys(n, rng):
+    keys = set()
+    while len(keys) < n:
+        words = rng.randint(1, 3)
+        keys.add(" ".join(
+            "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8)))
+            for _ in range(words)
+        ))
+    return list(keys)
+
+
+def make_queries(keys, n, rng):
+    queries = []
+    for i in range(n):
+        if i % 2:
+            queries.append(f"open {rng.choice(keys)}")
+        else:
+            queries.append("open " + "".join(rng.choice(string.ascii_lowercase + " ") for _ in range(16)))
+    return queries
+
+
+def run(fn, queries):
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = make_keys(args.keys, rng)
+    commands = {k: f"https://example.com/{i}" for i, k in enumerate(keys)}
+    queries = make_queries(keys, args.queries, rng)
+
+    start = time.perf_counter()
+    matcher = CommandMatcher(commands)
+    matcher.match("")  # force the link build
+    build = time.perf_counter() - start
+
+    t_linear = run(lambda q: linear_match(commands, q), queries)
+    t_matcher = run(matcher.match, queries)
+
+    print(f"keys={len(keys)} queries={len(queries)}")
+    print(f"automaton build: {build * 1000:.1f} ms")
+    print(f"linear scan:     {t_linear / len(queries) * 1e6:9.1f} us/query")
+    print(f"automaton:       {t_matcher / len(queries) * 1e6:9.1f} us/query")
+    print(f"speedup:         {t_linear / t_matcher:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""End-of-utterance latency on WAV fixtures with known boundaries.
+
+Writes --per-class commands for two speakers in two rooms, in a temp
+directory (or --fixtures DIR, which is kept). Each WAV has a sidecar .json
+with the sample-exact start and end of the speech in it:
+
+    brisk       short pauses between words
+    slow        pauses of up to half a second between words
+    quiet       room noise only
+    fan         a fan 15 dB below the speech for the whole recording
+
+Every fixture goes through recognizer.listen() set up as run_loop sets it
+up (pause_threshold 0.5, phrase_time_limit 8, calibrated on the lead-in)
+and through one Endpointer per speaker, in a shuffled order, so it learns
+that speaker's pauses as it goes. For both the benchmark reports the
+median and p90 wait after the speech ends, and how many commands were cut
+off before their end. A negative wait is a cut-off. On the commands both
+kept whole, it compares the time saved (negative: the endpointer was
+slower) with the saving the endpointer estimates for itself.
+
+It fails (exit status 1) when the endpointer cuts off a command that
+listen() kept whole, when it releases any command more than --max-wait
+seconds after the speech ends, or when its median wait for a class is more
+than --max-slower seconds above listen()'s. Slow speakers pay for their
+longer learned pause, about 110 ms; the 0.15 s limit keeps that cost from
+growing unnoticed.
+
+Usage: python benchmarks/bench_endpoint.py [--per-class 20] [--fixtures DIR]
+       [--max-wait 1.0] [--max-slower 0.15]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import speech_recognition as sr
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from bench_vad import RATE, fan, room, write_wav  # noqa: E402
+from nova.audio import read_wav  # noqa: E402
+from nova.endpoint import Endpointer, endpoint_wav  # noqa: E402
+from nova.recognition import ReplaySource  # noqa: E402
+
+SPEAKERS = {"brisk": (0.06, 0.2), "slow": (0.25, 0.55)}
+ROOMS = ("quiet", "fan")
+TAIL = 9.0      # longer than phrase_time_limit, so a held-open phrase shows
+
+
+def word(seconds, rng, level=0.08):
+    """A voiced word: harmonics of a gliding pitch under formant peaks, with
+    the level dipping between syllables but not to silence, as in speech."""
+    n = int(seconds * RATE)
+    t = np.arange(n) / RATE
+    f0 = rng.uniform(100, 220) * (1 + 0.1 * np.sin(2 * np.pi * rng.uniform(0.5, 2) * t))
+    phase = 2 * np.pi * np.cumsum(f0) / RATE
+    formants = rng.uniform([500, 1200, 2400], [800, 1800, 3000])
+    out = np.zeros(n)
+    for k in range(1, 30):
+        freq = k * f0.mean()
+        gain = sum(1 / (1 + ((freq - f) / 150) ** 2) for f in formants) / k ** 0.5
+        out += gain * np.sin(k * phase)
+    out *= 0.35 + 0.65 * np.abs(np.sin(np.pi * rng.uniform(3, 5) * t + rng.uniform(0, 1)))
+    fade = min(n // 2, int(0.03 * RATE))
+    out[:fade] *= np.linspace(0, 1, fade)
+    out[n - fade:] *= np.linspace(1, 0, fade)
+    return out / np.sqrt(np.mean(out ** 2)) * level
+
+
+def command(speaker, background, rng):
+    """(samples, speech start, speech end) for a 1-4 word command."""
+    lo, hi = SPEAKERS[speaker]
+    words = [word(rng.uniform(0.25, 0.6), rng) for _ in range(rng.integers(1, 5))]
+    speech = []
+    for i, w in enumerate(words):
+        if i:
+            speech.append(np.zeros(int(rng.uniform(lo, hi) * RATE)))
+        speech.append(w)
+    speech = np.concatenate(speech)
+    voiced = np.nonzero(np.abs(speech) > 0.01 * np.abs(speech).max())[0]
+    lead = int(rng.uniform(0.8, 1.2) * RATE)
+    total = lead + len(speech) + int(TAIL * RATE)
+    samples = room(total / RATE, rng)[:total]
+    samples = np.pad(samples, (0, total - len(samples)))
+    if background == "fan":
+        samples += fan(total / RATE, rng, 0.08 / 10 ** (15 / 20))[:total]
+    samples[lead:lead + len(speech)] += speech
+    return np.clip(samples, -1, 1), (lead + voiced[0]) / RATE, (lead + voiced[-1] + 1) / RATE
+
+
+def make_recognizer():
+    """Configured like NovaEngine.load_voice_stack()."""
+    recognizer = sr.Recognizer()
+    recognizer.energy_threshold = 250
+    recognizer.dynamic_energy_threshold = True
+    recognizer.dynamic_energy_adjustment_damping = 0.15
+    recognizer.dynamic_energy_ratio = 1.1
+    recognizer.pause_threshold = 0.5
+    recognizer.non_speaking_duration = 0.4
+    return recognizer
+
+
+def listen_release(path):
+    """(release time, energy threshold) for recognizer.listen() on a fixture."""
+    recognizer = make_recognizer()
+    with ReplaySource([path], gap=0.0) as source:
+        recognizer.adjust_for_ambient_noise(source, duration=0.5)
+        threshold = recognizer.energy_threshold
+        try:
+            recognizer.listen(source, timeout=5, phrase_time_limit=8)
+        except sr.WaitTimeoutError:
+            return None, threshold
+        return source.position / (source.SAMPLE_RATE * source.SAMPLE_WIDTH), threshold
+
+
+def summary(rows):
+    """Median and p90 wait after the speech, and commands cut off."""
+    waits = [r for r in rows if r is not None]
+    cut = sum(1 for r in waits if r < -0.05) + len(rows) - len(waits)
+    if not waits:
+        return "no phrases", cut
+    return f"{np.median(waits) * 1000:5.0f} {np.percentile(waits, 90) * 1000:5.0f} ms", cut
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--per-class", type=int, default=20)
+    parser.add_argument("--fixtures", help="write the WAV fixtures here and keep them")
+    parser.add_argument("--seed", type=int, default=25)
+    parser.add_argument("--max-wait", type=float, default=1.0,
+                        help="latest release after the speech ends, in seconds")
+    parser.add_argument("--max-slower", type=float, default=0.15,
+                        help="largest rise in a class's median wait over listen(), in seconds")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    fixtures = args.fixtures or tempfile.mkdtemp(prefix="nova_endpoint_")
+    os.makedirs(fixtures, exist_ok=True)
+    try:
+        sessions = {speaker: [] for speaker in SPEAKERS}
+        for speaker in SPEAKERS:
+            for background in ROOMS:
+                for i in range(args.per_class):
+                    samples, start, end = command(speaker, background, rng)
+                    path = os.path.join(fixtures, f"{speaker}_{background}_{i:03d}.wav")
+                    write_wav(path, samples)
+                    with open(os.path.splitext(path)[0] + ".json", "w", encoding="utf-8") as f:
+                        json.dump({"start": round(start, 4), "end": round(end, 4)}, f)
+                    sessions[speaker].append((background, path))
+
+        results = {}
+        failures = []
+        elapsed = 0.0
+        for speaker, paths in sessions.items():
+            random.Random(args.seed).shuffle(paths)
+            endpointer = Endpointer()
+            for background, path in paths:
+                with open(os.path.splitext(path)[0] + ".json", encoding="utf-8") as f:
+                    end = json.load(f)["end"]
+                base_release, threshold = listen_release(path)
+                endpointer.baseline = make_recognizer()
+                endpointer.baseline.energy_threshold = threshold
+                samples, _ = read_wav(path)
+                endpointer.calibrate((samples[:RATE // 2] * 32767).astype("<i2").tobytes(), 2, RATE)
+                saved_before, compared_before = endpointer.saved, endpointer.compared
+                start = time.perf_counter()
+                _, release = endpoint_wav(path, endpointer)
+                elapsed += time.perf_counter() - start
+                row = results.setdefault((speaker, background), {"base": [], "ours": [], "est": [], "real": []})
+                row["base"].append(None if base_release is None else base_release - end)
+                row["ours"].append(None if release is None else release - end)
+                name = os.path.basename(path)
+                if release is None or release - end < -0.05:
+                    if base_release is not None and base_release - end >= -0.05:
+                        failures.append(f"{name}: cut off, listen() kept it whole")
+                elif release - end > args.max_wait:
+                    failures.append(f"{name}: released {release - end:.2f} s after the speech")
+                # Time saved only means something when both kept the whole command
+                whole = (release is not None and base_release is not None
+                         and min(release, base_release) - end >= -0.05)
+                if whole and endpointer.compared > compared_before:
+                    row["est"].append(endpointer.saved - saved_before)
+                    row["real"].append(base_release - release)
+            print(f"{speaker}: learned pause {endpointer.pauses.pause() * 1000:.0f} ms "
+                  f"after {endpointer.utterances} commands ({endpointer.discarded} blips ignored)")
+
+        print(f"{'':14s} {'listen() p50   p90':22s} cut   {'endpointer p50   p90':24s} cut   saved (estimated), n")
+        for (speaker, background), row in results.items():
+            base, base_cut = summary(row["base"])
+            ours, ours_cut = summary(row["ours"])
+            real = np.mean(row["real"]) * 1000 if row["real"] else 0.0
+            est = np.mean(row["est"]) * 1000 if row["est"] else 0.0
+            print(f"{speaker + ' ' + background:14s} {base:22s} {base_cut:3d}   {ours:24s} {ours_cut:3d}   "
+                  f"{real:5.0f} ms ({est:5.0f} ms), {len(row['real'])}")
+            base_waits = [r for r in row["base"] if r is not None]
+            our_waits = [r for r in row["ours"] if r is not None]
+            if base_waits and our_waits:
+                slower = np.median(our_waits) - np.median(base_waits)
+                if slower > args.max_slower:
+                    failures.append(f"{speaker} {background}: median wait {slower * 1000:.0f} ms "
+                                    f"above listen(), limit {args.max_slower * 1000:.0f} ms")
+        commands = sum(len(paths) for paths in sessions.values())
+        print(f"endpointer: {elapsed / commands * 1000:.2f} ms per command, streamed up to its release")
+        if args.fixtures:
+            print(f"fixtures in {fixtures}; check them with python -m nova.endpoint {fixtures}/*.wav")
+    finally:
+        if not args.fixtures:
+            shutil.rmtree(fixtures, ignore_errors=True)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Headless command resolution throughput and daemon vs desktop-app memory.
+
+Builds a NovaEngine in a temporary data directory with --commands custom
+commands and --apps installed apps, then resolves a mix of utterances
+through feed(). Nothing is executed. It then starts two fresh interpreters:
+one imports the daemon and builds an engine, the other imports the desktop
+module (without creating a window). It prints their resident memory. The
+window itself needs a display, so the GUI figure is a lower bound.
+
+Usage: python benchmarks/bench_engine.py [--commands 500] [--apps 400] [--utterances 20000]
+"""
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+from nova.engine import NovaEngine  # noqa: E402
+from nova.matching import FuzzyIndex  # noqa: E402
+
+RSS_PROBE = """
+import os, sys
+sys.path.insert(0, {root!r})
+{body}
+try:
+    import psutil
+    print(psutil.Process().memory_info().rss)
+except ImportError:
+    import resource
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+"""
+
+DAEMON = """
+import nova.daemon
+from nova.engine import NovaEngine
+engine = NovaEngine({data!r})
+"""
+
+GUI = """
+import runpy
+runpy.run_path(os.path.join({root!r}, "NOVA Desktop Assistant.py"), run_name="nova_gui_probe")
+from nova.engine import NovaEngine
+engine = NovaEngine({data!r})
+"""
+
+
+def rss(body, data_dir):
+    code = RSS_PROBE.format(root=ROOT, body=body.format(root=ROOT, data=data_dir))
+    env = dict(os.environ, APPDATA=data_dir)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    if out.returncode:
+        return None
+    return int(out.stdout.split()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=500)
+    parser.add_argument("--apps", type=int, default=400)
+    parser.add_argument("--utterances", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=9)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    data_dir = tempfile.mkdtemp(prefix="nova_engine_")
+    try:
+        engine = NovaEngine(data_dir)
+        engine.custom_commands.update({f"site {i}": f"https://example.com/{i}" for i in range(args.commands)})
+        engine.save_custom_commands()
+        engine.apps = {f"application {i}": f"C:\\Apps\\app{i}.lnk" for i in range(args.apps)}
+        engine.app_index = FuzzyIndex(engine.apps)
+
+        templates = [
+            lambda: f"nova open site {rng.randrange(args.commands)}",
+            lambda: f"nova open application {rng.randrange(args.apps)}",
+            lambda: f"nova open aplication {rng.randrange(args.apps)}",
+            lambda: f"nova close application {rng.randrange(args.apps)}",
+            lambda: "nova open terminal",
+            lambda: "nova open q drive",
+            lambda: "what time is it",
+        ]
+        utterances = [rng.choice(templates)() for _ in range(args.utterances)]
+        kinds = {}
+        start = time.perf_counter()
+        for text in utterances:
+            r = engine.feed(text)
+            kind = r.kind if r else "no wake"
+            kinds[kind] = kinds.get(kind, 0) + 1
+        elapsed = time.perf_counter() - start
+        engine.close()
+
+        print(f"{args.utterances} utterances, {args.commands} commands, {args.apps} apps: "
+              f"{elapsed * 1000:.0f} ms, {elapsed / args.utterances * 1e6:.1f} us each")
+        print(f"  {dict(sorted(kinds.items()))}")
+
+        daemon = rss(DAEMON, data_dir)
+        gui = rss(GUI, data_dir)
+        if daemon and gui:
+            print(f"resident memory: daemon {daemon / 1e6:.1f} MB, desktop module (no window) {gui / 1e6:.1f} MB")
+        else:
+            print("could not measure resident memory")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
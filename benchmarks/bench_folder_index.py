@@ -0,0 +1,140 @@
+"""Build, refresh and lookup cost of the drive folder index on a generated tree.
+
+Creates a directory tree (100k folders by default) under a temp dir and
+compares FolderIndex with the old one-level scandir + difflib lookup that
+_find_folder_on_drive used to run on every command.
+
+Usage: python benchmarks/bench_folder_index.py [--dirs 100000] [--depth 4] [--root DIR]
+"""
+import argparse
+import difflib
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.folders import FolderIndex  # noqa: E402
+
+WORDS = [
+    "reports", "photos", "projects", "invoices", "music", "videos", "backup",
+    "archive", "drafts", "notes", "games", "downloads", "scans", "taxes",
+    "internship", "college", "design", "clients", "budget", "travel",
+]
+
+
+def generate_tree(root, total, fanout, rng):
+    """Breadth-first tree of `total` folders with `fanout` children each."""
+    names = []
+    frontier = [root]
+    made = 0
+    while made < total:
+        parent = frontier.pop(0)
+        for i in range(fanout):
+            if made >= total:
+                break
+            name = f"{rng.choice(WORDS)} {rng.choice(WORDS)} {made}"
+            path = os.path.join(parent, name)
+            os.mkdir(path)
+            names.append(name)
+            frontier.append(path)
+            made += 1
+    return names
+
+
+def legacy_find(root, folder_name):
+    """The original _find_folder_on_drive, against any root."""
+    folders = {}
+    for entry in os.scandir(root):
+        if entry.is_dir():
+            folders[entry.name.lower()] = entry.path
+    name = folder_name.lower().strip()
+    if name in folders:
+        return folders[name]
+    matches = difflib.get_close_matches(name, folders.keys(), n=1, cutoff=0.5)
+    if matches:
+        return folders[matches[0]]
+    for fname, fpath in folders.items():
+        if name in fname or fname in name:
+            return fpath
+    return None
+
+
+def typo(word, rng):
+    i = rng.randrange(len(word))
+    return word[:i] + word[i + 1:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dirs", type=int, default=100000)
+    parser.add_argument("--fanout", type=int, default=40)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--lookups", type=int, default=300)
+    parser.add_argument("--root", help="existing scratch directory to build the tree in")
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base = tempfile.mkdtemp(prefix="nova-folders-", dir=args.root)
+    try:
+        start = time.perf_counter()
+        names = generate_tree(base, args.dirs, args.fanout, rng)
+        print(f"generated {len(names)} folders in {time.perf_counter() - start:.1f} s")
+
+        cache = base + ".index.json"
+        index = FolderIndex(base, cache, max_depth=args.depth)
+        start = time.perf_counter()
+        index.refresh()
+        cold = time.perf_counter() - start
+        index.save_cache()
+        print(f"cold build:        {cold * 1000:8.0f} ms  ({index.scans} dirs scanned, {len(index)} indexed)")
+
+        warm = FolderIndex(base, cache, max_depth=args.depth)
+        start = time.perf_counter()
+        warm.load_cache()
+        print(f"cache load:        {(time.perf_counter() - start) * 1000:8.0f} ms")
+        start = time.perf_counter()
+        changed = warm.refresh()
+        print(f"unchanged refresh: {(time.perf_counter() - start) * 1000:8.0f} ms  "
+              f"({warm.scans} dirs rescanned, changed={changed})")
+
+        # One new folder somewhere deep: only its parent is rescanned
+        deep = max(warm._dirs, key=lambda p: p.count(os.sep))
+        os.mkdir(os.path.join(deep, "quarterly reports new"))
+        before = warm.scans
+        start = time.perf_counter()
+        warm.refresh()
+        print(f"one-change refresh:{(time.perf_counter() - start) * 1000:8.0f} ms  "
+              f"({warm.scans - before} dirs rescanned)")
+
+        queries = [rng.choice(names) for _ in range(args.lookups)]
+        misheard = [typo(q.rsplit(" ", 1)[0], rng) + " " + q.rsplit(" ", 1)[1] for q in queries]
+        for label, batch in (("exact", queries), ("misheard", misheard)):
+            found = nested = 0
+            start = time.perf_counter()
+            for q in batch:
+                path = warm.find(q)
+                found += path is not None
+                nested += path is not None and os.path.dirname(path) != base
+            per = (time.perf_counter() - start) / len(batch)
+            print(f"index {label:9s} {per * 1000:7.3f} ms/lookup  found {found}/{len(batch)}, {nested} nested")
+
+        legacy_found = 0
+        start = time.perf_counter()
+        for q in queries:
+            path = legacy_find(base, q)
+            legacy_found += path is not None and os.path.basename(path) == q
+        per = (time.perf_counter() - start) / len(queries)
+        print(f"legacy exact    {per * 1000:7.3f} ms/lookup  found {legacy_found}/{len(queries)} (top level only)")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+        if os.path.exists(base + ".index.json"):
+            os.remove(base + ".index.json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Intent router against the old if/regex chain in process_command.
+
+Builds a NovaEngine with --commands custom commands and --apps installed
+apps. A few of the custom commands are everyday words ("drive", "photos",
+"mail"). It then generates a corpus of --utterances transcripts with
+fillers and punctuation, or reads one transcript per line from --corpus.
+Each transcript is resolved three ways:
+
+    chain   the old ordered checks (close, custom substring, folder regex,
+            drive regex, open, terminal), reimplemented here
+    route   IntentRouter.route() on its own: grammar dispatch only
+    resolve NovaEngine.resolve(): routing plus app and folder lookups
+
+It prints the time per transcript and every (chain -> resolve) kind change
+with an example. Nothing is executed.
+
+Usage: python benchmarks/bench_intents.py [--commands 300] [--apps 300] [--utterances 5000] [--corpus FILE]
+"""
+import argparse
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.engine import CANCEL_PHRASES, NovaEngine  # noqa: E402
+from nova.matching import FuzzyIndex  # noqa: E402
+
+_DRIVE_FOLDER = re.compile(r'^open\s+(.+?)\s+from\s+([a-z])\s*drive$')
+_DRIVE_ROOT = re.compile(r'^open\s+([a-z])\s*drive$')
+
+EVERYDAY = {
+    "drive": "https://drive.google.com",
+    "photos": "https://photos.google.com",
+    "mail": "https://mail.google.com",
+    "music": "https://music.youtube.com",
+}
+
+
+def chain_kind(engine, command):
+    """The order process_command used to check things in; kind only."""
+    command = command.lower().strip()
+    if command.strip(" .!?") in CANCEL_PHRASES:
+        return "cancel"
+    if command.startswith("close "):
+        return "close"
+    key = engine.command_matcher.match(command)
+    if key and engine.custom_commands.get(key):
+        return "custom"
+    if _DRIVE_FOLDER.match(command):
+        return "folder"
+    if _DRIVE_ROOT.match(command):
+        return "drive"
+    if command.startswith("open "):
+        target = command[len("open "):].strip()
+        found = engine.apps.get(target) or engine.app_index.best(target)
+        if found or not ("command prompt" in command or "terminal" in command):
+            return "app"
+    if "command prompt" in command or "terminal" in command:
+        return "terminal"
+    return "unknown"
+
+
+def make_corpus(n, commands, apps, rng):
+    folders = ["photos", "internship", "reports", "music", "drive backups", "tax 2024", "projects"]
+    templates = [
+        lambda: f"open {rng.choice(commands)}",
+        lambda: f"open {rng.choice(apps)}",
+        lambda: f"open {rng.choice(apps)[:-1]}",
+        lambda: f"close {rng.choice(apps)}",
+        lambda: f"close {rng.choice(commands)}",
+        lambda: f"open {rng.choice(folders)} from {rng.choice('cdem')} drive",
+        lambda: f"open {rng.choice('cdem')} drive",
+        lambda: f"open {rng.choice('cdem')}drive",
+        lambda: "open terminal",
+        lambda: "open command prompt",
+        lambda: f"{rng.choice(CANCEL_PHRASES)}",
+        lambda: f"play some {rng.choice(['music', 'jazz', 'photos'])}",
+        lambda: "what time is it",
+    ]
+    fillers = ["", "", "", "please ", "can you "]
+    endings = ["", "", ".", "?", " please"]
+    corpus = []
+    for _ in range(n):
+        text = rng.choice(templates)()
+        if not text.startswith(("open", "close")) or rng.random() < 0.2:
+            text = rng.choice(fillers) + text
+        corpus.append(text + rng.choice(endings))
+    return corpus
+
+
+def timed(fn, corpus):
+    start = time.perf_counter()
+    out = [fn(text) for text in corpus]
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=300)
+    parser.add_argument("--apps", type=int, default=300)
+    parser.add_argument("--utterances", type=int, default=5000)
+    parser.add_argument("--corpus", help="file with one transcript per line (wake word already removed)")
+    parser.add_argument("--seed", type=int, default=21)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    data_dir = tempfile.mkdtemp(prefix="nova_intents_")
+    try:
+        engine = NovaEngine(data_dir)
+        engine.custom_commands.update({f"site {i}": f"https://example.com/{i}" for i in range(args.commands)})
+        engine.custom_commands.update(EVERYDAY)
+        engine.save_custom_commands()
+        engine.apps = {f"application {i}": f"C:\\Apps\\app{i}.lnk" for i in range(args.apps)}
+        engine.app_index = FuzzyIndex(engine.apps)
+
+        if args.corpus:
+            with open(args.corpus, encoding="utf-8") as f:
+                corpus = [line.strip() for line in f if line.strip()]
+        else:
+            corpus = make_corpus(args.utterances, list(engine.custom_commands), list(engine.apps), rng)
+
+        chain, chain_s = timed(lambda text: chain_kind(engine, text), corpus)
+        _, route_s = timed(engine.intents.route, corpus)
+        resolved, resolve_s = timed(engine.resolve, corpus)
+        engine.close()
+
+        n = len(corpus)
+        print(f"{n} transcripts, {len(engine.custom_commands)} commands, {args.apps} apps, "
+              f"{len(engine.intents)} intents")
+        for label, seconds in (("chain", chain_s), ("route", route_s), ("resolve", resolve_s)):
+            print(f"  {label:8s} {seconds * 1000:7.1f} ms  {seconds / n * 1e6:6.1f} us each")
+
+        print(f"  kinds: {dict(sorted(Counter(r.kind for r in resolved).items()))}")
+        changes = Counter()
+        examples = {}
+        for text, old, new in zip(corpus, chain, resolved):
+            if old != new.kind:
+                changes[old, new.kind] += 1
+                examples.setdefault((old, new.kind), text)
+        print(f"  {sum(changes.values())} transcripts read differently from the chain")
+        for (old, new), count in changes.most_common():
+            print(f"    {old:8s} -> {new:8s} {count:5d}  e.g. {examples[old, new]!r}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Time and peak memory of streaming command-library imports.
+
+Writes a synthetic library of --rows commands in each format, then plans its
+import against an existing set of commands (a tenth of them overlap). Time is
+measured on its own. Peak Python heap is measured in a separate tracemalloc
+run, and compared with parsing the same file after reading it whole, which is
+what a json.load / readlines importer does.
+
+Usage: python benchmarks/bench_library_io.py [--rows 100000]
+"""
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.library_io import FORMATS, export_file, import_file, plan_import, read_entries  # noqa: E402
+
+
+def peak_heap(fn):
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    library = {f"shortcut {i}": f"https://intranet.example.com/tools/{i}?ref=nova" for i in range(args.rows)}
+    existing = {f"shortcut {i}": f"https://old.example.com/{i}" for i in range(0, args.rows, 10)}
+    workdir = tempfile.mkdtemp(prefix="nova_library_")
+    try:
+        for fmt in FORMATS:
+            path = os.path.join(workdir, f"library.{fmt}")
+            export_file(path, library, fmt)
+            size = os.path.getsize(path)
+
+            start = time.perf_counter()
+            changes, report = import_file(path, existing, fmt)
+            elapsed = time.perf_counter() - start
+
+            def whole_file():
+                with open(path, encoding="utf-8", newline="") as f:
+                    text = f.read()
+                return plan_import(existing, read_entries(io.StringIO(text), fmt))
+
+            streamed = peak_heap(lambda: import_file(path, existing, fmt))
+            whole = peak_heap(whole_file)
+            print(f"{fmt:5s} {size / 1e6:5.1f} MB  {elapsed * 1000:6.0f} ms  {args.rows / elapsed:8.0f} rows/s  "
+                  f"peak heap {streamed / 1e6:5.1f} MB streamed, {whole / 1e6:5.1f} MB read whole  "
+                  f"({report.summary()})")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
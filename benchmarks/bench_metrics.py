@@ -0,0 +1,101 @@
+"""Accuracy and overhead of the per-stage latency metrics.
+
+Records --samples log-normal latencies into a Histogram and compares its
+p50/p95/p99 with exact percentiles from the sorted samples. It then runs
+--commands unmatched commands through NovaEngine.process_command with
+metrics off and on (resolve only, nothing is executed) to show what tracing
+costs per interaction. Finally it prints the table and Prometheus output for
+a simulated session.
+
+Usage: python benchmarks/bench_metrics.py [--samples 200000] [--commands 20000]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.engine import NovaEngine  # noqa: E402
+from nova.metrics import Histogram, Metrics, format_table, prometheus_text  # noqa: E402
+
+
+def accuracy(args, rng):
+    samples = [rng.lognormvariate(-1.0, 1.2) for _ in range(args.samples)]
+    hist = Histogram()
+    start = time.perf_counter()
+    for s in samples:
+        hist.record(s)
+    record_s = time.perf_counter() - start
+    samples.sort()
+    worst = 0.0
+    parts = []
+    for q in (50, 95, 99, 99.9):
+        exact = samples[max(0, int(len(samples) * q / 100.0 + 0.999999) - 1)]
+        got = hist.percentile(q)
+        error = abs(got - exact) / exact
+        worst = max(worst, error)
+        parts.append(f"p{q:g} {exact * 1000:.1f}/{got * 1000:.1f} ms")
+    print(f"{args.samples} samples in {len(hist.counts)} buckets, "
+          f"{record_s / args.samples * 1e9:.0f} ns per record")
+    print(f"  exact/histogram: {', '.join(parts)}; worst error {worst:.2%}")
+
+
+def overhead(args):
+    data_dir = tempfile.mkdtemp(prefix="nova_metrics_")
+    try:
+        timings = {}
+        for enabled in (False, True):
+            engine = NovaEngine(data_dir)
+            engine.metrics.enabled = enabled
+            start = time.perf_counter()
+            for i in range(args.commands):
+                trace = engine.metrics.trace()
+                trace.mark("capture_end")
+                trace.mark("asr_result")
+                trace.mark("dispatched")
+                engine.process_command(f"what time is it {i % 50}", trace)
+            timings[enabled] = (time.perf_counter() - start) / args.commands
+            engine.close()
+        off, on = timings[False], timings[True]
+        print(f"process_command: metrics off {off * 1e6:.1f} us, on {on * 1e6:.1f} us "
+              f"(+{(on - off) * 1e6:.1f} us per interaction)")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def simulated(rng):
+    metrics = Metrics(enabled=True)
+    for _ in range(200):
+        trace = metrics.trace()
+        t = 0.0
+        for mark, mean in (("capture_end", 0), ("asr_result", 0.8), ("dispatched", 0.0001),
+                           ("action_start", 0.002), ("match", 0.00003), ("tts_enqueued", 0.0002),
+                           ("tts_first_audio", 0.12), ("action_end", 0.9)):
+            t += rng.expovariate(1 / mean) if mean else 0.0
+            trace.mark(mark, t)
+        trace.finish(rng.choice(["app", "custom", "close"]))
+    snapshot = metrics.snapshot()
+    print("simulated session:")
+    print(format_table(snapshot))
+    print(prometheus_text(snapshot).splitlines()[2])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=200000)
+    parser.add_argument("--commands", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=22)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    accuracy(args, rng)
+    overhead(args)
+    simulated(rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Check the speech worker's ordering, barge-in and latency with a fake engine.
+
+Headless: SpeechWorker gets a fake pyttsx3 engine through engine_factory.
+The engine takes --say-ms to queue text, as a SAPI call does, "speaks"
+for --ms-per-char per character, fires the started-utterance callback,
+and stops and clears its queue on stop(), as pyttsx3 does. It checks:
+
+    order     queued speech comes out high priority first, then in order
+    barge-in  say(interrupt=True) cuts off the current utterance, drops
+              the queued ones and starts within --max-latency-ms
+    race      --races cancel() calls at random points around the start of
+              an utterance; none may be spoken to the end after cancel()
+              has returned
+    latency   enqueue to first audio on an idle worker, within --max-latency-ms
+
+Exits 1 if any check fails.
+
+Usage: python benchmarks/bench_speech.py [--races 300] [--max-latency-ms 50]
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.speech import PRIORITY_HIGH, SpeechWorker  # noqa: E402
+
+
+class FakeEngine:
+    """The pyttsx3 engine surface SpeechWorker uses, speaking into a list."""
+
+    def __init__(self, ms_per_char, say_ms):
+        self.ms_per_char = ms_per_char
+        self.say_ms = say_ms
+        self.spoken = []        # (text, finished_at) for every utterance spoken to the end
+        self.cut = []           # texts stopped part way
+        self._pending = []
+        self._stop = threading.Event()
+        self._callbacks = {}
+
+    def connect(self, topic, cb):
+        self._callbacks.setdefault(topic, []).append(cb)
+
+    def say(self, text):
+        time.sleep(self.say_ms / 1000.0)
+        self._pending.append(text)
+
+    def stop(self):
+        self._pending.clear()
+        self._stop.set()
+
+    def runAndWait(self):
+        self._stop.clear()
+        while self._pending:
+            text = self._pending.pop(0)
+            for cb in self._callbacks.get("started-utterance", ()):
+                cb(text)
+            if self._stop.wait(len(text) * self.ms_per_char / 1000.0):
+                self.cut.append(text)
+                return
+            self.spoken.append((text, time.perf_counter()))
+
+
+def check_order(worker, engine):
+    blocker = worker.say("x" * 40)
+    while blocker.started_at is None:
+        time.sleep(0.001)
+    queued = [worker.say("normal one"), worker.say("normal two"),
+              worker.say("high", priority=PRIORITY_HIGH), worker.say("normal three")]
+    for utt in queued:
+        utt.wait(5)
+    order = [text for text, _ in engine.spoken[-4:]]
+    expected = ["high", "normal one", "normal two", "normal three"]
+    print(f"order:    {order}")
+    return [] if order == expected else [f"spoken in the order {order}, expected {expected}"]
+
+
+def check_barge_in(worker, engine, max_latency):
+    long = worker.say("y" * 200)
+    dropped = [worker.say("queued one"), worker.say("queued two")]
+    while long.started_at is None:
+        time.sleep(0.001)
+    time.sleep(0.05)
+    reply = worker.say("Cancelled.", priority=PRIORITY_HIGH, interrupt=True)
+    reply.wait(5)
+    for utt in dropped:
+        utt.wait(5)
+    failures = []
+    if not long.cancelled or long.text not in engine.cut:
+        failures.append("the interrupted utterance was not cut off")
+    spoken = {text for text, _ in engine.spoken}
+    if any(utt.text in spoken or not utt.cancelled for utt in dropped):
+        failures.append("queued speech survived a barge-in")
+    if reply.latency is None or reply.latency > max_latency:
+        failures.append(f"barge-in reply started after {reply.latency}, limit {max_latency * 1000:.0f} ms")
+    else:
+        print(f"barge-in: reply started {reply.latency * 1000:.1f} ms after say()")
+    return failures
+
+
+def check_race(worker, engine, races, rng):
+    late = 0
+    for i in range(races):
+        text = f"race {i} " + "z" * 10
+        utt = worker.say(text)
+        time.sleep(rng.uniform(0, 0.004))
+        worker.cancel()
+        cancelled_at = time.perf_counter()
+        utt.wait(5)
+        finished = [t for s, t in engine.spoken if s == text]
+        if finished and finished[0] > cancelled_at:
+            late += 1
+    print(f"race:     {races} cancels around the start of speech, {late} spoken in full afterwards")
+    return [f"{late} cancelled utterance(s) spoken in full"] if late else []
+
+
+def check_latency(worker, max_latency):
+    latencies = []
+    for i in range(50):
+        utt = worker.say(f"latency {i}")
+        utt.wait(5)
+        latencies.append(utt.latency)
+    latencies.sort()
+    p50, worst = latencies[len(latencies) // 2], latencies[-1]
+    print(f"latency:  enqueue to first audio p50 {p50 * 1000:.2f} ms, max {worst * 1000:.2f} ms")
+    return [f"first audio after {worst * 1000:.1f} ms, limit {max_latency * 1000:.0f} ms"] if worst > max_latency else []
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--races", type=int, default=300)
+    parser.add_argument("--ms-per-char", type=float, default=1.0)
+    parser.add_argument("--say-ms", type=float, default=1.0)
+    parser.add_argument("--max-latency-ms", type=float, default=50.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    engine = FakeEngine(args.ms_per_char, args.say_ms)
+    worker = SpeechWorker(engine_factory=lambda: engine)
+    worker.start()
+    worker.wait_ready(5)
+    max_latency = args.max_latency_ms / 1000.0
+    failures = []
+    failures += check_order(worker, engine)
+    failures += check_barge_in(worker, engine, max_latency)
+    failures += check_race(worker, engine, args.races, random.Random(args.seed))
+    failures += check_latency(worker, max_latency)
+    stats = worker.latency_stats()
+    print(f"worker:   {stats['count']} utterances, mean latency {stats['avg'] * 1000:.2f} ms")
+    worker.stop()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Import cost and time to first window of the desktop app.
+
+Runs the main module in a fresh interpreter under -X importtime, without
+starting mainloop, and prints the biggest top-level imports. It does the
+same again with the voice stack imported up front, the way the app used
+to start, to show what deferring it saves. When a display is available it
+also launches the app with NOVA_STARTUP_TRACE=exit and reports the time to
+the first drawn window.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--top 12] [--no-window]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MAIN = os.path.join(ROOT, "NOVA Desktop Assistant.py")
+
+# What the app imported at startup before the voice stack was deferred
+EAGER = [
+    "speech_recognition", "webbrowser", "nova.capture", "nova.recognition",
+    "nova.wakeword", "nova.windows", "nova.processes", "pythoncom",
+]
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile(extra=()):
+    """(total_us, [(cumulative_us, name)] for top-level imports) of loading the module."""
+    preload = "".join(
+        f"\ntry:\n    import {name}\nexcept ImportError:\n    pass" for name in extra
+    )
+    code = (
+        "import runpy, sys\n"
+        f"sys.path.insert(0, {ROOT!r})" + preload + "\n"
+        f"runpy.run_path({MAIN!r}, run_name='nova_startup_probe')\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode:
+        sys.exit(f"probe failed:\n{proc.stderr[-2000:]}")
+    top = []
+    total = 0
+    for line in proc.stderr.splitlines():
+        m = LINE.match(line)
+        if not m:
+            continue
+        cumulative, indent, name = int(m.group(2)), len(m.group(3)), m.group(4)
+        if indent == 1:
+            top.append((cumulative, name))
+            total += cumulative
+    return total, sorted(top, reverse=True)
+
+
+def first_window(runs):
+    """[(reported_ms, wall_ms)] for launching the app until its first window is drawn."""
+    env = dict(os.environ, NOVA_STARTUP_TRACE="exit")
+    out = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, MAIN], cwd=ROOT, env=env,
+                              capture_output=True, text=True, timeout=60)
+        wall = (time.perf_counter() - start) * 1000
+        m = re.search(r"First window after (\d+) ms", proc.stdout)
+        if not m:
+            print(f"launch failed:\n{proc.stdout[-1000:]}{proc.stderr[-1000:]}")
+            return out
+        out.append((int(m.group(1)), wall))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--no-window", action="store_true", help="skip the first-window launches")
+    args = parser.parse_args()
+
+    lazy = [import_profile() for _ in range(args.runs)]
+    eager = [import_profile(EAGER) for _ in range(args.runs)]
+    lazy_ms = statistics.median(t for t, _ in lazy) / 1000
+    eager_ms = statistics.median(t for t, _ in eager) / 1000
+    print(f"module load, median of {args.runs}: deferred {lazy_ms:.0f} ms, "
+          f"eager voice stack {eager_ms:.0f} ms (saves {eager_ms - lazy_ms:.0f} ms)")
+    print("largest top-level imports (deferred):")
+    for cumulative, name in lazy[-1][1][:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    has_display = sys.platform == "win32" or os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")
+    if args.no_window or not has_display:
+        if not args.no_window:
+            print("no display: skipping time to first window")
+        return
+    samples = first_window(args.runs)
+    if samples:
+        print(f"first window, median of {len(samples)}: "
+              f"{statistics.median(s for s, _ in samples):.0f} ms after interpreter start-up, "
+              f"{statistics.median(w for _, w in samples):.0f} ms from launch")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Kill the command store's writer mid-flush and check nothing acknowledged is lost.
+
+Each round starts a writer process that applies a seeded stream of sets and
+deletes to a JsonStore. The store compacts often so kills land during
+journal appends, backups and os.replace() alike. The writer prints each
+change's sequence number once the call returns. The parent kills the writer
+at a random moment (SIGKILL / TerminateProcess), reloads the store and
+checks it holds every acknowledged change, plus possibly the one in flight
+when the writer died, and nothing else.
+
+It then times a burst of edits through the store against the old way,
+a full json.dump(indent=4) rewrite per change.
+
+Usage: python benchmarks/bench_storage.py [--rounds 50] [--keys 200] [--edits 500]
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.storage import JsonStore, validate_commands  # noqa: E402
+
+
+def ops(seed, keys):
+    """The endless, deterministic change stream for one round."""
+    rng = random.Random(seed)
+    seq = 0
+    while True:
+        seq += 1
+        key = f"command {rng.randrange(keys)}"
+        if rng.random() < 0.2:
+            yield seq, "del", key, None
+        else:
+            yield seq, "set", key, f"https://example.com/{seed}/{seq}"
+
+
+def apply(data, op, key, value):
+    if op == "set":
+        data[key] = value
+    else:
+        data.pop(key, None)
+
+
+def writer(path, seed, keys):
+    store = JsonStore(path, validate=validate_commands, delay=0.005, compact_every=15)
+    store.load()
+    for seq, op, key, value in ops(seed, keys):
+        if op == "set":
+            store.set(key, value)
+        else:
+            store.delete(key)
+        print(seq, flush=True)
+
+
+def crash_rounds(args, workdir):
+    path = os.path.join(workdir, "nova_commands.json")
+    expected = {}
+    rng = random.Random(args.seed)
+    failures = 0
+    acked_total = 0
+    for round_no in range(args.rounds):
+        seed = rng.randrange(1 << 30)
+        proc = subprocess.Popen(
+            [sys.executable, __file__, "--writer", path, "--seed", str(seed), "--keys", str(args.keys)],
+            stdout=subprocess.PIPE, text=True,
+        )
+        time.sleep(rng.uniform(0.05, 0.3))
+        proc.kill()
+        out, _ = proc.communicate()
+        acked = 0
+        for line in out.splitlines():
+            if line.strip().isdigit():
+                acked = int(line)
+        acked_total += acked
+
+        stream = ops(seed, args.keys)
+        for _ in range(acked):
+            _, op, key, value = next(stream)
+            apply(expected, op, key, value)
+        with_next = dict(expected)
+        apply(with_next, *next(stream)[1:])
+
+        loaded = JsonStore(path, validate=validate_commands).load()
+        if loaded == expected:
+            pass
+        elif loaded == with_next:
+            expected = with_next
+        else:
+            failures += 1
+            missing = {k for k in expected if loaded.get(k) != expected[k]}
+            extra = set(loaded) - set(with_next)
+            print(f"round {round_no}: store diverged after {acked} acks "
+                  f"({len(missing)} wrong or missing, {len(extra)} unexpected)")
+            expected = dict(loaded)
+    print(f"{args.rounds} kills, {acked_total} acknowledged changes, {failures} rounds lost data")
+
+    with open(path, "w") as f:
+        f.write('{"command 1": "https://exa')       # truncated by hand
+    store = JsonStore(path, validate=validate_commands)
+    loaded = store.load()
+    print(f"truncated file: loaded {len(loaded)} commands; {'; '.join(store.recovered)}")
+    return failures
+
+
+def burst(args, workdir):
+    commands = {f"command {i}": f"https://example.com/{i}" for i in range(args.keys)}
+    rng = random.Random(args.seed)
+    edits = [(f"command {rng.randrange(args.keys)}", f"https://example.com/e{i}") for i in range(args.edits)]
+
+    legacy_path = os.path.join(workdir, "legacy.json")
+    data = dict(commands)
+    start = time.perf_counter()
+    written = 0
+    for key, value in edits:
+        data[key] = value
+        with open(legacy_path, "w") as f:
+            json.dump(data, f, indent=4)
+        written += os.path.getsize(legacy_path)
+    legacy_s = time.perf_counter() - start
+
+    store_path = os.path.join(workdir, "store.json")
+    store = JsonStore(store_path, defaults=commands, validate=validate_commands)
+    store.load()
+    start = time.perf_counter()
+    for key, value in edits:
+        store.set(key, value)
+    store.close()
+    store_s = time.perf_counter() - start
+
+    print(f"{args.edits} edits on {args.keys} commands: full rewrite each {legacy_s * 1000:.0f} ms "
+          f"({written / 1e6:.1f} MB written), journaled store {store_s * 1000:.0f} ms "
+          f"({store.compactions} compaction(s), {store.appends} journal lines)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--keys", type=int, default=200)
+    parser.add_argument("--edits", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=3)
+    parser.add_argument("--writer", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.writer:
+        writer(args.writer, args.seed, args.keys)
+        return
+
+    workdir = tempfile.mkdtemp(prefix="nova_storage_")
+    try:
+        failures = crash_rounds(args, workdir)
+        burst(args, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Voice-activity gate on generated WAV fixtures.
+
+Writes --per-class WAV files for each kind of phrase recognizer.listen()
+hands over, in a temp directory (or --fixtures DIR, which is kept):
+
+    speech           voiced syllables with fricatives, in room noise
+    speech_fan       the same over a fan 10 dB below the speech
+    fan              steady fan noise with mains hum
+    keyboard         typing: short clicks over room noise
+    hiss             broadband hiss a little louder than the room
+    door             a single knock or slam
+
+Each phrase has the silence listen() keeps before and after it. The files
+are read back with read_wav() and passed through one VoiceActivityDetector
+in a shuffled order, as they would arrive in a session. The benchmark
+reports per-class accuracy and the share of audio kept from the
+recognizer. It also shows how many of the non-speech phrases would have
+passed an energy threshold of 250, the run_loop setting, and how fast the
+gate runs compared with real time. It exits 1 if any speech fixture is
+dropped or any noise fixture is kept.
+
+Usage: python benchmarks/bench_vad.py [--per-class 40] [--fixtures DIR]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.audio import read_wav  # noqa: E402
+from nova.vad import VoiceActivityDetector  # noqa: E402
+
+RATE = 16000
+SPEECH_CLASSES = ("speech", "speech_fan")
+CLASSES = SPEECH_CLASSES + ("fan", "keyboard", "hiss", "door")
+
+
+def room(seconds, rng, level=0.001):
+    return rng.normal(0, level, int(seconds * RATE))
+
+
+def fan(seconds, rng, level):
+    """Pink-ish noise (integrated white noise, high-passed) plus 50/100 Hz hum."""
+    n = int(seconds * RATE)
+    white = rng.normal(0, 1, n)
+    brown = np.cumsum(white)
+    brown -= np.convolve(brown, np.ones(400) / 400, mode="same")
+    noise = 0.5 * white + brown / 20
+    t = np.arange(n) / RATE
+    noise += 3 * np.sin(2 * np.pi * 50 * t) + 1.5 * np.sin(2 * np.pi * 100 * t)
+    return noise / np.sqrt(np.mean(noise ** 2)) * level
+
+
+def syllables(seconds, rng, level=0.08):
+    """Voiced syllables: harmonics of a wandering pitch under a 4 Hz envelope,
+    with the odd fricative burst between them."""
+    n = int(seconds * RATE)
+    t = np.arange(n) / RATE
+    f0 = rng.uniform(100, 220) * (1 + 0.08 * np.sin(2 * np.pi * rng.uniform(0.5, 2) * t))
+    phase = 2 * np.pi * np.cumsum(f0) / RATE
+    formants = rng.uniform([500, 1200, 2400], [800, 1800, 3000])
+    voiced = np.zeros(n)
+    for k in range(1, 30):
+        freq = k * f0.mean()
+        gain = sum(1 / (1 + ((freq - f) / 150) ** 2) for f in formants) / k ** 0.5
+        voiced += gain * np.sin(k * phase)
+    rate = rng.uniform(3, 5)
+    envelope = np.clip(np.sin(np.pi * rate * t + rng.uniform(0, 1)), 0, None) ** 0.6
+    out = voiced * envelope
+    for _ in range(int(seconds * 1.5)):
+        start = rng.integers(0, max(1, n - 1600))
+        burst = rng.normal(0, 1, 1600) * np.hanning(1600)
+        out[start:start + 1600] += np.diff(burst, prepend=0) * 0.6
+    return out / np.sqrt(np.mean(out ** 2)) * level
+
+
+def clicks(seconds, rng, level=0.05):
+    n = int(seconds * RATE)
+    out = np.zeros(n)
+    pos = int(rng.uniform(0.05, 0.2) * RATE)
+    while pos < n - 400:
+        length = rng.integers(80, 240)
+        click = rng.normal(0, 1, length) * np.exp(-np.arange(length) / (length / 5))
+        out[pos:pos + length] += click * rng.uniform(0.5, 1.5)
+        pos += int(rng.uniform(0.08, 0.3) * RATE)
+    return out / (np.sqrt(np.mean(out ** 2)) + 1e-9) * level
+
+
+def knock(seconds, rng, level=0.1):
+    n = int(seconds * RATE)
+    out = np.zeros(n)
+    length = int(0.06 * RATE)
+    start = rng.integers(0, n - length)
+    t = np.arange(length) / RATE
+    out[start:start + length] = np.sin(2 * np.pi * rng.uniform(80, 200) * t) * np.exp(-t * 60)
+    out[start:start + length] += rng.normal(0, 0.3, length) * np.exp(-t * 120)
+    return out / np.abs(out).max() * level * 3
+
+
+def phrase(kind, rng):
+    """Lead-in, content and tail as listen() would return them."""
+    lead, body, tail = rng.uniform(0.3, 0.5), rng.uniform(0.8, 2.5), rng.uniform(0.5, 0.8)
+    total = lead + body + tail
+    base = room(total, rng)
+    content = np.zeros(int(body * RATE))
+    if kind == "speech":
+        content = syllables(body, rng)
+    elif kind == "speech_fan":
+        content = syllables(body, rng)
+        base += fan(total, rng, 0.08 / 10 ** (10 / 20))
+    elif kind == "fan":
+        base += fan(total, rng, rng.uniform(0.01, 0.05))
+    elif kind == "keyboard":
+        content = clicks(body, rng)
+    elif kind == "hiss":
+        base += rng.normal(0, rng.uniform(0.005, 0.02), len(base))
+    elif kind == "door":
+        content = knock(body, rng)
+    start = int(lead * RATE)
+    base[start:start + len(content)] += content[:len(base) - start]
+    return np.clip(base, -1, 1)
+
+
+def write_wav(path, samples):
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        wf.writeframes((samples * 32767).astype("<i2").tobytes())
+
+
+def energy_passes(samples, threshold=250, frame=1024, frames_needed=3):
+    """Roughly what SpeechRecognition's energy threshold lets through."""
+    n = len(samples) // frame
+    pcm = samples[:n * frame].reshape(n, frame) * 32768
+    loud = np.sqrt(np.mean(pcm ** 2, axis=1)) > threshold
+    return int(loud.sum()) >= frames_needed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--per-class", type=int, default=40)
+    parser.add_argument("--fixtures", help="write the WAV fixtures here and keep them")
+    parser.add_argument("--seed", type=int, default=24)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    fixtures = args.fixtures or tempfile.mkdtemp(prefix="nova_vad_")
+    os.makedirs(fixtures, exist_ok=True)
+    try:
+        paths = []
+        for kind in CLASSES:
+            for i in range(args.per_class):
+                path = os.path.join(fixtures, f"{kind}_{i:03d}.wav")
+                write_wav(path, phrase(kind, rng))
+                paths.append((kind, path))
+        random.Random(args.seed).shuffle(paths)
+
+        detector = VoiceActivityDetector(sample_rate=RATE)
+        results = {kind: [0, 0, 0] for kind in CLASSES}    # correct, total, energy passes
+        misses = []
+        elapsed = 0.0
+        for kind, path in paths:
+            samples, rate = read_wav(path)
+            pcm = (samples * 32767).astype("<i2").tobytes()
+            start = time.perf_counter()
+            decision = detector.check_pcm(pcm, 2, rate)
+            elapsed += time.perf_counter() - start
+            r = results[kind]
+            right = decision.speech == (kind in SPEECH_CLASSES)
+            if not right:
+                misses.append(f"{os.path.basename(path)}: {'dropped' if kind in SPEECH_CLASSES else 'kept'}")
+            r[0] += right
+            r[1] += 1
+            r[2] += energy_passes(samples)
+
+        for kind in CLASSES:
+            correct, total, passes = results[kind]
+            label = "kept" if kind in SPEECH_CLASSES else "dropped"
+            print(f"{kind:11s} {label:7s} {correct:3d}/{total}  (energy threshold passes {passes}/{total})")
+        stats = detector.stats()
+        print(f"{stats['checked']} phrases, {stats['audio_seconds']:.0f} s of audio: "
+              f"{stats['dropped']} dropped, {stats['suppressed_fraction']:.0%} of the audio held back; "
+              f"{elapsed / stats['checked'] * 1000:.2f} ms per phrase "
+              f"({stats['audio_seconds'] / elapsed:.0f}x real time)")
+        if args.fixtures:
+            print(f"fixtures in {fixtures}; check one with python -m nova.vad {paths[0][1]}")
+    finally:
+        if not args.fixtures:
+            shutil.rmtree(fixtures, ignore_errors=True)
+    for miss in misses:
+        print(f"FAIL {miss}")
+    if misses:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
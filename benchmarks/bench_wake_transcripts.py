@@ -0,0 +1,98 @@
+"""Accuracy and throughput of the wake-word matcher on labelled transcripts.
+
+Compares WakeWordMatcher with the substring + difflib check that
+_is_wake_word used to run, on the same transcripts.
+
+Usage: python benchmarks/bench_wake_transcripts.py [--repeat 200]
+"""
+import argparse
+import difflib
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.wake_text import WakeWordMatcher  # noqa: E402
+
+LEGACY_TRIGGERS = [
+    "nova", "noah", "nora", "novah", "nover", "novar",
+    "know va", "now a", "no va", "now va", "nor va",
+    "nova.", "no ah", "nova!", "noaa", "over",
+    "novaa", "novas", "novo", "nava", "neva",
+    "norva", "nova's", "knova", "gnova",
+]
+
+# (transcript, should wake)
+LABELLED = [
+    ("nova", True), ("nova open chrome", True), ("hey nova", True),
+    ("nova, open spotify", True), ("noah", True), ("nora open discord", True),
+    ("novah", True), ("nover close chrome", True), ("no va", True),
+    ("know va open notepad", True), ("noba open terminal", True), ("nuva", True),
+    ("knova", True), ("gnova open code", True), ("nova's listening", True),
+    ("okay nova open photos from d drive", True), ("novo open excel", True),
+    ("neva", True), ("nava open word", True), ("nova close teams", True),
+    ("i'll go over there later", False), ("the game is over", False),
+    ("now available in stores", False), ("move it over here", False),
+    ("can you hand me the remote", False), ("never mind", False),
+    ("i need a new laptop", False), ("let's order some pizza", False),
+    ("the navy ship arrived", False), ("my nephew is visiting", False),
+    ("turn the page over", False), ("a supernova exploded", False),
+    ("she read a novel yesterday", False), ("now a days everyone has a phone", False),
+    ("we are going home now", False), ("open the window please", False),
+    ("that was a long meeting", False), ("it's all over the news", False),
+    ("can you call mom", False), ("the casanova character", False),
+]
+
+
+def legacy_is_wake_word(heard_text):
+    """The original NovaAssistant._is_wake_word."""
+    heard = heard_text.lower().strip()
+    for trigger in LEGACY_TRIGGERS:
+        if trigger in heard:
+            return True
+    for w in heard.split():
+        w_clean = re.sub(r"[^a-z]", "", w)
+        if not w_clean:
+            continue
+        if difflib.SequenceMatcher(None, w_clean, "nova").ratio() >= 0.6:
+            return True
+    return False
+
+
+def evaluate(fn, repeat):
+    false_accepts = false_rejects = 0
+    for text, wake in LABELLED:
+        got = fn(text)
+        if got and not wake:
+            false_accepts += 1
+        elif wake and not got:
+            false_rejects += 1
+    texts = [t for t, _ in LABELLED]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for t in texts:
+            fn(t)
+    elapsed = time.perf_counter() - start
+    return false_accepts, false_rejects, repeat * len(texts) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    matcher = WakeWordMatcher()
+    positives = sum(1 for _, w in LABELLED if w)
+    negatives = len(LABELLED) - positives
+    print(f"transcripts: {positives} wake, {negatives} non-wake")
+    for name, fn in (("legacy difflib", legacy_is_wake_word),
+                     ("compiled phonetic", lambda t: matcher.parse(t) is not None)):
+        fa, fr, rate = evaluate(fn, args.repeat)
+        print(f"{name:18s} false accepts {fa:2d}/{negatives}  false rejects {fr:2d}/{positives}  "
+              f"{rate:10.0f} transcripts/s")
+
+
+if __name__ == "__main__":
+    main()
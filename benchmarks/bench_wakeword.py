@@ -0,0 +1,134 @@
+"""Evaluate the offline wake-word spotter on WAV fixtures.
+
+Reports CPU time per second of audio, the hit rate on recordings that
+contain the wake word, and false accepts per hour on recordings that
+don't.
+
+Usage:
+    python benchmarks/bench_wakeword.py --templates DIR --positives DIR --negatives DIR
+    python benchmarks/bench_wakeword.py --synthetic     # formant-synthesised stand-ins
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.audio import read_wav  # noqa: E402
+from nova.wakeword import KeywordSpotter, features_from_samples  # noqa: E402
+
+SR = 16000
+CHUNK = 1024
+
+# Rough (F1, F2) vowel formants and durations standing in for spoken words
+WAKE = [((300, 2300), 0.08), ((500, 900), 0.15), ((350, 1900), 0.07), ((700, 1200), 0.18)]
+DISTRACTORS = [
+    [((270, 2300), 0.12), ((400, 2000), 0.10)],
+    [((700, 1100), 0.20), ((300, 800), 0.15), ((500, 1500), 0.10)],
+    [((600, 1000), 0.10), ((250, 2200), 0.12), ((450, 850), 0.20)],
+]
+
+
+def _vowel(f0, formants, dur, rng):
+    t = np.arange(int(SR * dur)) / SR
+    sig = np.zeros_like(t)
+    for h in range(1, 60):
+        f = f0 * h
+        if f > 7000:
+            break
+        gain = sum(np.exp(-((f - F) / 120.0) ** 2) for F in formants) + 0.02
+        sig += gain * np.sin(2 * np.pi * f * t + rng.uniform(0, 2 * np.pi))
+    env = np.minimum(1.0, np.minimum(t / 0.02, (dur - t) / 0.02))
+    return 0.3 * sig / np.abs(sig).max() * env
+
+
+def _word(spec, rng, speed=1.0, pitch=1.0):
+    return np.concatenate([_vowel(120 * pitch, f, d / speed, rng) for f, d in spec])
+
+
+def _noise(seconds, rng, level=0.003):
+    return rng.normal(0, level, int(SR * seconds))
+
+
+def synthetic_set(rng, count=20):
+    templates = [
+        features_from_samples(np.concatenate((_noise(0.2, rng), _word(WAKE, rng, s, p), _noise(0.2, rng))), SR)
+        for s, p in [(1.0, 1.0), (0.9, 1.05), (1.1, 0.95)]
+    ]
+    positives = [
+        (np.concatenate((_noise(1, rng), _word(WAKE, rng, rng.uniform(0.9, 1.1), rng.uniform(0.93, 1.07)), _noise(1, rng))), SR)
+        for _ in range(count)
+    ]
+    negatives = [
+        (np.concatenate([_noise(1, rng)] + [_word(DISTRACTORS[rng.integers(3)], rng) for _ in range(4)] + [_noise(1, rng)]), SR)
+        for _ in range(count)
+    ]
+    return templates, positives, negatives
+
+
+def load_dir(path):
+    return [read_wav(os.path.join(path, f)) for f in sorted(os.listdir(path)) if f.lower().endswith(".wav")]
+
+
+def stream(spotter, samples, rate):
+    """Feed a recording chunk by chunk like the microphone would. Returns hit count."""
+    spotter.reset()
+    pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes()
+    step = CHUNK * 2
+    return sum(spotter.feed(pcm[i:i + step]) for i in range(0, len(pcm), step))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--templates")
+    parser.add_argument("--positives")
+    parser.add_argument("--negatives")
+    parser.add_argument("--threshold", type=float)
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        templates, positives, negatives = synthetic_set(np.random.default_rng(args.seed))
+        rate = SR
+    elif args.templates and args.positives and args.negatives:
+        templates = [features_from_samples(*w) for w in load_dir(args.templates)]
+        positives = load_dir(args.positives)
+        negatives = load_dir(args.negatives)
+        rate = positives[0][1] if positives else SR
+    else:
+        parser.error("give --templates/--positives/--negatives or --synthetic")
+
+    spotter = KeywordSpotter(templates, threshold=args.threshold, sample_rate=rate)
+
+    audio_seconds = 0.0
+    cpu = 0.0
+    hits = 0
+    for samples, r in positives:
+        start = time.process_time()
+        hits += stream(spotter, samples, r) > 0
+        cpu += time.process_time() - start
+        audio_seconds += len(samples) / r
+
+    false_accepts = 0
+    negative_seconds = 0.0
+    for samples, r in negatives:
+        start = time.process_time()
+        false_accepts += stream(spotter, samples, r)
+        cpu += time.process_time() - start
+        negative_seconds += len(samples) / r
+    audio_seconds += negative_seconds
+
+    print(f"templates={len(templates)} threshold={spotter.threshold:.2f}")
+    print(f"audio:          {audio_seconds:.1f} s")
+    print(f"cpu per audio s: {cpu / audio_seconds * 1000:.1f} ms ({cpu / audio_seconds:.1%} of one core)")
+    print(f"hit rate:       {hits}/{len(positives)} ({hits / max(1, len(positives)):.0%})")
+    print(f"false accepts:  {false_accepts} in {negative_seconds:.0f} s "
+          f"({false_accepts / max(negative_seconds, 1e-9) * 3600:.1f}/hour)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Cost of "open X" window switching with and without the window registry.
+
+A fake desktop stands in for EnumWindows. Each window visit costs
+--visit-us of busy time, which is roughly what the IsWindowVisible +
+GetWindowText round trip costs per window on Windows. A stream of commands
+is replayed two ways. The legacy path enumerates every window on every
+command, like the old _switch_to_window. WindowRegistry enumerates at most
+once per TTL and on misses. With --prefetch the snapshot is refreshed
+between commands, outside the timed region, the way run_loop does while the
+command is being recognised.
+
+Usage: python benchmarks/bench_window_registry.py [--windows 300] [--commands 2000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.windows import FakeWindowProvider, WindowRegistry, window_keywords  # noqa: E402
+
+APPS = {
+    "chrome": "New Tab - Google Chrome",
+    "code": "main.py - nova - Visual Studio Code",
+    "spotify": "Spotify Premium",
+    "discord": "#general | Discord",
+    "notepad": "notes.txt - Notepad",
+    "terminal": "Windows Terminal",
+}
+
+
+def busy(us):
+    end = time.perf_counter() + us / 1e6
+    while time.perf_counter() < end:
+        pass
+
+
+class CostlyProvider(FakeWindowProvider):
+    """FakeWindowProvider that charges `visit_us` per window per enumeration."""
+
+    def __init__(self, titles, visit_us):
+        super().__init__(titles)
+        self.visit_us = visit_us
+
+    def list_windows(self):
+        busy(self.visit_us * len(self._windows))
+        return super().list_windows()
+
+
+def legacy_switch(provider, app_name):
+    """The old enumerate-everything lookup."""
+    keywords = window_keywords(app_name)
+    for handle, title in provider.list_windows():
+        title = title.lower()
+        if any(kw in title for kw in keywords):
+            return provider.activate(handle)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", type=int, default=300, help="background windows (tool windows, tray, ...)")
+    parser.add_argument("--commands", type=int, default=2000)
+    parser.add_argument("--visit-us", type=float, default=15.0)
+    parser.add_argument("--gap-ms", type=float, default=400.0, help="simulated time between commands")
+    parser.add_argument("--ttl", type=float, default=1.5)
+    parser.add_argument("--prefetch", action="store_true")
+    parser.add_argument("--seed", type=int, default=9)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    background = [f"Background window {i}" for i in range(args.windows)]
+    opened = list(APPS.values())
+    spoken = list(APPS) + ["excel", "telegram"]          # two are never open
+    commands = [rng.choice(spoken) for _ in range(args.commands)]
+
+    legacy_provider = CostlyProvider(background + opened, args.visit_us)
+    start = time.perf_counter()
+    legacy_hits = sum(legacy_switch(legacy_provider, c) for c in commands)
+    legacy = time.perf_counter() - start
+
+    fake_now = [0.0]
+    provider = CostlyProvider(background + opened, args.visit_us)
+    registry = WindowRegistry(provider, ttl=args.ttl, clock=lambda: fake_now[0])
+    cached = 0.0
+    hits = 0
+    for c in commands:
+        if args.prefetch:
+            registry.refresh()
+        start = time.perf_counter()
+        hits += registry.switch_to(c)
+        cached += time.perf_counter() - start
+        fake_now[0] += args.gap_ms / 1000.0
+
+    print(f"{len(background) + len(opened)} windows, {len(commands)} commands, "
+          f"{args.gap_ms:.0f} ms apart, ttl {args.ttl}s")
+    print(f"legacy   {legacy / len(commands) * 1000:7.3f} ms/command  "
+          f"{legacy_provider.enumerations} enumerations  {legacy_hits} switches")
+    label = "prefetch" if args.prefetch else "registry"
+    print(f"{label} {cached / len(commands) * 1000:7.3f} ms/command  "
+          f"{provider.enumerations} enumerations  {hits} switches")
+
+
+if __name__ == "__main__":
+    main()
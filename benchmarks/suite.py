@@ -0,0 +1,370 @@
+"""Benchmark suite for the command-resolution hot paths, with saved baselines.
+
+Generates a synthetic setup: --commands custom commands, --apps installed
+apps, a tree of --folders folders in a temp directory, and --transcripts
+labelled transcripts. Then it measures every path an utterance goes through:
+
+    wake     WakeWordMatcher.parse on wake / no-wake transcripts
+    intents  IntentRouter.route (what _parse_drive_command and the if-chain did)
+    custom   CommandMatcher.match, the custom-command scan
+    apps     FuzzyIndex.best over installed app names, a third of them misheard
+    folders  FolderIndex.find over the folder tree, a third of them misheard
+    resolve  NovaEngine.feed end to end, wake word included
+
+For each path it reports:
+- ops/sec, the median of --repeat rounds of at least 0.1 s each
+- "relative": ops/sec divided by the speed of a fixed pure-Python loop
+  timed in the same round
+- the time and peak Python heap to build the structure
+- the peak heap while querying
+- the share of labelled queries answered correctly
+
+Everything is headless and runs on Linux without a display.
+
+--save writes the results to a JSON baseline. --baseline compares against
+one and exits 1 when a path regressed by more than --tolerance: lower
+relative speed, more memory or fewer correct answers. Comparing relative
+speed rather than raw ops/sec keeps CPU clock changes and a different
+machine from reading as regressions.
+
+Usage: python benchmarks/suite.py [--quick] [--only wake,apps] [--save FILE] [--baseline FILE] [--tolerance 0.3]
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from nova.engine import NovaEngine  # noqa: E402
+from nova.folders import FolderIndex  # noqa: E402
+from nova.matching import CommandMatcher, FuzzyIndex  # noqa: E402
+from nova.wake_text import NOVA_ALIASES, WakeWordMatcher  # noqa: E402
+
+SIZES = {"commands": 1000, "apps": 500, "folders": 5000, "transcripts": 5000}
+QUICK_SIZES = {"commands": 200, "apps": 100, "folders": 1000, "transcripts": 1000}
+
+SYLLABLES = [c + v for c in "bdfgklmprstvz" for v in "aeiou"]
+NOT_WAKE = [
+    "over there", "now a days", "the noble gas", "move it over", "never again",
+    "i know that", "open the door", "no way", "the nevada desert", "not now",
+]
+FILLERS = ["", "", "please ", "can you "]
+
+
+# -- generators ----------------------------------------------------------------
+
+def make_names(n, rng, words=(1, 2), taken=()):
+    """`n` distinct pronounceable names such as "kabo rulesi"."""
+    names = set()
+    taken = set(taken)
+    while len(names) < n:
+        name = " ".join(
+            "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+            for _ in range(rng.randint(*words))
+        )
+        if name not in taken:
+            names.add(name)
+    return sorted(names)
+
+
+def mishear(name, rng):
+    """Drop, double or swap one letter, the way a recognizer slips."""
+    if len(name) < 5:
+        return name
+    i = rng.randrange(1, len(name) - 1)
+    if name[i] == " ":
+        return name
+    op = rng.randrange(3)
+    if op == 0:
+        return name[:i] + name[i + 1:]
+    if op == 1:
+        return name[:i] + name[i] + name[i:]
+    return name[:i - 1] + name[i] + name[i - 1] + name[i + 1:]
+
+
+def make_tree(root, names, fanout=8):
+    """Create one folder per name, breadth first. Returns name -> path."""
+    paths = {}
+    frontier = [root]
+    for i, name in enumerate(names):
+        parent = frontier[i // fanout]
+        path = os.path.join(parent, name)
+        os.mkdir(path)
+        paths[name] = path
+        frontier.append(path)
+    return paths
+
+
+def make_transcripts(n, commands, apps, folders, rng):
+    """(text, wake expected, resolution kind expected) tuples."""
+    cases = [
+        lambda: ("custom", f"open {rng.choice(commands)}"),
+        lambda: ("app", f"open {rng.choice(apps)}"),
+        lambda: ("close", f"close {rng.choice(apps)}"),
+        lambda: ("folder", f"open {rng.choice(folders)} from {rng.choice('cdem')} drive"),
+        lambda: ("drive", f"open {rng.choice('cdem')} drive"),
+        lambda: ("terminal", "open command prompt"),
+        lambda: ("cancel", "never mind"),
+        lambda: ("unknown", "what time is it"),
+    ]
+    out = []
+    for _ in range(n):
+        if rng.random() < 0.15:
+            out.append((rng.choice(NOT_WAKE), False, None))
+            continue
+        kind, text = rng.choice(cases)()
+        if kind == "custom":
+            # Custom commands are found anywhere in the utterance; the
+            # grammar's verbs have to come first
+            text = rng.choice(FILLERS) + text
+        wake = rng.choice(NOVA_ALIASES[:6]) if rng.random() < 0.3 else "nova"
+        out.append((f"{wake} {text}", True, kind))
+    return out
+
+
+# -- measurement ---------------------------------------------------------------
+
+def _reference_work():
+    words = [f"word {i % 97} {i}" for i in range(2000)]
+    table = {}
+    for w in words:
+        table[w.split(" ", 1)[0] + w[-2:]] = len(w)
+    return sorted(words, key=len)[0]
+
+
+def rate(fn, min_time):
+    """Calls of fn() per second, calling it for at least `min_time` seconds."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls / elapsed
+
+
+def measure(build, query, items, repeat):
+    """Build once for time and once for memory, then time queries over `items` in rounds."""
+    start = time.perf_counter()
+    subject = build()
+    build_s = time.perf_counter() - start
+
+    tracemalloc.start()
+    build()
+    build_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    answers = [query(subject, item) for item in items]
+
+    # Each round times the queries, then a fixed pure-Python loop. Dividing
+    # one by the other cancels most of the difference between machines and
+    # CPU clock states; the median of the rounds drops the odd outlier.
+    speeds = []
+    ratios = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            passes = rate(lambda: [query(subject, item) for item in items], 0.1)
+            speeds.append(passes * len(items))
+            ratios.append(speeds[-1] / rate(_reference_work, 0.05))
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    for item in items:
+        query(subject, item)
+    query_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "ops_per_sec": round(statistics.median(speeds)),
+        "relative": round(statistics.median(ratios), 2),
+        "build_ms": round(build_s * 1000, 1),
+        "build_kb": round(build_peak / 1024),
+        "query_kb": round(query_peak / 1024),
+    }, answers
+
+
+def accuracy(answers, expected):
+    return round(sum(a == e for a, e in zip(answers, expected)) / len(expected), 4)
+
+
+def run_cases(sizes, only, repeat, rng, workdir):
+    commands = make_names(sizes["commands"], rng)
+    apps = make_names(sizes["apps"], rng, taken=commands)
+    folders = make_names(sizes["folders"], rng, words=(1, 1))
+    transcripts = make_transcripts(sizes["transcripts"], commands, apps, folders, rng)
+    results = {}
+
+    def case(name):
+        return not only or name in only
+
+    if case("wake"):
+        texts = [t[0] for t in transcripts]
+        r, answers = measure(WakeWordMatcher, lambda m, text: m.parse(text) is not None, texts, repeat)
+        r["accuracy"] = accuracy(answers, [t[1] for t in transcripts])
+        results["wake"] = r
+
+    engine = NovaEngine(os.path.join(workdir, "engine"))
+    engine.custom_commands = {name: f"https://example.com/{i}" for i, name in enumerate(commands)}
+    engine.save_custom_commands()
+    engine.apps = {name: f"C:\\Apps\\{i}.lnk" for i, name in enumerate(apps)}
+    engine.app_index = FuzzyIndex(engine.apps)
+    commands_only = [t for t in transcripts if t[1]]
+    residuals = [engine.parse_wake(t[0])[1] for t in commands_only]
+
+    if case("intents"):
+        r, answers = measure(lambda: engine._build_intents(), lambda router, text: router.best(text), residuals, repeat)
+        names = [a.name if a else "unknown" for a in answers]
+        r["accuracy"] = accuracy(names, [t[2] for t in commands_only])
+        results["intents"] = r
+
+    if case("custom"):
+        queries = [f"{rng.choice(FILLERS)}open {name}" for name in rng.choices(commands, k=sizes["transcripts"])]
+        queries += [f"open {name}" for name in rng.choices(apps, k=sizes["transcripts"] // 4)]
+        expected = [q.split("open ", 1)[1] for q in queries[:sizes["transcripts"]]]
+        expected += [None] * (len(queries) - len(expected))
+        r, answers = measure(lambda: CommandMatcher(commands), lambda m, q: m.match(q), queries, repeat)
+        r["accuracy"] = accuracy(answers, expected)
+        results["custom"] = r
+
+    if case("apps"):
+        picked = rng.choices(apps, k=sizes["transcripts"])
+        queries = [mishear(name, rng) if i % 3 == 0 else name for i, name in enumerate(picked)]
+        r, answers = measure(lambda: FuzzyIndex(apps), lambda index, q: index.best(q), queries, repeat)
+        r["accuracy"] = accuracy(answers, picked)
+        results["apps"] = r
+
+    if case("folders"):
+        root = os.path.join(workdir, "drive")
+        os.mkdir(root)
+        paths = make_tree(root, folders)
+
+        def build_folders():
+            index = FolderIndex(root, max_depth=64)
+            index.refresh()
+            return index
+
+        picked = rng.choices(folders, k=sizes["transcripts"])
+        queries = [mishear(name, rng) if i % 3 == 0 else name for i, name in enumerate(picked)]
+        r, answers = measure(build_folders, lambda index, q: index.find(q), queries, repeat)
+        r["accuracy"] = accuracy(answers, [paths[name] for name in picked])
+        results["folders"] = r
+
+    if case("resolve"):
+        texts = [t[0] for t in transcripts]
+
+        def kind_of(engine, text):
+            resolution = engine.feed(text)
+            if resolution is None:
+                return None
+            return resolution.kind
+
+        r, answers = measure(lambda: engine, kind_of, texts, repeat)
+        r.update(build_ms=None, build_kb=None)
+        r["accuracy"] = accuracy(answers, [t[2] for t in transcripts])
+        results["resolve"] = r
+
+    engine.close()
+    return results
+
+
+# -- baselines -----------------------------------------------------------------
+
+def compare(results, baseline, tolerance):
+    """Lines describing each change beyond `tolerance`, and whether any is a regression."""
+    lines = []
+    regressed = False
+    for name, now in results.items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            lines.append(f"  {name:8s} not in the baseline")
+            continue
+        notes = []
+        rel, old_rel = now["relative"], before["relative"]
+        if rel < old_rel * (1 - tolerance):
+            notes.append(f"relative speed {old_rel} -> {rel} ({rel / old_rel - 1:+.0%}; "
+                         f"ops/sec {before['ops_per_sec']} -> {now['ops_per_sec']})")
+        for key in ("build_kb", "query_kb"):
+            old, new = before.get(key), now.get(key)
+            # Ignore growth of a few KB: tracemalloc peaks wobble that much
+            if old is not None and new is not None and new > max(old * (1 + tolerance), old + 64):
+                notes.append(f"{key} {old} -> {new}")
+        if now["accuracy"] < before["accuracy"] - 0.005:
+            notes.append(f"accuracy {before['accuracy']:.2%} -> {now['accuracy']:.2%}")
+        if notes:
+            regressed = True
+            lines.append(f"  {name:8s} REGRESSED: {'; '.join(notes)}")
+        else:
+            lines.append(f"  {name:8s} ok ({rel / old_rel - 1:+.0%} relative speed)")
+    return lines, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="smaller sizes, for a fast check")
+    parser.add_argument("--only", help="comma-separated cases to run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=23)
+    parser.add_argument("--save", help="write the results to this baseline file")
+    parser.add_argument("--baseline", help="compare with this baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed slowdown or memory growth")
+    for key, value in SIZES.items():
+        parser.add_argument(f"--{key}", type=int, help=f"default {value} ({QUICK_SIZES[key]} with --quick)")
+    args = parser.parse_args()
+
+    sizes = dict(QUICK_SIZES if args.quick else SIZES)
+    for key in SIZES:
+        if getattr(args, key) is not None:
+            sizes[key] = getattr(args, key)
+    only = set(args.only.split(",")) if args.only else None
+
+    workdir = tempfile.mkdtemp(prefix="nova_suite_")
+    try:
+        results = run_cases(sizes, only, args.repeat, random.Random(args.seed), workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"sizes: {sizes}")
+    print(f"{'case':8s} {'ops/sec':>10s} {'relative':>9s} {'build ms':>9s} {'build KB':>9s} {'query KB':>9s} {'accuracy':>9s}")
+    for name, r in results.items():
+        build_ms = "-" if r["build_ms"] is None else f"{r['build_ms']:.1f}"
+        build_kb = "-" if r["build_kb"] is None else str(r["build_kb"])
+        print(f"{name:8s} {r['ops_per_sec']:10d} {r['relative']:9.2f} {build_ms:>9s} {build_kb:>9s} {r['query_kb']:9d} {r['accuracy']:9.2%}")
+
+    report = {
+        "sizes": sizes,
+        "seed": args.seed,
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "processor": platform.machine()},
+        "results": results,
+    }
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"saved baseline to {args.save}")
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("sizes") != sizes or baseline.get("seed") != args.seed:
+            print(f"baseline was made with sizes {baseline.get('sizes')} and seed {baseline.get('seed')}; "
+                  "comparing anyway")
+        lines, regressed = compare(results, baseline, args.tolerance)
+        print(f"against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        print("\n".join(lines))
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Core building blocks for the NOVA desktop assistant.
+
+Everything in this package is importable without a display so it can be
+exercised and benchmarked headlessly on any platform.
+"""
@@ -0,0 +1,270 @@
+"""Bounded executor for voice commands.
+
+run_loop hands each recognised command to an ActionExecutor and goes
+straight back to listening. Worker threads run the actions. A watchdog
+enforces per-action timeouts, and finished, failed or timed-out actions are
+posted to `results`, a thread-safe queue the Tk thread drains.
+
+Python threads can't be killed, so a timeout does three things. It reports
+the action as timed out and sets its `cancelled` event, which long
+actions poll before their side effects (pass your own Event to submit() to
+hand it to the function). It also starts a replacement worker, so one stuck
+action doesn't shrink the pool. The stuck worker retires once its function
+returns.
+"""
+import itertools
+import queue
+import threading
+import time
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+TIMED_OUT = "timed out"
+CANCELLED = "cancelled"
+
+
+class Action:
+    """One submitted unit of work and its outcome."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name, fn, args=(), kwargs=None, timeout=None, cancelled=None):
+        self.id = next(self._ids)
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.timeout = timeout
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.cancelled = cancelled or threading.Event()
+        self.submitted = time.perf_counter()
+        self.started = None
+        self.finished = None
+        self._done = threading.Event()
+
+    @property
+    def queue_wait(self):
+        return (self.started or time.perf_counter()) - self.submitted
+
+    @property
+    def run_time(self):
+        if self.started is None:
+            return None
+        return (self.finished or time.perf_counter()) - self.started
+
+    def wait(self, timeout=None):
+        """Block until the action has an outcome. Returns True if it has."""
+        return self._done.wait(timeout)
+
+    def __repr__(self):
+        return f"<Action {self.id} {self.name!r} {self.status}>"
+
+
+class ActionStats:
+    """Per-action-name counts and latency totals."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_name = {}
+
+    def record(self, action):
+        with self._lock:
+            s = self._by_name.setdefault(action.name, {
+                "count": 0, "failed": 0, "timed_out": 0, "cancelled": 0,
+                "run_total": 0.0, "run_max": 0.0, "wait_total": 0.0, "wait_max": 0.0,
+            })
+            s["count"] += 1
+            if action.status == FAILED:
+                s["failed"] += 1
+            elif action.status == TIMED_OUT:
+                s["timed_out"] += 1
+            elif action.status == CANCELLED:
+                s["cancelled"] += 1
+            wait = action.queue_wait
+            s["wait_total"] += wait
+            s["wait_max"] = max(s["wait_max"], wait)
+            run = action.run_time
+            if run is not None:
+                s["run_total"] += run
+                s["run_max"] = max(s["run_max"], run)
+
+    def snapshot(self):
+        with self._lock:
+            out = {}
+            for name, s in self._by_name.items():
+                n = s["count"]
+                out[name] = dict(s, avg_run=s["run_total"] / n, avg_wait=s["wait_total"] / n)
+            return out
+
+
+class ActionExecutor:
+    """Worker pool with a bounded queue, timeouts and cancellation.
+
+    workers         -- threads running actions
+    max_queue       -- queued (not yet running) actions before submit() refuses
+    default_timeout -- seconds an action may run; None for no limit
+    """
+
+    def __init__(self, workers=2, max_queue=16, default_timeout=30.0):
+        self.workers = workers
+        self.default_timeout = default_timeout
+        self.results = queue.Queue()
+        self.stats = ActionStats()
+        self._queue = queue.Queue(max_queue)
+        self._lock = threading.Lock()
+        self._running = {}           # action id -> Action
+        self._threads = set()
+        self._stop = threading.Event()
+        self._watchdog = None
+        self.submitted = 0
+        self.rejected = 0
+        self.max_depth = 0
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    @property
+    def running(self):
+        with self._lock:
+            return list(self._running.values())
+
+    def start(self):
+        for _ in range(self.workers):
+            self._spawn_worker()
+        self._watchdog = threading.Thread(target=self._watch, name="nova-actions-watchdog", daemon=True)
+        self._watchdog.start()
+        return self
+
+    def _spawn_worker(self):
+        t = threading.Thread(target=self._work, name="nova-action", daemon=True)
+        with self._lock:
+            self._threads.add(t)
+        t.start()
+
+    def submit(self, name, fn, *args, timeout=None, cancelled=None, **kwargs):
+        """Queue fn(*args, **kwargs). Returns the Action, or None if the queue is full.
+
+        `cancelled` is an Event to use as the action's cancelled flag, so it
+        can be passed to fn as well.
+        """
+        timeout = self.default_timeout if timeout is None else timeout
+        action = Action(name, fn, args, kwargs, timeout, cancelled)
+        try:
+            self._queue.put_nowait(action)
+        except queue.Full:
+            self.rejected += 1
+            return None
+        self.submitted += 1
+        depth = self._queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+        return action
+
+    def cancel(self, action):
+        """Cancel a queued action, or flag a running one. Returns True if it was pending."""
+        with self._lock:
+            if action.status == QUEUED:
+                action.cancelled.set()
+                self._finish(action, CANCELLED)
+                return True
+            if action.status == RUNNING:
+                action.cancelled.set()
+        return False
+
+    def cancel_all(self):
+        """Drop everything queued and flag everything running. Returns how many were touched."""
+        count = 0
+        sentinels = 0
+        while True:
+            try:
+                action = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if action is None:
+                sentinels += 1
+                continue
+            count += self.cancel(action)
+        for _ in range(sentinels):
+            # shutdown()'s stop markers go back for the workers to find
+            self._queue.put_nowait(None)
+        for action in self.running:
+            action.cancelled.set()
+            count += 1
+        return count
+
+    def shutdown(self, wait=True, timeout=5.0):
+        self._stop.set()
+        for _ in range(len(self._threads)):
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+        if wait:
+            deadline = time.monotonic() + timeout
+            for t in list(self._threads):
+                t.join(max(0.0, deadline - time.monotonic()))
+
+    def _finish(self, action, status, result=None, error=None):
+        # Caller holds self._lock. First outcome wins: a timed-out action
+        # that later returns doesn't get reported twice.
+        if action._done.is_set():
+            return False
+        action.status = status
+        action.result = result
+        action.error = error
+        action.finished = time.perf_counter()
+        action._done.set()
+        self.stats.record(action)
+        self.results.put(action)
+        return True
+
+    def _work(self):
+        me = threading.current_thread()
+        while not self._stop.is_set():
+            action = self._queue.get()
+            if action is None:
+                break
+            with self._lock:
+                if action.status != QUEUED:
+                    continue
+                action.status = RUNNING
+                action.started = time.perf_counter()
+                self._running[action.id] = action
+            try:
+                result = action.fn(*action.args, **action.kwargs)
+                outcome = (DONE, result, None)
+            except Exception as e:
+                print(f"[Nova] Action {action.name!r} failed: {e}")
+                outcome = (FAILED, None, e)
+            with self._lock:
+                self._running.pop(action.id, None)
+                if action.cancelled.is_set() and outcome[0] == DONE:
+                    outcome = (CANCELLED, outcome[1], None)
+                timed_out = action.status == TIMED_OUT
+                self._finish(action, *outcome)
+                if timed_out:
+                    # The watchdog already started a replacement for this thread
+                    self._threads.discard(me)
+                    return
+        with self._lock:
+            self._threads.discard(me)
+
+    def _watch(self):
+        while not self._stop.wait(0.1):
+            now = time.perf_counter()
+            overdue = []
+            with self._lock:
+                for action in list(self._running.values()):
+                    if action.timeout is not None and now - action.started > action.timeout:
+                        del self._running[action.id]
+                        action.cancelled.set()
+                        if self._finish(action, TIMED_OUT):
+                            overdue.append(action)
+            for action in overdue:
+                print(f"[Nova] Action {action.name!r} timed out after {action.timeout:.1f}s")
+                self._spawn_worker()
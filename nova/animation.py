@@ -0,0 +1,192 @@
+"""Frame scheduler for the activation ring and button glow.
+
+The old ticks deleted and recreated the canvas arcs 50 times a second and
+reconfigured the button on every glow tick. Here each animation creates its
+items once and then only moves or recolours them, skipping calls that
+wouldn't change anything. One Animator drives every animation from a single
+after() loop. It runs at full rate while the window has focus, slower when
+it doesn't, and not at all while minimised. Animations are driven by
+elapsed time, so their speed doesn't change with the frame rate.
+
+Nothing here imports Tk: the root, canvas and button are duck-typed, so the
+scheduler can be benchmarked with fakes.
+"""
+import math
+import time
+
+
+class FrameStats:
+    """Frame count, wall time and CPU time spent inside animation frames."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.frames = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.max_wall = 0.0
+        self.skipped = 0          # scheduler wake-ups that drew nothing (minimised)
+        self.started = time.perf_counter()
+
+    def record(self, wall, cpu):
+        self.frames += 1
+        self.wall += wall
+        self.cpu += cpu
+        if wall > self.max_wall:
+            self.max_wall = wall
+
+    def snapshot(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            "frames": self.frames,
+            "fps": self.frames / elapsed if elapsed else 0.0,
+            "avg_frame_ms": self.wall / self.frames * 1000 if self.frames else 0.0,
+            "max_frame_ms": self.max_wall * 1000,
+            "cpu_percent": self.cpu / elapsed * 100 if elapsed else 0.0,
+            "skipped": self.skipped,
+        }
+
+
+class Animator:
+    """Runs animations from one after() loop at an adaptive frame rate.
+
+    root         -- anything with after(ms, fn) and after_cancel(id)
+    fps          -- frame rate while the window is focused
+    idle_fps     -- frame rate while it is visible but unfocused
+    is_minimized -- callable, True while the window is iconified
+    has_focus    -- callable, True while the app has keyboard focus
+    on_frame     -- optional hook called with (wall_seconds, cpu_seconds)
+    clock        -- time source animations are driven by
+    """
+
+    def __init__(self, root, fps=50, idle_fps=12, is_minimized=None, has_focus=None,
+                 on_frame=None, clock=time.perf_counter):
+        self.root = root
+        self._clock = clock
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self._is_minimized = is_minimized or (lambda: False)
+        self._has_focus = has_focus or (lambda: True)
+        self.on_frame = on_frame
+        self.animations = []
+        self.stats = FrameStats()
+        self._after_id = None
+        self._t0 = None
+
+    @property
+    def running(self):
+        return self._t0 is not None
+
+    def add(self, animation):
+        self.animations.append(animation)
+        return animation
+
+    def start(self):
+        if self.running:
+            return
+        self._t0 = self._clock()
+        self.stats.reset()
+        for anim in self.animations:
+            anim.show()
+        self._frame()
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._t0 = None
+        for anim in self.animations:
+            anim.hide()
+
+    def interval_ms(self):
+        """Delay until the next frame for the window's current state."""
+        if self._is_minimized():
+            return 250                      # just poll for being restored
+        fps = self.fps if self._has_focus() else self.idle_fps
+        return max(1, int(1000 / fps))
+
+    def _frame(self):
+        self._after_id = None
+        if not self.running:
+            return
+        if self._is_minimized():
+            self.stats.skipped += 1
+        else:
+            wall0 = time.perf_counter()
+            cpu0 = time.process_time()
+            t = self._clock() - self._t0
+            for anim in self.animations:
+                anim.tick(t)
+            wall = time.perf_counter() - wall0
+            cpu = time.process_time() - cpu0
+            self.stats.record(wall, cpu)
+            if self.on_frame:
+                self.on_frame(wall, cpu)
+        self._after_id = self.root.after(self.interval_ms(), self._frame)
+
+
+class PulseRing:
+    """Two arcs rotating around the activation button.
+
+    Both arcs are created hidden when the ring is built; frames only change
+    their start angle.
+    """
+
+    def __init__(self, canvas, center, radius, color, dim_color, speed=100.0):
+        self.canvas = canvas
+        self.speed = speed              # degrees per second
+        box = (center - radius, center - radius, center + radius, center + radius)
+        self._outer = canvas.create_arc(
+            *box, start=0, extent=120, outline=color, width=3,
+            style="arc", tags="pulse", state="hidden"
+        )
+        self._inner = canvas.create_arc(
+            *box, start=180, extent=80, outline=dim_color, width=2,
+            style="arc", tags="pulse", state="hidden"
+        )
+        self._angle = None
+
+    def show(self):
+        self.canvas.itemconfigure("pulse", state="normal")
+
+    def hide(self):
+        self.canvas.itemconfigure("pulse", state="hidden")
+        self._angle = None
+
+    def tick(self, t):
+        angle = int(t * self.speed) % 360
+        if angle == self._angle:
+            return
+        self._angle = angle
+        self.canvas.itemconfigure(self._outer, start=angle)
+        self.canvas.itemconfigure(self._inner, start=(angle + 180) % 360)
+
+
+class ButtonGlow:
+    """Switches a button between two colours on a slow sine wave.
+
+    configure() is only called when the colour actually flips, twice per
+    period, instead of on every frame.
+    """
+
+    def __init__(self, button, bright, dim, period=6.0, threshold=0.7):
+        self.button = button
+        self.bright = bright
+        self.dim = dim
+        self.period = period
+        self.threshold = threshold
+        self._color = None
+
+    def show(self):
+        self._color = None
+
+    def hide(self):
+        self._color = None
+
+    def tick(self, t):
+        intensity = 0.5 + 0.5 * math.sin(t / self.period * 2 * math.pi)
+        color = self.bright if intensity > self.threshold else self.dim
+        if color != self._color:
+            self._color = color
+            self.button.configure(fg_color=color)
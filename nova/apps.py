@@ -0,0 +1,171 @@
+"""Installed-application catalog with a persistent on-disk cache.
+
+The catalog maps lowercase app names to a launch target: a shortcut path
+found under the Start Menu trees, or an AppID reported by Get-StartApps.
+Each directory is stored with its mtime so a warm start only rescans the
+directories that actually changed. The external enumerator runs last and
+its result is applied as a diff.
+"""
+import json
+import os
+import subprocess
+
+from nova.storage import atomic_write_json
+
+APP_EXTENSIONS = (".lnk", ".exe", ".url")
+CACHE_VERSION = 1
+
+
+def start_menu_dirs():
+    """The per-machine and per-user Start Menu program folders."""
+    return [
+        os.path.join(os.environ.get("ProgramData", ""), "Microsoft", "Windows", "Start Menu", "Programs"),
+        os.path.join(os.environ.get("APPDATA", ""), "Microsoft", "Windows", "Start Menu", "Programs"),
+    ]
+
+
+def scan_directory(path):
+    """List one directory level. Returns ({name: shortcut_path}, [subdirs])."""
+    apps = {}
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.lower().endswith(APP_EXTENSIONS):
+                    apps[os.path.splitext(entry.name)[0].lower()] = entry.path
+            except OSError:
+                continue
+    subdirs.sort()
+    return apps, subdirs
+
+
+def get_start_apps():
+    """Ask PowerShell's Get-StartApps for packaged and registered apps."""
+    ps = "Get-StartApps | Select-Object Name, AppID | ConvertTo-Json -Compress"
+    res = subprocess.run(
+        ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps],
+        capture_output=True, text=True, encoding="utf-8", errors="ignore"
+    )
+    apps = {}
+    if res.returncode == 0 and res.stdout.strip():
+        data = json.loads(res.stdout)
+        if isinstance(data, dict):
+            data = [data]
+        for item in data:
+            n, i = (item.get("Name") or "").lower(), item.get("AppID")
+            if n and i:
+                apps[n] = i
+    return apps
+
+
+def _mtime(path):
+    return os.stat(path).st_mtime_ns
+
+
+class AppCatalog:
+    """Start Menu shortcuts plus enumerator results, cached between runs.
+
+    scanner    -- callable(path) -> ({name: target}, [subdirs]) for one level
+    enumerator -- callable() -> {name: target}, or None to skip it
+    """
+
+    def __init__(self, roots, cache_path=None, scanner=scan_directory,
+                 enumerator=get_start_apps):
+        self.roots = list(roots)
+        self.cache_path = cache_path
+        self._scanner = scanner
+        self._enumerator = enumerator
+        self._dirs = {}
+        self._start_apps = {}
+        self.apps = {}
+
+    def _rebuild(self):
+        # Same precedence as the original walk: later shortcuts win, and
+        # enumerator entries override shortcuts of the same name.
+        apps = {}
+        for entry in self._dirs.values():
+            apps.update(entry["apps"])
+        apps.update(self._start_apps)
+        self.apps = apps
+
+    def load_cache(self):
+        """Populate the catalog from disk. Returns True if a usable cache was read."""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return False
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != CACHE_VERSION:
+                return False
+            if data.get("roots") == self.roots:
+                self._dirs = {
+                    path: {"mtime": e["mtime"], "apps": dict(e["apps"]), "subdirs": list(e["subdirs"])}
+                    for path, e in data.get("dirs", {}).items()
+                }
+            self._start_apps = dict(data.get("start_apps", {}))
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            self._dirs = {}
+            self._start_apps = {}
+            return False
+        self._rebuild()
+        return True
+
+    def save_cache(self):
+        if not self.cache_path:
+            return
+        data = {
+            "version": CACHE_VERSION,
+            "roots": self.roots,
+            "dirs": self._dirs,
+            "start_apps": self._start_apps,
+        }
+        try:
+            atomic_write_json(self.cache_path, data)
+        except OSError:
+            pass
+
+    def refresh_dirs(self):
+        """Rescan only directories whose mtime changed. Returns True if anything did."""
+        new_dirs = {}
+        changed = False
+        stack = list(reversed(self.roots))
+        while stack:
+            path = stack.pop()
+            if path in new_dirs:
+                continue
+            try:
+                mtime = _mtime(path)
+            except OSError:
+                continue
+            entry = self._dirs.get(path)
+            if entry is None or entry["mtime"] != mtime:
+                try:
+                    apps, subdirs = self._scanner(path)
+                except OSError:
+                    continue
+                entry = {"mtime": mtime, "apps": apps, "subdirs": subdirs}
+                changed = True
+            new_dirs[path] = entry
+            stack.extend(reversed(entry["subdirs"]))
+
+        if new_dirs.keys() != self._dirs.keys():
+            changed = True
+        self._dirs = new_dirs
+        if changed:
+            self._rebuild()
+        return changed
+
+    def refresh_enumerator(self):
+        """Run the external enumerator and apply its diff. Returns (added, removed)."""
+        if self._enumerator is None:
+            return set(), set()
+        fresh = self._enumerator()
+        old = self._start_apps
+        added = {k for k, v in fresh.items() if old.get(k) != v}
+        removed = set(old) - set(fresh)
+        if added or removed:
+            self._start_apps = dict(fresh)
+            self._rebuild()
+        return added, removed
@@ -0,0 +1,33 @@
+"""PCM and WAV helpers shared by the audio front ends.
+
+The voice-activity gate, the endpointer, the wake-word spotter and replay
+recordings all work on float32 samples in [-1, 1]; these turn raw PCM
+bytes and WAV files into that.
+"""
+import wave
+
+import numpy as np
+
+
+def pcm_to_float(data, sample_width=2):
+    """Little-endian signed PCM bytes -> float32 samples in [-1, 1]."""
+    if sample_width == 2:
+        return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+    if sample_width == 4:
+        return np.frombuffer(data, dtype="<i4").astype(np.float32) / 2147483648.0
+    if sample_width == 1:
+        return (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    raise ValueError(f"Unsupported sample width: {sample_width}")
+
+
+def read_wav(path):
+    """Read a WAV file as mono float32. Returns (samples, sample_rate)."""
+    with wave.open(path, "rb") as wf:
+        channels = wf.getnchannels()
+        width = wf.getsampwidth()
+        rate = wf.getframerate()
+        data = wf.readframes(wf.getnframes())
+    samples = pcm_to_float(data, width)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, rate
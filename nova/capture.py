@@ -0,0 +1,204 @@
+"""Continuous audio capture into a preallocated ring buffer.
+
+A capture thread copies microphone chunks into one fixed bytearray, so audio
+keeps being recorded while the recognizer, TTS or a command is busy.
+Consumers read from their own cursor and get exactly the audio that followed
+what they saw last. Nothing spoken between the wake word and the command is
+lost.
+"""
+import threading
+
+import speech_recognition as sr
+
+
+class AudioRingBuffer:
+    """Fixed-size byte ring addressed by absolute stream position.
+
+    Positions count every byte ever written, so a reader's cursor stays
+    valid across wrap-arounds. Data older than `capacity` bytes is gone; a
+    reader that falls that far behind is moved forward and `overruns` is
+    incremented.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = int(capacity)
+        self._buf = bytearray(self.capacity)
+        self._view = memoryview(self._buf)
+        self._write_pos = 0
+        self._cond = threading.Condition()
+        self.closed = False
+        self.overruns = 0
+
+    @property
+    def write_pos(self):
+        return self._write_pos
+
+    @property
+    def oldest_pos(self):
+        return max(0, self._write_pos - self.capacity)
+
+    def write(self, data):
+        size = len(data)
+        if not size:
+            return
+        if size > self.capacity:
+            data = memoryview(data)[-self.capacity:]
+            skipped = size - self.capacity
+            size = self.capacity
+        else:
+            skipped = 0
+        with self._cond:
+            start = (self._write_pos + skipped) % self.capacity
+            first = min(size, self.capacity - start)
+            self._view[start:start + first] = data[:first]
+            if first < size:
+                self._view[:size - first] = data[first:]
+            self._write_pos += skipped + size
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def wait_for(self, pos, timeout=None):
+        """Block until `pos` bytes have been written (or the ring closes)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._write_pos >= pos or self.closed, timeout)
+
+    def read_view(self, pos, size, timeout=None):
+        """Zero-copy read of up to `size` bytes at `pos`.
+
+        Returns (view, new_pos). The view aliases ring memory and is only
+        valid until the writer laps it, so process it right away; a read
+        that straddles the wrap point comes back as a copy instead.
+        """
+        self.wait_for(pos + size, timeout)
+        with self._cond:
+            if pos < self.oldest_pos:
+                self.overruns += 1
+                pos = self.oldest_pos
+            end = min(pos + size, self._write_pos)
+            if end <= pos:
+                return self._view[0:0], pos
+            start = pos % self.capacity
+            stop = start + (end - pos)
+            if stop <= self.capacity:
+                return self._view[start:stop], end
+            return bytes(self._view[start:]) + bytes(self._view[:stop - self.capacity]), end
+
+    def read(self, pos, size, timeout=None):
+        """Like read_view() but returns an owned bytes copy."""
+        view, new_pos = self.read_view(pos, size, timeout)
+        return bytes(view), new_pos
+
+
+class _RingStream:
+    """File-like cursor over the ring, shaped like a PyAudio stream."""
+
+    def __init__(self, source):
+        self._source = source
+
+    def read(self, frames):
+        return self._source._read(frames, copy=True)
+
+    def read_view(self, frames):
+        return self._source._read(frames, copy=False)
+
+    def close(self):
+        pass
+
+
+class CaptureThread:
+    """Copies chunks from a live source into an AudioRingBuffer.
+
+    `source` is an entered audio source (sr.Microphone, ReplaySource, ...)
+    or anything with SAMPLE_RATE, SAMPLE_WIDTH, CHUNK and stream.read(n).
+    """
+
+    def __init__(self, source, seconds=30.0):
+        self.source = source
+        self.SAMPLE_RATE = source.SAMPLE_RATE
+        self.SAMPLE_WIDTH = source.SAMPLE_WIDTH
+        self.CHUNK = source.CHUNK
+        self.ring = AudioRingBuffer(int(seconds * self.SAMPLE_RATE) * self.SAMPLE_WIDTH)
+        self.chunks = 0
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="nova-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        self.ring.close()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        read = self.source.stream.read
+        while not self._stop.is_set():
+            try:
+                data = read(self.CHUNK)
+            except Exception as e:
+                self.errors += 1
+                print(f"[Nova] Capture error: {e}")
+                if self.errors > 50:
+                    break
+                continue
+            if not data:
+                break
+            self.ring.write(data)
+            self.chunks += 1
+        self.ring.close()
+
+    def open_reader(self, pos=None):
+        """A new audio source reading from `pos` (default: live edge)."""
+        return RingBufferSource(self, self.ring.write_pos if pos is None else pos)
+
+
+class RingBufferSource(sr.AudioSource):
+    """An audio source that reads from the ring through its own cursor.
+
+    Pass it straight to Recognizer.listen(); `position` can be saved and
+    rewound to re-read audio that is still buffered.
+    """
+
+    def __init__(self, capture, pos=0):
+        self.capture = capture
+        self.SAMPLE_RATE = capture.SAMPLE_RATE
+        self.SAMPLE_WIDTH = capture.SAMPLE_WIDTH
+        self.CHUNK = capture.CHUNK
+        self.position = pos
+        self.stream = _RingStream(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    @property
+    def lag(self):
+        """Bytes captured but not yet read by this reader."""
+        return self.capture.ring.write_pos - self.position
+
+    def _read(self, frames, copy=True):
+        ring = self.capture.ring
+        size = frames * self.SAMPLE_WIDTH
+        if copy:
+            data, self.position = ring.read(self.position, size)
+        else:
+            data, self.position = ring.read_view(self.position, size)
+        return data
+
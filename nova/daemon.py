@@ -0,0 +1,73 @@
+"""Run the assistant with no window.
+
+    python -m nova.daemon                   listen on the microphone
+    python -m nova.daemon --text            read utterances from stdin instead
+    python -m nova.daemon --text --dry-run  only print what each line resolves to,
+                                            from the caches (no drive is scanned)
+
+Uses the same commands, settings and caches as the desktop app, but never
+imports Tk or CustomTkinter.
+"""
+import argparse
+import sys
+import time
+
+from nova.engine import NovaEngine
+
+
+def _run_text(engine, args):
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        if args.no_wake:
+            command = line
+        else:
+            parsed = engine.parse_wake(line)
+            if parsed is None:
+                continue
+            command = parsed[1]
+        resolution = engine.resolve(command)
+        print(f"{line!r} -> {resolution}", flush=True)
+        if not args.dry_run and command.strip():
+            action = engine.dispatch_command(command, resolution=resolution)
+            if action is not None:
+                action.wait(action.timeout)
+        engine.drain_action_results()
+
+
+def _run_voice(engine):
+    engine.start()
+    try:
+        while engine.thread.is_alive():
+            engine.drain_action_results()
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NOVA without a window")
+    parser.add_argument("--data-dir", help="where commands and settings live (default %%APPDATA%%\\NOVA)")
+    parser.add_argument("--text", action="store_true", help="read utterances from stdin instead of the microphone")
+    parser.add_argument("--no-wake", action="store_true", help="with --text, treat every line as a command")
+    parser.add_argument("--dry-run", action="store_true", help="with --text, resolve commands from the caches but don't run them")
+    args = parser.parse_args()
+
+    engine = NovaEngine(
+        args.data_dir,
+        on_state=lambda state: print(f"[Nova] {state}", flush=True),
+        on_log=lambda text: print(f"[Nova] {text}", flush=True),
+    )
+    engine.start_background_loads()
+    try:
+        if args.text:
+            _run_text(engine, args)
+        else:
+            _run_voice(engine)
+    finally:
+        engine.close()
+
+
+if __name__ == "__main__":
+    main()
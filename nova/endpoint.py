@@ -0,0 +1,395 @@
+"""Streaming end-of-utterance detection.
+
+recognizer.listen() ends a phrase once `pause_threshold` seconds stay under
+the energy threshold. A fan or a TV that stays over the threshold holds the
+phrase open until phrase_time_limit, and a quick speaker still waits out the
+full half second after the last word. Endpointer.listen() replaces it:
+
+- every 20 ms frame gets a speech probability from its level over a
+  tracked noise floor, with the voice-activity gate's flatness and
+  zero-crossing checks applied
+- a phrase starts after `onset_ms` of speech frames and ends after
+  PauseModel.pause() seconds without one
+- PauseModel learns how long this user pauses mid-command, so the
+  utterance is released after a pause just longer than theirs
+
+Each release is compared with when the energy-threshold rule would have
+released the same audio. stats() reports the time saved, which is negative
+when the learned pause is longer than pause_threshold (a slow speaker is
+released later so that a pause mid-command doesn't cut them off), and how
+many commands the energy rule would have cut short.
+
+Run WAV fixtures through it from the command line:
+
+    python -m nova.endpoint recording.wav [more.wav ...]
+"""
+import collections
+import math
+
+import numpy as np
+
+from nova.vad import VoiceActivityDetector
+from nova.audio import pcm_to_float, read_wav
+
+WAITING = "waiting"
+SPEAKING = "speaking"
+ENDED = "ended"
+
+
+class PauseModel:
+    """How long this user pauses inside a command.
+
+    observe() takes the silences between speech runs of finished
+    utterances. pause() is the silence that ends an utterance: `margin`
+    times the 90th-percentile pause plus `slack`, within [min_pause,
+    max_pause], or `default` until `min_samples` pauses have been seen.
+    The default is a little longer than listen()'s half second, which
+    counts whole 64 ms buffers and so waits closer to 0.55 s in practice.
+    """
+
+    def __init__(self, default=0.6, min_pause=0.25, max_pause=1.2, margin=1.1, slack=0.08,
+                 history=64, min_samples=8):
+        self.default = default
+        self.min_pause = min_pause
+        self.max_pause = max_pause
+        self.margin = margin
+        self.slack = slack
+        self.min_samples = min_samples
+        self.gaps = collections.deque(maxlen=history)
+        self._pause = default
+
+    def observe(self, gaps):
+        if not len(gaps):
+            return
+        self.gaps.extend(float(g) for g in gaps)
+        if len(self.gaps) >= self.min_samples:
+            long_gap = float(np.percentile(np.fromiter(self.gaps, float), 90))
+            self._pause = min(self.max_pause, max(self.min_pause, long_gap * self.margin + self.slack))
+
+    def pause(self):
+        return self._pause
+
+    def to_dict(self):
+        return {"gaps": [round(g, 3) for g in self.gaps]}
+
+    @classmethod
+    def from_dict(cls, data, **kwargs):
+        model = cls(**kwargs)
+        if isinstance(data, dict):
+            gaps = [g for g in data.get("gaps", ()) if isinstance(g, (int, float)) and g >= 0]
+            model.observe(gaps[-model.gaps.maxlen:])
+        return model
+
+
+class Endpointer:
+    """Finds where an utterance ends in a stream of PCM.
+
+    Feed it with start() and feed(), or let listen() read a source the way
+    recognizer.listen() does. `baseline` is the sr.Recognizer that stats()
+    compares against: its pause_threshold, and its energy_threshold, which
+    is adjusted between phrases as listen() would adjust it.
+    """
+
+    def __init__(self, detector=None, pauses=None, onset_ms=60, min_speech_ms=150,
+                 preroll_ms=300, tail_ms=150, block_ms=40, slope_db=1.5, floor_rise_db=5.0,
+                 baseline=None):
+        self.detector = detector or VoiceActivityDetector()
+        self.pauses = pauses or PauseModel()
+        self.frame_ms = self.detector.frame_ms
+        self.onset_ms = onset_ms
+        self.min_speech_ms = min_speech_ms
+        self.preroll_ms = preroll_ms
+        self.tail_ms = tail_ms
+        self.block_ms = block_ms
+        self.slope_db = slope_db
+        self._threshold_db = 20 * math.log10(self.detector.snr)
+        self.floor_rise_db = floor_rise_db     # per second, while frames count as speech
+        self.baseline = baseline
+        self.noise_rms = None
+        self.utterances = 0
+        self.discarded = 0
+        self.timeouts = 0
+        self.release_delay = 0.0    # seconds from the last speech frame to release
+        self.saved = 0.0            # seconds sooner than the energy-threshold rule
+        self.compared = 0
+        self.baseline_cuts = 0      # utterances the energy rule would have cut short
+        self.start()
+
+    # -- streaming -----------------------------------------------------------
+
+    def start(self, sample_rate=None, sample_width=2, chunk=1024):
+        """Get ready for a new utterance.
+
+        `chunk` is the buffer size recognizer.listen() would measure energy
+        over, for the comparison in stats().
+        """
+        self.sample_rate = sample_rate or self.detector.sample_rate
+        self.sample_width = sample_width
+        self.frame_len = int(self.sample_rate * self.frame_ms / 1000)
+        self.frame_bytes = self.frame_len * sample_width
+        self.chunk = chunk
+        self._power = collections.deque(maxlen=max(1, round(chunk / self.frame_len)))
+        self._pending = b""
+        self._preroll = collections.deque(maxlen=max(1, self.preroll_ms // self.frame_ms))
+        self._position = 0         # frames seen since start()
+        self._phrase_start = 0     # frame where _frames begins
+        self._reset_phrase()
+
+    def _reset_phrase(self):
+        self.state = WAITING
+        self._frames = []
+        self._run = 0              # consecutive speech frames while waiting
+        self._speech = 0           # speech frames in the phrase
+        self._last_speech = 0      # index in _frames just past the last speech frame
+        self._silence = 0          # trailing non-speech frames
+        self._gaps = []
+        self._chunk = b""          # phrase audio not yet in a whole listen() buffer
+        self._quiet = 0            # trailing buffers under the energy threshold
+        self._baseline_end = None  # frame where the energy rule would have stopped
+
+    @property
+    def waited(self):
+        """Seconds spent waiting for speech to start."""
+        return self._position * self.frame_ms / 1000.0
+
+    @property
+    def elapsed(self):
+        """Seconds since the phrase started, including the pre-roll."""
+        return len(self._frames) * self.frame_ms / 1000.0
+
+    def probability(self, level_db, voiced):
+        """Speech probability of a frame `level_db` dB over the noise floor."""
+        if not voiced:
+            return 0.0
+        x = (level_db - 20 * math.log10(max(self.noise_rms, 1e-9)) - self._threshold_db) / self.slope_db
+        return 1.0 / (1.0 + math.exp(-min(max(x, -50.0), 50.0)))
+
+    def calibrate(self, pcm, sample_width=2, sample_rate=None):
+        """Set the noise floor from background-only audio, like
+        recognizer.adjust_for_ambient_noise()."""
+        rms, _, _ = self.detector.features(pcm_to_float(pcm, sample_width), sample_rate or self.sample_rate)
+        if len(rms):
+            self.noise_rms = float(np.median(rms))
+
+    def feed(self, pcm):
+        """Add PCM bytes; returns WAITING, SPEAKING or ENDED."""
+        data = self._pending + bytes(pcm)
+        whole = len(data) // self.frame_bytes * self.frame_bytes
+        self._pending = data[whole:]
+        if not whole or self.state == ENDED:
+            return self.state
+        samples = pcm_to_float(data[:whole], self.sample_width)
+        rms, zcr, flatness = self.detector.features(samples, self.sample_rate)
+        if self.noise_rms is None:
+            self.noise_rms = float(rms.min())
+        detector = self.detector
+        level_db = 20 * np.log10(np.maximum(rms, 1e-9))
+        voiced = (rms > detector.min_rms) & (flatness < detector.max_flatness) & (zcr < detector.max_zcr)
+        energy_scale = 2 ** (8 * self.sample_width - 1)
+        pause_frames = self.pauses.pause() * 1000 / self.frame_ms
+        onset_frames = max(1, self.onset_ms // self.frame_ms)
+        rise = 10 ** (self.floor_rise_db * self.frame_ms / 1000 / 20)
+        baseline = self.baseline
+        if baseline is not None and baseline.dynamic_energy_threshold:
+            damping = baseline.dynamic_energy_adjustment_damping ** (self.frame_ms / 1000.0)
+
+        # Features are computed for the whole block; the floor and the state
+        # machine go frame by frame, as each label moves the floor for the next
+        for i in range(len(rms)):
+            frame = data[i * self.frame_bytes:(i + 1) * self.frame_bytes]
+            self._position += 1
+            speech = self.probability(level_db[i], voiced[i]) >= 0.5
+            if not speech:
+                # Falls quickly, rises over about a second
+                rate = 0.3 if rms[i] < self.noise_rms else 0.02
+                self.noise_rms += rate * (float(rms[i]) - self.noise_rms)
+            else:
+                # Creeps up under speech too, so a fan that switches on
+                # stops counting as speech after a few seconds
+                self.noise_rms = min(float(rms[i]), self.noise_rms * rise)
+            if baseline is not None:
+                self._power.append(float(rms[i]) ** 2)
+                energy = math.sqrt(sum(self._power) / len(self._power)) * energy_scale
+
+            if self.state == WAITING:
+                if baseline is not None and baseline.dynamic_energy_threshold:
+                    # What listen() does to the threshold while it waits
+                    target = energy * baseline.dynamic_energy_ratio
+                    baseline.energy_threshold = baseline.energy_threshold * damping + target * (1 - damping)
+                self._preroll.append(frame)
+                self._run = self._run + 1 if speech else 0
+                if self._run >= onset_frames:
+                    self.state = SPEAKING
+                    self._frames = list(self._preroll)
+                    self._phrase_start = self._position - len(self._frames)
+                    self._speech = self._run
+                    self._last_speech = len(self._frames)
+                continue
+
+            self._frames.append(frame)
+            if baseline is not None:
+                self._baseline_frame(frame)
+            if speech:
+                if self._silence:
+                    self._gaps.append(self._silence * self.frame_ms / 1000.0)
+                self._silence = 0
+                self._speech += 1
+                self._last_speech = len(self._frames)
+                continue
+            self._silence += 1
+            if self._silence < pause_frames:
+                continue
+            if self._speech * self.frame_ms < self.min_speech_ms:
+                # A click or a cough: keep waiting, like listen()'s phrase_threshold
+                self.discarded += 1
+                self._preroll.clear()
+                self._reset_phrase()
+                continue
+            self._finish()
+            break
+        return self.state
+
+    def _baseline_frame(self, frame):
+        """Count quiet buffers the way listen() does: whole `chunk`-sample
+        buffers, each under the energy threshold or not."""
+        self._chunk += frame
+        chunk_bytes = self.chunk * self.sample_width
+        while len(self._chunk) >= chunk_bytes:
+            samples = pcm_to_float(self._chunk[:chunk_bytes], self.sample_width)
+            self._chunk = self._chunk[chunk_bytes:]
+            energy = math.sqrt(float(np.mean(samples * samples))) * 2 ** (8 * self.sample_width - 1)
+            self._quiet = self._quiet + 1 if energy <= self.baseline.energy_threshold else 0
+            if self._baseline_end is None and self._quiet >= self._pause_chunks():
+                self._baseline_end = len(self._frames)
+
+    def _pause_chunks(self):
+        return math.ceil(self.baseline.pause_threshold * self.sample_rate / self.chunk)
+
+    def _finish(self, limit=False):
+        self.state = ENDED
+        self.utterances += 1
+        frame_s = self.frame_ms / 1000.0
+        released = len(self._frames)
+        self.release_delay += (released - self._last_speech) * frame_s
+        if not limit:
+            self.pauses.observe(self._gaps)
+        if self.baseline is None:
+            return
+        if self._baseline_end is not None and self._baseline_end < self._last_speech:
+            # The energy rule would have ended this one mid-command: not a
+            # speed comparison, a command it would have cut off
+            self.baseline_cuts += 1
+            return
+        if self._baseline_end is not None:
+            baseline = self._baseline_end
+        elif limit:
+            baseline = released
+        elif self._quiet:
+            # Quiet enough for the energy rule: it would finish this pause
+            chunk_s = self.chunk / float(self.sample_rate)
+            partial = len(self._chunk) / float(self.sample_width * self.sample_rate)
+            baseline = released + ((self._pause_chunks() - self._quiet) * chunk_s - partial) / frame_s
+        else:
+            # Background noise over the energy threshold: only the time limit ends it
+            baseline = None
+        if baseline is not None:
+            self.saved += (baseline - released) * frame_s
+            self.compared += 1
+
+    def finish(self):
+        """End the phrase now (the time limit was reached)."""
+        if self.state == SPEAKING:
+            self._finish(limit=True)
+
+    def boundaries(self):
+        """(speech end, release) of the finished utterance, in seconds from start()."""
+        frame_s = self.frame_ms / 1000.0
+        return ((self._phrase_start + self._last_speech) * frame_s,
+                (self._phrase_start + len(self._frames)) * frame_s)
+
+    def audio(self):
+        """PCM of the finished utterance: pre-roll, speech and a short tail."""
+        tail = self.tail_ms // self.frame_ms
+        return b"".join(self._frames[:self._last_speech + tail])
+
+    # -- sources -------------------------------------------------------------
+
+    def listen(self, source, timeout=None, phrase_time_limit=None):
+        """A drop-in for recognizer.listen(source, timeout, phrase_time_limit).
+
+        Returns sr.AudioData as soon as the utterance has ended and raises
+        sr.WaitTimeoutError if nothing starts within `timeout` seconds.
+        """
+        import speech_recognition as sr
+
+        self.start(source.SAMPLE_RATE, source.SAMPLE_WIDTH, source.CHUNK)
+        block = int(source.SAMPLE_RATE * self.block_ms / 1000)
+        while True:
+            data = source.stream.read(block)
+            if not data:
+                self.finish()
+                break
+            state = self.feed(data)
+            if state == ENDED:
+                break
+            if state == WAITING and timeout and self.waited > timeout:
+                self.timeouts += 1
+                raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+            if state == SPEAKING and phrase_time_limit and self.elapsed > phrase_time_limit:
+                self.finish()
+                break
+        if self.state != ENDED:
+            raise sr.WaitTimeoutError("audio ended before a phrase started")
+        return sr.AudioData(self.audio(), source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+    def stats(self):
+        n = self.utterances
+        return {
+            "utterances": n,
+            "discarded": self.discarded,
+            "timeouts": self.timeouts,
+            "pause": round(self.pauses.pause(), 3),
+            "mean_release_delay": round(self.release_delay / n, 3) if n else 0.0,
+            "mean_saved": round(self.saved / self.compared, 3) if self.compared else 0.0,
+            "saved_seconds": round(self.saved, 1),
+            "baseline_cuts": self.baseline_cuts,
+        }
+
+
+def endpoint_wav(path, endpointer=None):
+    """Stream a WAV file through an endpointer in 40 ms blocks.
+
+    Returns (end, release) in seconds: the end of the audio it kept and
+    when it let go of it, or (None, None) if no utterance started. An
+    utterance still going at the end of the file ends there.
+    """
+    samples, rate = read_wav(path)
+    endpointer = endpointer or Endpointer()
+    endpointer.start(rate, 2)
+    pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes()
+    block = int(rate * endpointer.block_ms / 1000) * 2
+    for pos in range(0, len(pcm), block):
+        if endpointer.feed(pcm[pos:pos + block]) == ENDED:
+            return endpointer.boundaries()
+    endpointer.finish()
+    if endpointer.state == ENDED:
+        # Speech ran to the end of the file: the utterance ends with it
+        return endpointer.boundaries()
+    return None, None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show where the endpointer ends utterances in WAV files")
+    parser.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+    # One endpointer for all files, so the pause length is learned across them
+    endpointer = Endpointer()
+    for path in args.paths:
+        end, release = endpoint_wav(path, endpointer)
+        if end is None:
+            print(f"{path}: no utterance")
+        else:
+            print(f"{path}: speech ends {end:.2f}s, released {release:.2f}s "
+                  f"(pause {endpointer.pauses.pause():.2f}s)")
@@ -0,0 +1,863 @@
+"""The assistant without a window.
+
+NovaEngine owns everything the desktop app does apart from drawing:
+- the command library, settings, app catalog and folder indexes
+- wake-word parsing and command resolution
+- the action executor, text-to-speech and the voice loop
+
+It never imports Tk. The CustomTkinter window in "NOVA Desktop Assistant.py"
+is a front end over it, and `python -m nova.daemon` runs it with no GUI.
+
+Front ends follow the engine through two callbacks, both invoked from
+background threads:
+
+    on_state(state)   STANDBY, LISTENING or PROCESSING
+    on_log(text)      a line for the status area ("Nova: Opening chrome", ...)
+
+Text goes in through resolve() or feed(), which only work out what a
+command means, and execute(), which carries it out.
+"""
+import os
+import queue
+import subprocess
+import threading
+
+from nova.actions import ActionExecutor, CANCELLED, DONE
+from nova.apps import AppCatalog, start_menu_dirs
+from nova.folders import FolderIndex, drive_root
+from nova.intents import IntentRouter, normalize
+from nova.library_io import export_file, import_file
+from nova.matching import CommandMatcher, FuzzyIndex
+from nova.metrics import Metrics, format_table
+from nova.speech import SpeechWorker, PRIORITY_HIGH, PRIORITY_NORMAL
+from nova.storage import JsonStore, user_data_dir, validate_commands, validate_settings, wake_word_list
+from nova.wake_text import WakeWordMatcher
+
+STANDBY = "standby"
+LISTENING = "listening"
+PROCESSING = "processing"
+
+CANCEL_PHRASES = ("cancel", "stop", "never mind", "nevermind")
+
+COMMANDS_FILE = "nova_commands.json"
+SETTINGS_FILE = "nova_settings.json"
+APPS_CACHE_FILE = "nova_apps_cache.json"
+FOLDER_CACHE_FILE = "nova_folders_{}.json"
+METRICS_FILE = "nova_metrics.json"
+PROMETHEUS_FILE = "nova_metrics.prom"
+WAKE_TEMPLATES_DIR = "wake_templates"
+
+# Resolution kinds
+CANCEL = "cancel"
+CLOSE = "close"
+CUSTOM = "custom"
+FOLDER = "folder"
+DRIVE = "drive"
+APP = "app"
+TERMINAL = "terminal"
+UNKNOWN = "unknown"
+
+
+class Resolution:
+    """What a command means, worked out without doing anything.
+
+    kind   -- one of the kinds above
+    target -- the app, command, folder or drive the user named
+    path   -- what would be opened: URL, file, folder, AppUserModelID, or None
+    drive  -- drive letter for FOLDER and DRIVE
+    """
+
+    def __init__(self, kind, target=None, path=None, drive=None):
+        self.kind = kind
+        self.target = target
+        self.path = path
+        self.drive = drive
+
+    def __repr__(self):
+        return f"<Resolution {self.kind} {self.target!r} -> {self.path!r}>"
+
+
+class NovaEngine:
+    """Matching, dispatch and the voice loop, with no UI attached.
+
+    data_dir      -- where commands, settings and caches live
+    legacy_paths  -- older command files to migrate from
+    on_state      -- callable(state), see the module docstring
+    on_log        -- callable(text)
+    """
+
+    def __init__(self, data_dir=None, legacy_paths=(), on_state=None, on_log=None):
+        self.data_dir = data_dir or user_data_dir()
+        os.makedirs(self.data_dir, exist_ok=True)
+        self.on_state = on_state or (lambda state: None)
+        self.on_log = on_log or (lambda text: None)
+
+        self.is_running = False
+        self.thread = None
+        self.recognizer = None       # these six are set up by load_voice_stack()
+        self.asr = None
+        self.processes = None
+        self.windows = None
+        self.vad = None
+        self.endpointer = None
+        self._voice_lock = threading.Lock()
+        self.tts = None
+
+        self.apps = {}
+        self.app_index = FuzzyIndex()
+        self.app_catalog = AppCatalog(start_menu_dirs(), self.path(APPS_CACHE_FILE))
+        self.custom_commands = {}
+        self.command_matcher = CommandMatcher()
+        # Journaled, coalesced writes; see nova/storage.py
+        self.command_store = JsonStore(
+            self.path(COMMANDS_FILE), validate=validate_commands, legacy_paths=legacy_paths
+        )
+        self.settings_store = JsonStore(self.path(SETTINGS_FILE), validate=validate_settings)
+        self.folder_indexes = {}
+        self._folder_lock = threading.Lock()
+        # How often "Nova <command>" arrived in a single utterance
+        self.wake_stats = {"wakes": 0, "fast_path": 0}
+
+        # Commands run here so run_loop can go straight back to listening
+        self.actions = ActionExecutor(workers=2, max_queue=8, default_timeout=30.0).start()
+
+        self.intents = self._build_intents()
+        self.resolvers = {
+            CANCEL: lambda intent: Resolution(CANCEL),
+            CLOSE: lambda intent: Resolution(CLOSE, intent["app"]),
+            CUSTOM: self._resolve_custom,
+            FOLDER: self._resolve_folder,
+            DRIVE: self._resolve_drive,
+            APP: self._resolve_app,
+            TERMINAL: lambda intent: Resolution(TERMINAL, "terminal"),
+        }
+
+        self.load_custom_commands()
+        self.load_settings()
+        self.wake_matcher = WakeWordMatcher(self.wake_words)
+
+        # Per-stage latency histograms; off unless settings or NOVA_METRICS ask
+        self.metrics = Metrics(enabled=bool(self.metrics_mode))
+        self.metrics.start_dumps(
+            self.path(METRICS_FILE),
+            self.path(PROMETHEUS_FILE) if self.metrics_mode == "prometheus" else None,
+        )
+
+    def path(self, filename):
+        return os.path.join(self.data_dir, filename)
+
+    # -- commands and settings -----------------------------------------------
+
+    def load_custom_commands(self):
+        self.custom_commands = dict(self.command_store.load())
+        self.command_matcher.update(self.custom_commands)
+        for note in self.command_store.recovered:
+            print(f"[Nova] Commands: {note}")
+
+    def save_custom_commands(self):
+        self.command_matcher.update(self.custom_commands)
+        self.command_store.replace(self.custom_commands)
+
+    def import_commands(self, path, fmt=None, replace=False, check_paths=False):
+        """Add every command in a JSONL, CSV or bookmark file as one change.
+
+        Existing commands win conflicts unless `replace` is set. Returns the
+        ImportReport.
+        """
+        changes, report = import_file(path, self.custom_commands, fmt, replace, check_paths)
+        if changes:
+            self.custom_commands.update(changes)
+            self.command_matcher.update(self.custom_commands)
+            self.command_store.apply(changes)
+        print(f"[Nova] Imported {path}: {report.summary()}")
+        return report
+
+    def export_commands(self, path, fmt=None):
+        return export_file(path, self.custom_commands, fmt)
+
+    def load_settings(self):
+        data = self.settings_store.load()
+        for note in self.settings_store.recovered:
+            print(f"[Nova] Settings: {note}")
+        self.stay_active = bool(data.get("stay_active", False))
+        self.recognizer_backend = data.get("recognizer", "auto")
+        self.wake_words = wake_word_list(data.get("wake_words")) or ["nova"]
+        try:
+            self.folder_depth = int(data.get("folder_depth", 3))
+        except (TypeError, ValueError):
+            self.folder_depth = 3
+        self.vad_enabled = bool(data.get("vad", True))
+        self.endpointing = bool(data.get("endpointing", True))
+        # false, true or "prometheus" (also write nova_metrics.prom)
+        mode = os.environ.get("NOVA_METRICS", data.get("metrics", False))
+        if isinstance(mode, str):
+            mode = mode.strip().lower()
+            mode = "prometheus" if mode == "prometheus" else mode in ("1", "true", "yes", "on")
+        self.metrics_mode = mode
+
+    def save_settings(self):
+        self.settings_store.update({
+            "stay_active": self.stay_active,
+            "recognizer": self.recognizer_backend,
+            "wake_words": list(self.wake_words),
+            "folder_depth": self.folder_depth,
+        })
+
+    # -- apps and folders ----------------------------------------------------
+
+    def start_background_loads(self):
+        threading.Thread(target=self.load_installed_apps, daemon=True).start()
+        threading.Thread(target=self._warm_folder_indexes, daemon=True).start()
+
+    def load_installed_apps(self):
+        """Revalidate the app catalog: changed Start Menu folders first,
+        then the slow Get-StartApps enumerator, saving the cache if anything moved."""
+        # Serve "open X" from the cached catalog first, then revalidate
+        if self.app_catalog.load_cache():
+            self._apply_app_catalog()
+        changed = False
+        try:
+            if self.app_catalog.refresh_dirs():
+                self._apply_app_catalog()
+                changed = True
+        except Exception as e:
+            print(f"[Nova] App scan failed: {e}")
+        try:
+            added, removed = self.app_catalog.refresh_enumerator()
+            if added or removed:
+                self._apply_app_catalog()
+                changed = True
+        except Exception as e:
+            print(f"[Nova] Get-StartApps failed: {e}")
+        if changed:
+            self.app_catalog.save_cache()
+
+    def _apply_app_catalog(self):
+        apps = self.app_catalog.apps
+        self.app_index = FuzzyIndex(apps)
+        self.apps = apps
+
+    def _folder_index(self, drive_letter):
+        """The folder index for a drive, created (and loaded from cache) on first use."""
+        letter = drive_letter.lower()
+        with self._folder_lock:
+            index = self.folder_indexes.get(letter)
+            if index is None:
+                index = FolderIndex(
+                    drive_root(letter),
+                    self.path(FOLDER_CACHE_FILE.format(letter)),
+                    max_depth=self.folder_depth,
+                )
+                index.load_cache()
+                self.folder_indexes[letter] = index
+        return index
+
+    def _warm_folder_indexes(self):
+        """Load and revalidate the drives that were indexed in earlier sessions."""
+        for letter in "abcdefghijklmnopqrstuvwxyz":
+            if not os.path.exists(self.path(FOLDER_CACHE_FILE.format(letter))):
+                continue
+            if not os.path.exists(drive_root(letter)):
+                continue
+            try:
+                self._folder_index(letter).refresh_if_due()
+            except Exception as e:
+                print(f"[Nova] Folder index for {letter.upper()} drive failed: {e}")
+
+    def _find_folder_on_drive(self, folder_name, drive_letter, refresh=True):
+        """Find a folder on any drive by name using fuzzy matching.
+        Works with any drive letter (M, C, E, D, etc.) and searches nested
+        folders through the drive's cached index.
+
+        Only a folder that exists is returned. With refresh=False only the
+        cached index is read: nothing is scanned, and a drive that was never
+        indexed finds nothing."""
+        if not os.path.exists(drive_root(drive_letter)):
+            return None
+        index = self._folder_index(drive_letter)
+        if not refresh:
+            return index.find(folder_name) if index.ready else None
+        try:
+            if not index.ready:
+                # First use of this drive: try the top level first
+                index.refresh(max_depth=1)
+            path = index.find(folder_name)
+            if path is None or not os.path.isdir(path):
+                # A miss, or a folder that has gone: walk again now rather than
+                # wait out the refresh interval. Unchanged directories are only
+                # stat()ed, so this costs milliseconds on a warm index.
+                if index.refresh():
+                    index.save_cache()
+                path = index.find(folder_name)
+            else:
+                threading.Thread(target=index.refresh_if_due, daemon=True).start()
+            return path if path and os.path.isdir(path) else None
+        except Exception as e:
+            print(f"[Nova] Folder lookup failed: {e}")
+        return None
+
+    def _switch_to_window(self, app_name, cancelled=None):
+        """Try to bring an already-open window of the app to the foreground.
+        Returns True if a window was found and activated, False otherwise."""
+        if self.windows is None:
+            return False
+        return self.windows.switch_to(app_name, cancelled)
+
+    # -- speech --------------------------------------------------------------
+
+    def _ensure_tts(self):
+        """Start the TTS worker on first use (pyttsx3 loads on its own thread)."""
+        if self.tts is None:
+            with self._voice_lock:
+                if self.tts is None:
+                    tts = SpeechWorker()
+                    tts.start()
+                    self.tts = tts
+        return self.tts
+
+    def speak(self, text):
+        """Speak `text` and block until it has been said."""
+        self.on_log(f"Nova: {text}")
+        utt = self._ensure_tts().say(text, wait=True, timeout=30)
+        trace = self.metrics.current()
+        if trace:
+            trace.mark("tts_enqueued", utt.enqueued_at)
+            if utt.started_at is not None:
+                trace.mark("tts_first_audio", utt.started_at)
+
+    def speak_async(self, text, priority=PRIORITY_NORMAL, interrupt=False):
+        self.on_log(f"Nova: {text}")
+        self._ensure_tts().say(text, priority=priority, interrupt=interrupt)
+
+    def load_voice_stack(self):
+        """Import and set up recognition, process and window control.
+
+        Called from run_loop, so the imports happen off the UI thread and
+        only once the assistant is first activated.
+        """
+        if self.recognizer is not None:
+            return
+        import speech_recognition as sr
+        from nova.processes import ProcessController
+        from nova.recognition import create_backend
+        from nova.windows import Win32WindowProvider, WindowRegistry
+
+        recognizer = sr.Recognizer()
+        recognizer.energy_threshold = 250
+        recognizer.dynamic_energy_threshold = True
+        recognizer.dynamic_energy_adjustment_damping = 0.15
+        recognizer.dynamic_energy_ratio = 1.1
+        recognizer.pause_threshold = 0.5
+        recognizer.non_speaking_duration = 0.4
+        self.recognizer = recognizer
+
+        self.processes = ProcessController()
+        if Win32WindowProvider.available():
+            self.windows = WindowRegistry(Win32WindowProvider())
+        self.asr = create_backend(self.recognizer_backend)
+        if self.vad_enabled:
+            try:
+                from nova.vad import VoiceActivityDetector
+                self.vad = VoiceActivityDetector()
+            except ImportError as e:
+                print(f"[Nova] Voice-activity gate off: {e}")
+        if self.endpointing:
+            try:
+                from nova.endpoint import Endpointer, PauseModel
+                pauses = PauseModel.from_dict(self.settings_store.get("learned_pauses"))
+                self.endpointer = Endpointer(pauses=pauses, baseline=recognizer)
+            except ImportError as e:
+                print(f"[Nova] Adaptive endpointing off: {e}")
+
+    def _listen(self, source, timeout, phrase_time_limit):
+        """One phrase from `source`, ended by the endpointer when there is one."""
+        if self.endpointer is not None:
+            return self.endpointer.listen(source, timeout, phrase_time_limit)
+        return self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+
+    def _transcribe(self, audio):
+        """The recognizer's text for `audio`, after the voice-activity gate.
+
+        A phrase with no speech in it raises sr.UnknownValueError without a
+        recognizer call; otherwise only the speech part is sent.
+        """
+        if self.vad is not None:
+            gated = self.vad.gate(audio)
+            if gated is None:
+                import speech_recognition as sr
+                raise sr.UnknownValueError()
+            audio = gated
+        return self.asr.transcribe(self.recognizer, audio)
+
+    # -- commands ------------------------------------------------------------
+
+    def _build_intents(self):
+        """The command grammar. Priorities keep the old order for equal scores."""
+        router = IntentRouter(slot_types={"drive": "[a-z]"})
+        for phrase in CANCEL_PHRASES:
+            router.add(CANCEL, phrase, priority=100)
+        router.add(CLOSE, "close {app}", priority=90)
+        router.add_matcher(CUSTOM, self._match_custom_command, priority=80)
+        router.add(FOLDER, "open {folder} from {drive} drive", priority=70)
+        router.add(DRIVE, "open {drive} drive", priority=60)
+        router.add(APP, "open {app}", priority=50)
+        router.add(TERMINAL, "* terminal *", priority=40)
+        router.add(TERMINAL, "* command prompt *", priority=40)
+        return router
+
+    def _match_custom_command(self, text, words):
+        """Custom commands can appear anywhere in an utterance. They score by
+        how many of its words they cover, counting an "open" right before them.
+        "close <command>" is a close request, not one to open the command."""
+        key = self.command_matcher.match(text)
+        if key is None or key not in self.custom_commands:
+            return None
+        if text.startswith("close ") and not key.startswith("close "):
+            return None
+        covered = len(key.split())
+        if text[:text.find(key)].endswith("open "):
+            covered += 1
+        return {"command": key}, min(1.0, covered / len(words))
+
+    def _resolve_custom(self, intent):
+        key = intent["command"]
+        return Resolution(CUSTOM, key, self.custom_commands.get(key))
+
+    def _resolve_folder(self, intent):
+        folder_name, drive_letter = intent["folder"], intent["drive"]
+        path = self._find_folder_on_drive(folder_name, drive_letter, refresh=False)
+        return Resolution(FOLDER, folder_name, path, drive_letter)
+
+    def _resolve_drive(self, intent):
+        dl = intent["drive"].upper()
+        return Resolution(DRIVE, dl, f"{dl}:\\", dl)
+
+    def _resolve_app(self, intent):
+        target = intent["app"]
+        launch_path = self.apps.get(target)
+        if not launch_path:
+            match = self.app_index.best(target)
+            if match:
+                launch_path = self.apps.get(match)
+                target = match
+        return Resolution(APP, target, launch_path)
+
+    def resolve(self, command):
+        """Work out what `command` would do, without doing it.
+
+        Lookups only read the command library, the app catalog and the
+        folder caches; nothing is scanned or started. A folder that is not
+        in its drive's cache yet resolves with no path, and execute()
+        searches the drive for it.
+
+        Each reading from self.intents goes to its resolver in self.resolvers,
+        best first. To teach NOVA a new phrase, add a pattern to self.intents
+        and a resolver that returns a Resolution, or None to pass.
+        """
+        fallback = None
+        for intent in self.intents.route(command):
+            resolver = self.resolvers.get(intent.name)
+            resolution = resolver(intent) if resolver else None
+            if resolution is None:
+                continue
+            if resolution.kind == APP and not resolution.path:
+                # Nothing installed by that name; "open terminal" still
+                # reads as the terminal intent further down
+                fallback = fallback or resolution
+                continue
+            return resolution
+        return fallback or Resolution(UNKNOWN, normalize(command))
+
+    def feed(self, utterance):
+        """Resolve a whole utterance. Returns None unless it starts with the wake word.
+
+        "nova open spotify" resolves the command; a bare "nova" resolves to
+        UNKNOWN with an empty target.
+        """
+        parsed = self.parse_wake(utterance)
+        if parsed is None:
+            return None
+        residual = parsed[1]
+        if not residual.strip():
+            return Resolution(UNKNOWN, "")
+        return self.resolve(residual)
+
+    @staticmethod
+    def _cancelled(cancelled, what):
+        """True if `cancelled` (an action's Event, or None) has been set."""
+        if cancelled is not None and cancelled.is_set():
+            print(f"[Nova] Cancelled before {what}")
+            return True
+        return False
+
+    def execute(self, resolution, cancelled=None):
+        """Carry out a Resolution. Runs on an action worker.
+
+        `cancelled` is the action's Event. It is checked right before each
+        launch, switch or close, after the lookups and the spoken reply that
+        a "cancel" may have landed during.
+        """
+        kind, target, path = resolution.kind, resolution.target, resolution.path
+        if kind == CANCEL:
+            self.cancel_all()
+        elif kind == CLOSE:
+            self.close_application(target, cancelled)
+        elif kind == CUSTOM:
+            self.speak(f"Opening {target}")
+            if self._cancelled(cancelled, f"opening {target}"):
+                return
+            if path.startswith("http") or path.startswith("www"):
+                import webbrowser
+                webbrowser.open(path)
+            else:
+                try:
+                    os.startfile(path)
+                except OSError:
+                    subprocess.Popen(["explorer", path], shell=True)
+        elif kind == FOLDER:
+            drive = resolution.drive.upper()
+            if not path or not os.path.isdir(path):
+                # resolve() only read the cache; now look on the drive itself
+                path = self._find_folder_on_drive(target, drive)
+                if self._cancelled(cancelled, f"opening {target}"):
+                    return
+            if path:
+                self.speak(f"Opening {os.path.basename(path)} from {drive} drive")
+                if self._cancelled(cancelled, f"opening {target}"):
+                    return
+                subprocess.Popen(["explorer", path])
+            else:
+                self.speak(f"Could not find {target} on {drive} drive")
+        elif kind == DRIVE:
+            if os.path.exists(path):
+                self.speak(f"Opening {target} drive")
+                if self._cancelled(cancelled, f"opening {target} drive"):
+                    return
+                subprocess.Popen(["explorer", path])
+            else:
+                self.speak(f"{target} drive not found")
+        elif kind == APP:
+            if self._switch_to_window(target, cancelled):
+                self.speak(f"Switching to {target}")
+                return
+            if self._cancelled(cancelled, f"opening {target}"):
+                return
+            if path:
+                self.speak(f"Opening {target}")
+                if self._cancelled(cancelled, f"opening {target}"):
+                    return
+                if self.windows:
+                    self.windows.invalidate()
+                try:
+                    if os.path.exists(path):
+                        os.startfile(path)
+                    else:
+                        subprocess.Popen(["explorer", f"shell:AppsFolder\\{path}"])
+                except OSError as e:
+                    print(f"[Nova] Could not open {target}: {e}")
+        elif kind == TERMINAL:
+            if self._switch_to_window("terminal", cancelled):
+                self.speak("Switching to Terminal")
+                return
+            if self._cancelled(cancelled, "opening Terminal"):
+                return
+            self.speak("Opening Terminal")
+            if self._cancelled(cancelled, "opening Terminal"):
+                return
+            os.system("start cmd")
+            if self.windows:
+                self.windows.invalidate()
+
+    def process_command(self, command, trace=None, resolution=None, cancelled=None):
+        """Resolve `command` (unless `resolution` is given) and execute it.
+
+        `cancelled` is the Event of the action running this, if any.
+        """
+        trace = trace or self.metrics.trace()
+        trace.mark("action_start")
+        self.metrics.activate(trace)
+        kind = None
+        try:
+            if resolution is None:
+                resolution = self.resolve(command)
+            trace.mark("match")
+            kind = resolution.kind
+            if not self._cancelled(cancelled, f"running {command!r}"):
+                self.execute(resolution, cancelled)
+        finally:
+            trace.mark("action_end")
+            self.metrics.activate(None)
+            trace.finish(kind)
+
+    def close_application(self, app_name, cancelled=None):
+        self.speak(f"Closing {app_name}")
+        if self._cancelled(cancelled, f"closing {app_name}"):
+            return None
+        if self.windows:
+            self.windows.invalidate()
+
+        try:
+            result = self.processes.close(app_name)
+        except Exception as e:
+            print(f"[Nova] Close failed: {e}")
+            return None
+
+        if result.closed:
+            print(f"[Nova] Closed {len(result.closed)} process(es): {', '.join(result.targets)}")
+        elif result.failed:
+            self.speak(f"Could not close {app_name}")
+        else:
+            self.speak(f"{app_name} is not running")
+        return result
+
+    def cancel_all(self):
+        dropped = self.actions.cancel_all()
+        if self.tts:
+            self.tts.cancel()
+        return dropped
+
+    def dispatch_command(self, command, trace=None, resolution=None):
+        """Queue a command on the action executor and return at once.
+
+        "cancel" / "stop" / "never mind" drop whatever is still queued and
+        cut off speech instead of being queued themselves. `trace` carries
+        the interaction's metrics marks on to the action worker. Pass the
+        `resolution` if the command has already been resolved.
+        """
+        trace = trace or self.metrics.trace()
+        trace.mark("dispatched")
+        text = command.lower().strip(" .!?")
+        if text in CANCEL_PHRASES:
+            dropped = self.cancel_all()
+            print(f"[Nova] Cancelled {dropped} action(s)")
+            self.speak_async("Cancelled.", priority=PRIORITY_HIGH, interrupt=True)
+            trace.finish()
+            return None
+        first = text.split(" ", 1)[0]
+        kind = first if first in ("open", "close") else "command"
+        timeout = 15.0 if kind == "close" else None
+        cancelled = threading.Event()
+        action = self.actions.submit(kind, self.process_command, command, trace, resolution, cancelled,
+                                     timeout=timeout, cancelled=cancelled)
+        if action is None:
+            self.speak_async("I'm still busy, try again in a moment.", priority=PRIORITY_HIGH)
+            trace.finish()
+        return action
+
+    def drain_action_results(self):
+        """Report finished actions."""
+        try:
+            while True:
+                action = self.actions.results.get_nowait()
+                if action.status not in (DONE, CANCELLED):
+                    self.on_log(f"{action.name.capitalize()} {action.status}")
+                    print(f"[Nova] {action!r} after {action.run_time or 0:.1f}s: {action.error or ''}")
+        except queue.Empty:
+            pass
+
+    # -- wake word -----------------------------------------------------------
+
+    def parse_wake(self, heard_text):
+        """Return (wake_span, residual) if the wake word was heard, else None."""
+        match = self.wake_matcher.parse(heard_text)
+        if match is None:
+            return None
+        return (match.start, match.end), match.residual
+
+    def is_wake_word(self, heard_text):
+        return self.parse_wake(heard_text) is not None
+
+    def looks_like_command(self, text):
+        """Cheap check that text after the wake word is worth dispatching."""
+        return self.intents.best(text) is not None
+
+    # -- voice loop ----------------------------------------------------------
+
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self.on_state(LISTENING)
+        self.speak_async("Nova online.")
+        self.thread = threading.Thread(target=self.run_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.is_running = False
+        self.cancel_all()
+        self.on_state(STANDBY)
+
+    def close(self):
+        """Stop listening and leave the data files compact."""
+        if self.is_running:
+            self.stop()
+        if self.endpointer is not None:
+            self.settings_store.set("learned_pauses", self.endpointer.pauses.to_dict())
+        # Changes are already journaled; this only folds them into the JSON files
+        self.command_store.close()
+        self.settings_store.close()
+        self.actions.shutdown(wait=False)
+        self.metrics.stop_dumps()
+
+    def _listen_for_wake(self, source, spotter, trace):
+        """One wake-word attempt. Returns (woke, residual) where residual is
+        whatever followed the wake word in the same utterance. Marks the
+        capture and transcript times on `trace`.
+
+        With enrolled templates the offline spotter checks a raw microphone
+        chunk; otherwise a phrase goes to the recognizer."""
+        if spotter is not None:
+            chunk = source.stream.read_view(source.CHUNK)
+            if spotter.feed(chunk, source.SAMPLE_WIDTH):
+                print(f"[Nova] Wake word spotted (score {spotter.last_score:.2f})")
+                return True, ""
+            return False, ""
+
+        import speech_recognition as sr
+        try:
+            audio = self._listen(source, timeout=3, phrase_time_limit=3)
+        except sr.WaitTimeoutError:
+            return False, ""
+        trace.mark("capture_end")
+
+        if not self.is_running:
+            return False, ""
+
+        try:
+            word = self._transcribe(audio).lower()
+            trace.mark("asr_result")
+            print(f"Heard: {word}")
+        except sr.UnknownValueError:
+            return False, ""
+        except sr.RequestError as e:
+            print(f"[Nova] Recognizer unavailable: {e}")
+            self.on_log("Speech service unavailable")
+            return False, ""
+
+        parsed = self.parse_wake(word)
+        if parsed is None:
+            return False, ""
+        return True, parsed[1]
+
+    def _open_audio_source(self):
+        """The microphone, or a WAV replay when NOVA_REPLAY_DIR is set."""
+        import speech_recognition as sr
+        from nova.recognition import ReplayBackend, ReplaySource
+        replay_dir = os.environ.get("NOVA_REPLAY_DIR")
+        if replay_dir:
+            source = ReplaySource.from_directory(replay_dir, realtime=True)
+            self.asr = ReplayBackend(source)
+            return source
+        return sr.Microphone()
+
+    def run_loop(self):
+        try:
+            import pythoncom
+        except ImportError:
+            pythoncom = None
+        if pythoncom:
+            pythoncom.CoInitialize()
+
+        try:
+            self.load_voice_stack()
+            import speech_recognition as sr
+            from nova.capture import CaptureThread
+            from nova.recognition import ReplayBackend, ReplaySource
+            from nova.wakeword import KeywordSpotter
+
+            # The capture thread keeps recording into a ring buffer while we
+            # recognise, speak or run commands; `source` reads from it.
+            with self._open_audio_source() as device, CaptureThread(device) as capture:
+                source = capture.open_reader(0)
+                if isinstance(self.asr, ReplayBackend):
+                    self.asr.cursor = source
+
+                calibration_start = source.position
+                self.recognizer.adjust_for_ambient_noise(source, duration=0.8)
+                print(f"[Nova] Calibrated. Energy threshold: {self.recognizer.energy_threshold}")
+                if self.endpointer:
+                    # The same 0.8 s, read again from the ring buffer
+                    ambient, _ = capture.ring.read(calibration_start, source.position - calibration_start)
+                    self.endpointer.calibrate(ambient, source.SAMPLE_WIDTH, source.SAMPLE_RATE)
+
+                spotter = KeywordSpotter.from_directory(self.path(WAKE_TEMPLATES_DIR), sample_rate=source.SAMPLE_RATE)
+                if spotter:
+                    print(f"[Nova] Offline wake word: {len(spotter.templates)} templates, threshold {spotter.threshold:.2f}")
+
+                while self.is_running:
+                    try:
+
+                        trace = self.metrics.trace()
+                        woke, residual = self._listen_for_wake(source, spotter, trace)
+
+                        if not self.is_running:
+                            break
+                        if isinstance(device, ReplaySource) and source.position >= device.total_bytes:
+                            print("[Nova] Replay finished")
+                            break
+
+                        if woke:
+
+                            self.wake_stats["wakes"] += 1
+                            self.on_state(PROCESSING)
+
+                            if self.looks_like_command(residual):
+                                # "Nova open spotify" in one breath: no second listen
+                                self.wake_stats["fast_path"] += 1
+                                print(f"[Nova] Fast path: {residual}")
+                                self.on_log(f"Command: {residual}")
+                                self.dispatch_command(residual, trace)
+                            else:
+                                self.speak_async("Yes boss!", priority=PRIORITY_HIGH, interrupt=True)
+                                if self.windows:
+                                    # Snapshot open windows while the command is being spoken
+                                    self.windows.prefetch()
+                                trace = self.metrics.trace()
+                                try:
+                                    a2 = self._listen(source, timeout=5, phrase_time_limit=8)
+                                    trace.mark("capture_end")
+                                    cmd = self._transcribe(a2)
+                                    trace.mark("asr_result")
+                                    self.on_log(f"Command: {cmd}")
+                                    self.dispatch_command(cmd, trace)
+                                except sr.WaitTimeoutError:
+                                    self.speak("Timed out.")
+                                except sr.UnknownValueError:
+                                    self.speak("Could not understand.")
+                                except sr.RequestError as e:
+                                    print(f"[Nova] Recognizer unavailable: {e}")
+                                    self.speak("Speech service unavailable.")
+
+                            if self.is_running:
+                                self.on_state(LISTENING)
+                            if spotter:
+                                spotter.reset()
+
+                    except Exception as e:
+                        print(f"Error in loop: {e}")
+
+        except Exception as e:
+            print(f"Microphone error: {e}")
+
+        if self.asr:
+            print(f"[Nova] Recognizer stats ({self.asr.name}): {self.asr.stats.snapshot()}")
+        if self.vad:
+            vad = self.vad.stats()
+            print(f"[Nova] Voice-activity gate: dropped {vad['dropped']}/{vad['checked']} phrases, "
+                  f"{vad['suppressed_fraction']:.0%} of {vad['audio_seconds']}s kept from the recognizer")
+        if self.endpointer:
+            ep = self.endpointer.stats()
+            print(f"[Nova] Endpointing: {ep['utterances']} phrases, learned pause {ep['pause'] * 1000:.0f} ms, "
+                  f"released {ep['mean_release_delay'] * 1000:.0f} ms after speech; "
+                  f"estimated {ep['mean_saved'] * 1000:+.0f} ms per phrase against the fixed "
+                  f"{self.recognizer.pause_threshold:.1f}s pause (negative = slower), "
+                  f"{ep['baseline_cuts']} phrases it would have cut off")
+        print(f"[Nova] Action stats (max queue depth {self.actions.max_depth}): {self.actions.stats.snapshot()}")
+        wakes, fast = self.wake_stats["wakes"], self.wake_stats["fast_path"]
+        if wakes:
+            print(f"[Nova] Single-utterance commands: {fast}/{wakes} ({fast / wakes:.0%})")
+        if self.metrics.enabled:
+            print(f"[Nova] Stage latency over the last {self.metrics.window:.0f}s:\n{format_table(self.metrics.snapshot())}")
+
+        if pythoncom:
+            pythoncom.CoUninitialize()
@@ -0,0 +1,213 @@
+"""Per-drive folder index for "open X from Y drive".
+
+A drive is walked once, down to `max_depth` levels, with os.scandir. Every
+directory is stored with its mtime, so a refresh only rescans directories
+whose contents changed. Folder names go into a FuzzyIndex, which means a
+nested "M:\\Work\\Reports" resolves from "reports" or a misheard "reprts".
+The index is cached on disk, and refreshes are rate-limited so repeated
+commands don't hammer the drive.
+"""
+import json
+import os
+import threading
+import time
+
+from nova.matching import FuzzyIndex
+from nova.storage import atomic_write_json
+
+CACHE_VERSION = 1
+
+# Names that are never what the user means by "open X from Y drive"
+SKIP_NAMES = {"system volume information", "$recycle.bin", "$windows.~bt", "$windows.~ws"}
+
+
+def scan_folders(path):
+    """Subdirectories of one directory as a sorted list of names.
+
+    Hidden dot-folders, $-prefixed system folders and symlinks/junctions are
+    skipped so the walk stays on the drive and out of loops.
+    """
+    names = []
+    with os.scandir(path) as it:
+        for entry in it:
+            name = entry.name
+            if name[0] in ".$" or name.lower() in SKIP_NAMES:
+                continue
+            try:
+                if entry.is_symlink() or not entry.is_dir(follow_symlinks=False):
+                    continue
+                is_junction = getattr(entry, "is_junction", None)
+                if is_junction and is_junction():
+                    continue
+            except OSError:
+                continue
+            names.append(name)
+    names.sort()
+    return names
+
+
+def drive_root(letter):
+    return f"{letter.upper()}:\\"
+
+
+class FolderIndex:
+    """Folders under one root, searchable by (fuzzy) name.
+
+    root         -- directory to index; a drive root in the app, any path in tests
+    max_depth    -- how many levels below the root to index (1 = root's children)
+    min_interval -- seconds between refreshes started by refresh_if_due()
+    scanner      -- callable(path) -> [subdir names] for one level
+    """
+
+    def __init__(self, root, cache_path=None, max_depth=3, min_interval=300.0,
+                 scanner=scan_folders):
+        self.root = root
+        self.cache_path = cache_path
+        self.max_depth = max_depth
+        self.min_interval = min_interval
+        self._scanner = scanner
+        self._dirs = {}          # path -> {"mtime": ns, "subdirs": [names]}
+        self._by_name = {}       # lowercase name -> [paths], shallowest first
+        self._index = FuzzyIndex()
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.last_refresh = 0.0
+        self.scans = 0
+
+    def __len__(self):
+        return sum(len(paths) for paths in self._by_name.values())
+
+    @property
+    def ready(self):
+        return bool(self._dirs)
+
+    def _rebuild(self, full=True):
+        """Recompute the name table and bring the fuzzy index up to date.
+
+        FuzzyIndex only grows, so small changes just add the new names and
+        leave removed ones behind; find() skips those. Once stale names
+        make up a quarter of the index it is rebuilt from scratch.
+        """
+        by_name = {}
+        for path, entry in self._dirs.items():
+            for name in entry["subdirs"]:
+                by_name.setdefault(name.lower(), []).append(os.path.join(path, name))
+        for paths in by_name.values():
+            paths.sort(key=lambda p: (p.count(os.sep), p.lower()))
+        self._by_name = by_name
+        if not full:
+            index = self._index
+            for name in by_name:
+                if name not in index:
+                    index.add(name)
+            full = len(index) - len(by_name) > len(by_name) // 4
+        if full:
+            self._index = FuzzyIndex(by_name)
+
+    def load_cache(self):
+        """Populate the index from disk. Returns True if a usable cache was read."""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return False
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != CACHE_VERSION or data.get("root") != self.root:
+                return False
+            dirs = {
+                path: {"mtime": e["mtime"], "subdirs": list(e["subdirs"])}
+                for path, e in data["dirs"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return False
+        with self._lock:
+            self._dirs = dirs
+            self._rebuild()
+        return True
+
+    def save_cache(self):
+        if not self.cache_path:
+            return
+        data = {"version": CACHE_VERSION, "root": self.root, "dirs": self._dirs}
+        try:
+            atomic_write_json(self.cache_path, data)
+        except OSError:
+            pass
+
+    def refresh(self, max_depth=None):
+        """Walk the tree, rescanning only directories whose mtime changed.
+
+        Returns True if the index changed. `max_depth` overrides the
+        configured depth for this walk; a shallow first walk makes the drive
+        usable quickly, and the full walk later reuses what it scanned.
+        """
+        depth_limit = self.max_depth if max_depth is None else max_depth
+        old = self._dirs
+        new_dirs = {}
+        changed = False
+        stack = [(self.root, 0)]
+        while stack:
+            path, depth = stack.pop()
+            if path in new_dirs:
+                continue
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            entry = old.get(path)
+            if entry is None or entry["mtime"] != mtime:
+                try:
+                    subdirs = self._scanner(path)
+                except OSError:
+                    continue
+                entry = {"mtime": mtime, "subdirs": subdirs}
+                self.scans += 1
+                changed = True
+            new_dirs[path] = entry
+            if depth + 1 < depth_limit:
+                for name in reversed(entry["subdirs"]):
+                    stack.append((os.path.join(path, name), depth + 1))
+
+        if new_dirs.keys() != old.keys():
+            changed = True
+        with self._lock:
+            self._dirs = new_dirs
+            if changed:
+                self._rebuild(full=False)
+        if depth_limit >= self.max_depth:
+            self.last_refresh = time.monotonic()
+        return changed
+
+    def refresh_if_due(self, save=True):
+        """refresh() unless one ran in the last `min_interval` seconds or is running.
+
+        Safe to call from any thread. Returns True if the index changed.
+        """
+        with self._lock:
+            if self._refreshing:
+                return False
+            if self.last_refresh and time.monotonic() - self.last_refresh < self.min_interval:
+                return False
+            self._refreshing = True
+        try:
+            changed = self.refresh()
+            if changed and save:
+                self.save_cache()
+            return changed
+        finally:
+            self._refreshing = False
+
+    def find(self, name, min_score=0.5):
+        """Best folder path for a spoken name, or None.
+
+        Exact names win, then folders containing the name, then near misses.
+        Among folders with the same name the shallowest one is returned.
+        """
+        with self._lock:
+            paths = self._by_name.get(name.lower().strip())
+            if paths:
+                return paths[0]
+            for key, _ in self._index.lookup(name, limit=5, min_score=min_score):
+                paths = self._by_name.get(key)
+                if paths:
+                    return paths[0]
+        return None
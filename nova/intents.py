@@ -0,0 +1,200 @@
+"""Intent grammar for spoken commands.
+
+Intents are declared as patterns instead of a hand-ordered chain of checks:
+
+    close {app}
+    open {folder} from {drive} drive
+    open {drive} drive
+    open {app}
+    * terminal *
+
+A pattern is made of literal words and {slots}. A * can appear at either
+end and matches any number of words, including none. An untyped slot matches
+one or more words. A typed slot uses the pattern given for its name in
+`slot_types`; for example, {drive} matches a single letter.
+
+IntentRouter compiles each pattern once, when it is added. A trie on the
+leading literal words (the verbs) picks the candidates for an utterance. A
+keyword table does the same for patterns that start with *. Each candidate
+is then checked with one anchored regex. Matchers are callables for intents
+a pattern can't express, such as the user's custom commands.
+
+Every match is scored by how much of the utterance it explains: its literal
+words and typed slots, divided by the number of words said. route() returns
+every match, best first. Equal scores go to the higher priority and then to
+whichever was added first.
+"""
+import re
+
+_SLOT = re.compile(r"^\{([A-Za-z_]\w*)\}$")
+
+
+def normalize(text):
+    """Lower-case, drop trailing punctuation and collapse whitespace."""
+    return " ".join(text.lower().strip(" .!?").split())
+
+
+class Intent:
+    """One reading of an utterance.
+
+    name     -- what was asked for, e.g. "app"
+    slots    -- slot name -> the words that filled it
+    score    -- 0..1, the share of the utterance the match explains
+    priority -- breaks ties between equal scores
+    pattern  -- the pattern that matched, or None for a matcher
+    """
+
+    def __init__(self, name, slots, score, priority=0, pattern=None):
+        self.name = name
+        self.slots = slots
+        self.score = score
+        self.priority = priority
+        self.pattern = pattern
+
+    def __getitem__(self, slot):
+        return self.slots[slot]
+
+    def __repr__(self):
+        return f"<Intent {self.name} {self.slots} score={self.score:.2f}>"
+
+
+class _Pattern:
+    """A pattern compiled to an anchored regex, plus what the router indexes it by."""
+
+    def __init__(self, name, pattern, priority, order, slot_types):
+        words = pattern.lower().split()
+        if not words or words == ["*"]:
+            raise ValueError(f"empty pattern for {name!r}")
+        if "*" in words[1:-1]:
+            raise ValueError(f"{pattern!r}: * is only allowed at either end")
+        self.name = name
+        self.pattern = pattern
+        self.priority = priority
+        self.order = order
+        self.wild_start = words[0] == "*"
+        wild_end = words[-1] == "*"
+        body = words[int(self.wild_start):len(words) - int(wild_end)]
+
+        self.weight = 0          # literal words and typed slots: what a match explains
+        self.lead = []           # literal words before the first slot, for the trie
+        self.slots = []
+        pieces = []
+        typed_before = False
+        for word in body:
+            slot = _SLOT.match(word)
+            if slot:
+                slot_name = slot.group(1)
+                if slot_name in self.slots:
+                    raise ValueError(f"{pattern!r}: slot {{{slot_name}}} used twice")
+                self.slots.append(slot_name)
+                typed = slot_types.get(slot_name)
+                piece = f"(?P<{slot_name}>{typed or '.+?'})"
+                self.weight += 1 if typed else 0
+            else:
+                piece = re.escape(word)
+                self.weight += 1
+                if len(self.slots) == 0:
+                    self.lead.append(word)
+            if pieces:
+                # A one-letter typed slot may run into the next word ("edrive")
+                pieces.append(r"\s*" if typed_before else r"\s+")
+            pieces.append(piece)
+            typed_before = bool(slot) and slot.group(1) in slot_types
+
+        regex = "".join(pieces)
+        if self.wild_start:
+            regex = r"(?:.*\s)?" + regex
+        if wild_end:
+            regex += r"(?:\s.*)?"
+        self.regex = re.compile(regex)
+        # First literal word, for patterns that start with *
+        literals = [w for w in body if not _SLOT.match(w)]
+        self.keyword = literals[0] if literals else None
+
+    def match(self, text, word_count):
+        m = self.regex.fullmatch(text)
+        if m is None:
+            return None
+        slots = {k: v.strip() for k, v in m.groupdict().items()}
+        return Intent(self.name, slots, min(1.0, self.weight / word_count), self.priority, self.pattern)
+
+
+class IntentRouter:
+    """Patterns and matchers compiled into one dispatch structure.
+
+    slot_types -- slot name -> regex for what that slot may hold
+    """
+
+    def __init__(self, slot_types=None):
+        self.slot_types = dict(slot_types or {})
+        self._root = ({}, [])        # (word -> child node, patterns ending here)
+        self._keywords = {}          # word -> patterns starting with * that need it
+        self._anywhere = []          # patterns the indexes can't narrow down
+        self._matchers = []          # (name, fn, priority, order)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, name, pattern, priority=0):
+        """Add a pattern for intent `name`. Raises ValueError if it is malformed."""
+        compiled = _Pattern(name, pattern, priority, self._count, self.slot_types)
+        self._count += 1
+        if compiled.wild_start:
+            if compiled.keyword is None:
+                self._anywhere.append(compiled)
+            else:
+                self._keywords.setdefault(compiled.keyword, []).append(compiled)
+            return compiled
+        node = self._root
+        for word in compiled.lead:
+            node = node[0].setdefault(word, ({}, []))
+        node[1].append(compiled)
+        return compiled
+
+    def add_matcher(self, name, fn, priority=0):
+        """Add a matcher for intent `name`.
+
+        fn(text, words) gets the normalized utterance and its words. It returns
+        (slots, score), or None when the utterance isn't for it.
+        """
+        self._matchers.append((name, fn, priority, self._count))
+        self._count += 1
+
+    def _candidates(self, words):
+        found = list(self._root[1])
+        node = self._root
+        for word in words:
+            node = node[0].get(word)
+            if node is None:
+                break
+            found.extend(node[1])
+        if self._keywords:
+            for word in set(words):
+                found.extend(self._keywords.get(word, ()))
+        found.extend(self._anywhere)
+        return found
+
+    def route(self, text):
+        """Every reading of `text`, best first."""
+        text = normalize(text)
+        if not text:
+            return []
+        words = text.split()
+        ranked = []
+        for pattern in self._candidates(words):
+            intent = pattern.match(text, len(words))
+            if intent is not None:
+                ranked.append((-intent.score, -intent.priority, pattern.order, intent))
+        for name, fn, priority, order in self._matchers:
+            result = fn(text, words)
+            if result is not None:
+                slots, score = result
+                ranked.append((-score, -priority, order, Intent(name, slots, score, priority)))
+        ranked.sort(key=lambda r: r[:3])
+        return [r[3] for r in ranked]
+
+    def best(self, text):
+        """The best reading of `text`, or None."""
+        ranked = self.route(text)
+        return ranked[0] if ranked else None
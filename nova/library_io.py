@@ -0,0 +1,305 @@
+"""Import and export of custom command libraries.
+
+Three formats, each read as a stream so a large file never has to be loaded
+whole:
+
+    jsonl  one {"name": ..., "target": ...} object per line
+    csv    name,target rows (a header row is optional)
+    html   browser bookmark exports (Netscape bookmark format)
+
+Entries are validated as they stream in. plan_import() then compares them
+with the existing commands and returns the changes plus a report of
+additions, updates, conflicts and rejected entries. The caller applies the
+changes in one go (JsonStore.apply() journals them as a single line).
+
+From the command line:
+
+    python -m nova.library_io import shortcuts.csv [--replace] [--dry-run]
+    python -m nova.library_io export backup.jsonl
+"""
+import csv
+import html
+import json
+import os
+import re
+from html.parser import HTMLParser
+from urllib.parse import urlparse
+
+FORMATS = ("jsonl", "csv", "html")
+CHUNK_SIZE = 64 * 1024
+
+_EXTENSIONS = {
+    ".jsonl": "jsonl", ".ndjson": "jsonl",
+    ".csv": "csv",
+    ".html": "html", ".htm": "html",
+}
+_WINDOWS_PATH = re.compile(r"^(?:[a-zA-Z]:[\\/]|\\\\[^\\]+\\)")
+
+
+def detect_format(path):
+    fmt = _EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    if fmt is None:
+        raise ValueError(f"can't tell the format of {path}; pass one of {', '.join(FORMATS)}")
+    return fmt
+
+
+def normalize_name(name):
+    return " ".join(str(name).lower().split())
+
+
+def check_target(target, check_paths=False):
+    """Return the cleaned target, or raise ValueError saying why it is unusable."""
+    target = str(target).strip()
+    if not target:
+        raise ValueError("empty target")
+    lower = target.lower()
+    if lower.startswith(("http://", "https://")):
+        if not urlparse(target).netloc:
+            raise ValueError(f"URL without a host: {target}")
+        return target
+    if lower.startswith("www."):
+        if "." not in target[4:]:
+            raise ValueError(f"incomplete URL: {target}")
+        return target
+    if lower.startswith("shell:") or _WINDOWS_PATH.match(target):
+        if check_paths and not lower.startswith("shell:") and not os.path.exists(target):
+            raise ValueError(f"path not found: {target}")
+        return target
+    raise ValueError(f"not a URL or absolute path: {target}")
+
+
+# -- readers -----------------------------------------------------------------
+#
+# Each reader yields (line_number, name, target). A malformed record yields
+# (line_number, None, reason) so the importer can report it and carry on.
+
+def read_jsonl(f):
+    for n, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+            yield n, entry["name"], entry["target"]
+        except (ValueError, KeyError, TypeError) as e:
+            yield n, None, f"bad JSON record ({e})"
+
+
+def read_csv(f):
+    for n, row in enumerate(csv.reader(f), 1):
+        if not row or not any(cell.strip() for cell in row):
+            continue
+        if n == 1 and [c.strip().lower() for c in row[:2]] == ["name", "target"]:
+            continue
+        if len(row) < 2:
+            yield n, None, "expected name,target"
+            continue
+        yield n, row[0], row[1]
+
+
+class _BookmarkParser(HTMLParser):
+    """Collects <a href> links and their text as the HTML is fed in."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.found = []
+        self._href = None
+        self._text = []
+        self._line = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self._href = dict(attrs).get("href")
+            self._text = []
+            self._line = self.getpos()[0]
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._href is not None:
+            self.found.append((self._line, "".join(self._text), self._href))
+            self._href = None
+
+
+def read_bookmarks(f):
+    parser = _BookmarkParser()
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        parser.feed(chunk)
+        yield from parser.found
+        parser.found = []
+    parser.close()
+    yield from parser.found
+
+
+READERS = {"jsonl": read_jsonl, "csv": read_csv, "html": read_bookmarks}
+
+
+def read_entries(f, fmt, check_paths=False):
+    """Stream (line, name, target, error) with names and targets validated."""
+    for line, name, target in READERS[fmt](f):
+        if name is None:
+            yield line, None, None, target
+            continue
+        name = normalize_name(name)
+        if not name:
+            yield line, None, None, "empty name"
+            continue
+        try:
+            yield line, name, check_target(target, check_paths), None
+        except ValueError as e:
+            yield line, name, None, str(e)
+
+
+# -- import ------------------------------------------------------------------
+
+class ImportReport:
+    """What an import did, or would do."""
+
+    def __init__(self):
+        self.added = []
+        self.updated = []
+        self.unchanged = 0
+        self.conflicts = []       # (name, existing target, imported target)
+        self.invalid = []         # (line, reason)
+        self.duplicates = []      # (line, name) repeated within the file
+
+    @property
+    def changed(self):
+        return len(self.added) + len(self.updated)
+
+    def summary(self):
+        parts = [f"{len(self.added)} added", f"{len(self.updated)} updated", f"{self.unchanged} unchanged"]
+        if self.conflicts:
+            parts.append(f"{len(self.conflicts)} conflicts kept")
+        if self.duplicates:
+            parts.append(f"{len(self.duplicates)} duplicates")
+        if self.invalid:
+            parts.append(f"{len(self.invalid)} invalid")
+        return ", ".join(parts)
+
+
+def plan_import(existing, entries, replace=False):
+    """Work out the changes an import makes to `existing` (name -> target).
+
+    A name that already exists with a different target is a conflict. It
+    keeps the existing target unless `replace` is set. Within the imported
+    file, the first occurrence of a name wins.
+
+    Returns (changes dict, ImportReport).
+    """
+    report = ImportReport()
+    changes = {}
+    seen = set()
+    for line, name, target, error in entries:
+        if error:
+            report.invalid.append((line, f"{name}: {error}" if name else error))
+            continue
+        if name in seen:
+            report.duplicates.append((line, name))
+            continue
+        seen.add(name)
+        current = existing.get(name)
+        if current is None:
+            changes[name] = target
+            report.added.append(name)
+        elif current == target:
+            report.unchanged += 1
+        elif replace:
+            changes[name] = target
+            report.updated.append(name)
+        else:
+            report.conflicts.append((name, current, target))
+    return changes, report
+
+
+def import_file(path, existing, fmt=None, replace=False, check_paths=False):
+    """Stream a library file and plan its import. Returns (changes, report)."""
+    fmt = fmt or detect_format(path)
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return plan_import(existing, read_entries(f, fmt, check_paths), replace)
+
+
+# -- export ------------------------------------------------------------------
+
+def write_jsonl(f, commands):
+    for name in sorted(commands):
+        f.write(json.dumps({"name": name, "target": commands[name]}) + "\n")
+
+
+def write_csv(f, commands):
+    writer = csv.writer(f)
+    writer.writerow(["name", "target"])
+    for name in sorted(commands):
+        writer.writerow([name, commands[name]])
+
+
+def write_bookmarks(f, commands):
+    f.write("<!DOCTYPE NETSCAPE-Bookmark-file-1>\n")
+    f.write('<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n')
+    f.write("<TITLE>NOVA Commands</TITLE>\n<H1>NOVA Commands</H1>\n<DL><p>\n")
+    for name in sorted(commands):
+        f.write(f'    <DT><A HREF="{html.escape(commands[name])}">{html.escape(name)}</A>\n')
+    f.write("</DL><p>\n")
+
+
+WRITERS = {"jsonl": write_jsonl, "csv": write_csv, "html": write_bookmarks}
+
+
+def export_file(path, commands, fmt=None):
+    """Write `commands` to `path` through a temp file. Returns how many were written."""
+    fmt = fmt or detect_format(path)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        WRITERS[fmt](f, commands)
+    os.replace(tmp, path)
+    return len(commands)
+
+
+def _print_report(report, limit=20):
+    print(report.summary())
+    for name, current, target in report.conflicts[:limit]:
+        print(f"  conflict: {name!r} is {current} (file has {target})")
+    for line, reason in report.invalid[:limit]:
+        print(f"  line {line}: {reason}")
+    hidden = max(0, len(report.conflicts) - limit) + max(0, len(report.invalid) - limit)
+    if hidden:
+        print(f"  ... and {hidden} more")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from nova.storage import JsonStore, user_data_dir, validate_commands
+
+    parser = argparse.ArgumentParser(description="Import or export NOVA command libraries")
+    parser.add_argument("--commands", default=os.path.join(user_data_dir(), "nova_commands.json"), help="command file to update")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    imp = sub.add_parser("import", help="add commands from a JSONL, CSV or bookmark HTML file")
+    imp.add_argument("path")
+    imp.add_argument("--format", choices=FORMATS)
+    imp.add_argument("--replace", action="store_true", help="overwrite existing commands on conflict")
+    imp.add_argument("--check-paths", action="store_true", help="reject paths that don't exist here")
+    imp.add_argument("--dry-run", action="store_true")
+    exp = sub.add_parser("export", help="write the command library to a file")
+    exp.add_argument("path")
+    exp.add_argument("--format", choices=FORMATS)
+    args = parser.parse_args()
+
+    # Close NOVA first: a running app keeps its own copy and would overwrite this
+    store = JsonStore(args.commands, validate=validate_commands)
+    commands = store.load()
+    if args.cmd == "import":
+        changes, report = import_file(args.path, commands, args.format, args.replace, args.check_paths)
+        _print_report(report)
+        if changes and not args.dry_run:
+            store.apply(changes)
+            store.close()
+            print(f"Saved {len(changes)} change(s) to {args.commands}")
+    elif args.cmd == "export":
+        count = export_file(args.path, commands, args.format)
+        print(f"Exported {count} command(s) to {args.path}")
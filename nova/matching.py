@@ -0,0 +1,294 @@
+"""Text matchers used to resolve spoken commands."""
+import itertools
+import threading
+from collections import Counter
+
+
+class CommandMatcher:
+    """Aho-Corasick automaton over custom-command keys.
+
+    One pass over the utterance finds every key it contains. When several
+    keys match, the longest wins; ties go to the earliest position and then
+    to alphabetical order, so the result never depends on dict order.
+
+    Keys can be added and removed at any time. The trie is updated in place
+    and the failure links are rebuilt lazily before the next scan.
+    """
+
+    def __init__(self, keys=()):
+        self._lock = threading.Lock()
+        self._goto = [{}]       # node -> {char: node}
+        self._fail = [0]        # node -> longest proper suffix node
+        self._key = [None]      # node -> key ending exactly here
+        self._best = [None]     # node -> longest key that is a suffix of node
+        self._keys = set()
+        self._dirty = False
+        for key in keys:
+            self.add(key)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def keys(self):
+        return set(self._keys)
+
+    def add(self, key):
+        if not key or key in self._keys:
+            return
+        with self._lock:
+            node = 0
+            for ch in key:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._key.append(None)
+                    self._best.append(None)
+                    self._goto[node][ch] = nxt
+                node = nxt
+            self._key[node] = key
+            self._keys.add(key)
+            self._dirty = True
+
+    def remove(self, key):
+        if key not in self._keys:
+            return
+        with self._lock:
+            node = 0
+            for ch in key:
+                node = self._goto[node][ch]
+            self._key[node] = None
+            self._keys.discard(key)
+            self._dirty = True
+
+    def update(self, keys):
+        """Bring the automaton in line with `keys`, touching only the difference."""
+        wanted = set(keys)
+        for key in self._keys - wanted:
+            self.remove(key)
+        for key in wanted - self._keys:
+            self.add(key)
+
+    def _rebuild_links(self):
+        goto, fail, key, best = self._goto, self._fail, self._key, self._best
+        best[0] = None
+        order = []
+        for child in goto[0].values():
+            fail[child] = 0
+            order.append(child)
+        i = 0
+        while i < len(order):
+            node = order[i]
+            i += 1
+            best[node] = key[node] if key[node] is not None else best[fail[node]]
+            for ch, child in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                order.append(child)
+        self._dirty = False
+
+    def match(self, text):
+        """Return the best key contained in `text`, or None."""
+        if not self._keys:
+            return None
+        with self._lock:
+            if self._dirty:
+                self._rebuild_links()
+            goto, fail, best = self._goto, self._fail, self._best
+            node = 0
+            found = None
+            found_start = 0
+            for pos, ch in enumerate(text):
+                while node and ch not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(ch, 0)
+                hit = best[node]
+                if hit is None:
+                    continue
+                start = pos - len(hit) + 1
+                if (found is None or len(hit) > len(found)
+                        or (len(hit) == len(found)
+                            and (start, hit) < (found_start, found))):
+                    found, found_start = hit, start
+            return found
+
+
+def _trigrams(text):
+    """Trigrams of `text` padded with a space on each side."""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, max_distance=None):
+    """Levenshtein distance between two strings.
+
+    With `max_distance` only a diagonal band is computed and any distance
+    above the bound is reported as max_distance + 1.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is None:
+        max_distance = len(a)
+    if len(a) - len(b) > max_distance:
+        return max_distance + 1
+    if not b:
+        return len(a)
+    over = max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        lo = max(1, i - max_distance)
+        hi = min(len(b), i + max_distance)
+        current = [over] * (len(b) + 1)
+        current[0] = i if i <= max_distance else over
+        row_min = current[0]
+        for j in range(lo, hi + 1):
+            cost = previous[j - 1] + (ca != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > max_distance:
+            return over
+        previous = current
+    return min(previous[-1], over)
+
+
+def similarity(a, b, min_score=0.0):
+    """Edit-distance similarity in [0, 1]; anything below `min_score` may read as 0."""
+    longest = max(len(a), len(b))
+    if not longest:
+        return 1.0
+    bound = int(longest * (1.0 - min_score))
+    distance = edit_distance(a, b, bound)
+    if distance > bound:
+        return 0.0
+    return 1.0 - distance / longest
+
+
+class FuzzyIndex:
+    """Trigram inverted index over names, for lookups that tolerate typos.
+
+    lookup() ranks exact matches first, then names containing the query
+    (shortest first, as process_command always did), then near misses such
+    as a misheard "spotfy" scored by edit distance.
+    """
+
+    def __init__(self, names=(), rerank=16, verify=3, common_fraction=0.05):
+        self._names = []
+        self._ids = {}
+        self._postings = {}
+        self._rerank = rerank
+        self._verify = verify
+        self._common_fraction = common_fraction
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._ids
+
+    def add(self, name):
+        name = name.lower()
+        if not name or name in self._ids:
+            return
+        idx = len(self._names)
+        self._names.append(name)
+        self._ids[name] = idx
+        for gram in _trigrams(name):
+            self._postings.setdefault(gram, []).append(idx)
+
+    def _substring_ids(self, query):
+        if len(query) < 3:
+            return [i for i, name in enumerate(self._names) if query in name]
+        inner = {query[i:i + 3] for i in range(len(query) - 2)}
+        shortest = None
+        for gram in inner:
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            if shortest is None or len(posting) < len(shortest):
+                shortest = posting
+        names = self._names
+        return [i for i in shortest if query in names[i]]
+
+    def _fuzzy_ids(self, query):
+        grams = _trigrams(query)
+        postings = [self._postings[g] for g in grams if g in self._postings]
+        if not postings:
+            return []
+        postings.sort(key=len)
+        # Very common trigrams (" mi", "oso") say little and cost the most;
+        # skip them as long as something more selective is left.
+        ceiling = max(64, int(len(self._names) * self._common_fraction))
+        selective = [p for p in postings if len(p) <= ceiling] or postings[:1]
+        counts = Counter(itertools.chain.from_iterable(selective))
+        top = [i for i, _ in counts.most_common(self._rerank)]
+
+        # Exact trigram Dice on the short list, edit distance only on the best few
+        names = self._names
+        dice = []
+        for i in top:
+            other = _trigrams(names[i])
+            dice.append((2 * len(grams & other) / (len(grams) + len(other)), i))
+        dice.sort(reverse=True)
+        return [i for _, i in dice[:self._verify]]
+
+    def lookup(self, query, limit=5, min_score=0.0):
+        """Return up to `limit` ranked (name, score) pairs for `query`."""
+        query = query.lower().strip()
+        if not query or not self._names:
+            return []
+        names = self._names
+        results = []
+        seen = set()
+
+        exact = self._ids.get(query)
+        if exact is not None:
+            results.append((query, 1.0))
+            seen.add(exact)
+
+        if len(results) < limit:
+            contained = sorted(
+                (i for i in self._substring_ids(query) if i not in seen),
+                key=lambda i: (len(names[i]), names[i])
+            )
+            for i in contained[:limit - len(results)]:
+                results.append((names[i], len(query) / len(names[i])))
+                seen.add(i)
+
+        if len(results) < limit:
+            scored = []
+            for i in self._fuzzy_ids(query):
+                if i in seen:
+                    continue
+                score = similarity(query, names[i], min_score)
+                if score >= min_score:
+                    scored.append((-score, names[i]))
+            scored.sort()
+            for neg, name in scored[:limit - len(results)]:
+                results.append((name, -neg))
+        return results
+
+    def best(self, query, min_score=0.7):
+        """Best name for `query`, or None when only weak fuzzy matches exist."""
+        query = query.lower().strip()
+        hits = self.lookup(query, limit=1, min_score=min_score)
+        if not hits:
+            return None
+        name, score = hits[0]
+        if name == query or query in name or score >= min_score:
+            return name
+        return None
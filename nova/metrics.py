@@ -0,0 +1,324 @@
+"""Per-stage latency metrics for the voice pipeline.
+
+Each interaction gets a Trace. Code along the pipeline marks when things
+happen:
+
+    capture_end      recognizer.listen() returned the audio
+    asr_result       the transcript came back
+    dispatched       the command was queued on the action executor
+    action_start     a worker picked it up
+    match            resolve() worked out what it means
+    tts_enqueued     the first reply was queued for speech
+    tts_first_audio  ...and started playing
+    action_end       the action returned
+
+When the trace finishes, the gaps between marks (STAGES) go into rolling
+histograms. Percentiles cover the last `window` seconds; counts and sums
+cover the whole session. The histograms are HDR-style: log-linear buckets
+of whole microseconds, to within about 1.6%, in a sparse dict.
+
+Disabled (the default), Metrics.trace() hands out one shared no-op trace,
+so the pipeline pays a method call per mark and nothing else.
+
+Dump a metrics file written by NOVA:
+
+    python -m nova.metrics [nova_metrics.json] [--prometheus]
+"""
+import json
+import math
+import os
+import threading
+import time
+
+# name -> (from mark, to mark)
+STAGES = {
+    "asr": ("capture_end", "asr_result"),
+    "dispatch": ("asr_result", "dispatched"),
+    "queue": ("dispatched", "action_start"),
+    "match": ("action_start", "match"),
+    "tts": ("tts_enqueued", "tts_first_audio"),
+    "action": ("match", "action_end"),
+    "response": ("capture_end", "tts_first_audio"),
+    "total": ("capture_end", "action_end"),
+}
+QUANTILES = (50, 95, 99)
+
+_SUB_BITS = 7
+_SUB_COUNT = 1 << _SUB_BITS          # linear buckets below 128 us
+_HALF = _SUB_COUNT >> 1              # buckets per power of two above that
+
+
+def _bucket(us):
+    if us < _SUB_COUNT:
+        return us
+    shift = us.bit_length() - _SUB_BITS
+    return _SUB_COUNT + (shift - 1) * _HALF + (us >> shift) - _HALF
+
+
+def _bucket_value(index):
+    """Midpoint of a bucket, in microseconds."""
+    if index < _SUB_COUNT:
+        return index
+    shift = (index - _SUB_COUNT) // _HALF + 1
+    low = ((index - _SUB_COUNT) % _HALF + _HALF) << shift
+    return low + ((1 << shift) - 1) / 2
+
+
+class Histogram:
+    """Latencies in seconds, bucketed HDR-style."""
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, seconds):
+        seconds = max(0.0, seconds)
+        index = _bucket(int(seconds * 1e6))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def percentile(self, q):
+        """The q-th percentile (0-100) in seconds, or None when empty."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q / 100.0 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                value = _bucket_value(index) / 1e6
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+class RollingHistogram:
+    """A Histogram over the last `window` seconds, kept as `slots` sub-histograms,
+    plus session-long count and sum."""
+
+    def __init__(self, window=300.0, slots=10):
+        self.slot_length = window / slots
+        self.slots = slots
+        self._ring = []              # [(slot number, Histogram)], oldest first
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds, now=None):
+        slot = int((time.monotonic() if now is None else now) // self.slot_length)
+        if not self._ring or self._ring[-1][0] != slot:
+            self._ring.append((slot, Histogram()))
+            self._expire(slot)
+        self._ring[-1][1].record(seconds)
+        self.count += 1
+        self.total += max(0.0, seconds)
+
+    def _expire(self, slot):
+        while self._ring and self._ring[0][0] <= slot - self.slots:
+            self._ring.pop(0)
+
+    def window(self, now=None):
+        """The merged histogram of the current window."""
+        self._expire(int((time.monotonic() if now is None else now) // self.slot_length))
+        merged = Histogram()
+        for _, hist in self._ring:
+            merged.merge(hist)
+        return merged
+
+
+class Trace:
+    """Timestamps for one interaction. The first mark of each name wins."""
+
+    __slots__ = ("metrics", "marks")
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self.marks = {}
+
+    def __bool__(self):
+        return True
+
+    def mark(self, name, at=None):
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() if at is None else at
+
+    def finish(self, kind=None):
+        """Record every stage with both marks present. `kind` (the resolved
+        command kind) also files the action stage under "action:<kind>"."""
+        metrics, marks = self.metrics, self.marks
+        for stage, (begin, end) in STAGES.items():
+            if begin in marks and end in marks:
+                metrics.observe(stage, marks[end] - marks[begin])
+                if stage == "action" and kind:
+                    metrics.observe(f"action:{kind}", marks[end] - marks[begin])
+        self.marks = {}
+
+
+class _NullTrace:
+    __slots__ = ()
+
+    def __bool__(self):
+        return False
+
+    def mark(self, name, at=None):
+        pass
+
+    def finish(self, kind=None):
+        pass
+
+
+NULL_TRACE = _NullTrace()
+
+
+class Metrics:
+    """Rolling per-stage histograms, switched on with `enabled`."""
+
+    def __init__(self, enabled=False, window=300.0, slots=10):
+        self.enabled = enabled
+        self.window = window
+        self.slots = slots
+        self.started = time.time()
+        self._stages = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._dumper = None
+        self._dump_args = None
+
+    def trace(self):
+        return Trace(self) if self.enabled else NULL_TRACE
+
+    def activate(self, trace):
+        """Make `trace` the current one on this thread (None to clear)."""
+        if self.enabled:
+            self._local.trace = trace
+
+    def current(self):
+        """The trace activated on this thread, or the no-op trace."""
+        if not self.enabled:
+            return NULL_TRACE
+        return getattr(self._local, "trace", None) or NULL_TRACE
+
+    def observe(self, stage, seconds):
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self._stages.get(stage)
+            if hist is None:
+                hist = self._stages[stage] = RollingHistogram(self.window, self.slots)
+            hist.record(seconds)
+
+    def snapshot(self):
+        """Per-stage percentiles over the window and totals over the session."""
+        stages = {}
+        with self._lock:
+            for name, rolling in sorted(self._stages.items()):
+                hist = rolling.window()
+                entry = {"count": rolling.count, "sum": rolling.total, "window_count": hist.count}
+                for q in QUANTILES:
+                    entry[f"p{q}"] = hist.percentile(q)
+                entry["max"] = hist.max
+                stages[name] = entry
+        return {"started": self.started, "window": self.window, "stages": stages}
+
+    # -- files ---------------------------------------------------------------
+
+    def dump(self, path, prometheus_path=None):
+        from nova.storage import atomic_write_json
+        snapshot = self.snapshot()
+        try:
+            atomic_write_json(path, snapshot, indent=2)
+            if prometheus_path:
+                tmp = prometheus_path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(prometheus_text(snapshot))
+                os.replace(tmp, prometheus_path)
+        except OSError as e:
+            print(f"[Nova] Could not write metrics: {e}")
+
+    def start_dumps(self, path, prometheus_path=None, interval=10.0):
+        """Rewrite the dump file(s) every `interval` seconds until stop_dumps()."""
+        if not self.enabled or self._dumper is not None:
+            return
+
+        def loop():
+            while not self._stop.wait(interval):
+                self.dump(path, prometheus_path)
+
+        self._stop.clear()
+        self._dump_args = (path, prometheus_path)
+        self._dumper = threading.Thread(target=loop, name="nova-metrics", daemon=True)
+        self._dumper.start()
+
+    def stop_dumps(self):
+        """Stop the dump thread and write the files one last time."""
+        if self._dumper is None:
+            return
+        self._stop.set()
+        self._dumper.join(1.0)
+        self._dumper = None
+        self.dump(*self._dump_args)
+
+
+def prometheus_text(snapshot, prefix="nova"):
+    """A snapshot in the Prometheus text exposition format, as a summary per stage."""
+    name = f"{prefix}_stage_seconds"
+    lines = [
+        f"# HELP {name} Latency of each voice pipeline stage",
+        f"# TYPE {name} summary",
+    ]
+    for stage, entry in snapshot["stages"].items():
+        stage, _, kind = stage.partition(":")
+        labels = f'stage="{stage}"' + (f',kind="{kind}"' if kind else "")
+        for q in QUANTILES:
+            value = entry.get(f"p{q}")
+            if value is not None:
+                lines.append(f'{name}{{{labels},quantile="{q / 100:g}"}} {value:.6f}')
+        lines.append(f"{name}_sum{{{labels}}} {entry['sum']:.6f}")
+        lines.append(f"{name}_count{{{labels}}} {entry['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def format_table(snapshot):
+    def ms(value):
+        return "-" if value is None else f"{value * 1000:.1f}"
+
+    rows = [f"{'stage':16s} {'count':>6s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'max ms':>8s}"]
+    for stage, e in snapshot["stages"].items():
+        rows.append(f"{stage:16s} {e['count']:6d} {ms(e['p50']):>8s} {ms(e['p95']):>8s} "
+                    f"{ms(e['p99']):>8s} {ms(e['max']):>8s}")
+    return "\n".join(rows)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from nova.storage import user_data_dir
+
+    parser = argparse.ArgumentParser(description="Show the latency metrics NOVA last wrote")
+    parser.add_argument("path", nargs="?", default=os.path.join(user_data_dir(), "nova_metrics.json"))
+    parser.add_argument("--prometheus", action="store_true", help="print Prometheus text format instead of a table")
+    args = parser.parse_args()
+    try:
+        with open(args.path, encoding="utf-8") as f:
+            data = json.load(f)
+    except OSError as e:
+        raise SystemExit(f"No metrics at {args.path} ({e}). Set \"metrics\": true in nova_settings.json "
+                         "or NOVA_METRICS=1 and run NOVA first.")
+    print(prometheus_text(data) if args.prometheus else format_table(data))
@@ -0,0 +1,171 @@
+"""Find and terminate running applications by spoken name.
+
+One pass over the process table (psutil) builds a name -> processes index.
+A spoken name is resolved through PROCESS_MAP first, then through the
+running process names themselves: exact, containing the name (the old
+PowerShell "*name*" filter) and finally a strict fuzzy match. The matches
+are terminated in-process, and whatever survives a grace period is killed.
+Without psutil, each resolved image name gets a single taskkill instead.
+"""
+import os
+import re
+import subprocess
+from collections import namedtuple
+
+from nova.matching import FuzzyIndex
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Spoken app name -> executable names
+PROCESS_MAP = {
+    "chrome":       ["chrome.exe"],
+    "google chrome": ["chrome.exe"],
+    "firefox":      ["firefox.exe"],
+    "edge":         ["msedge.exe"],
+    "microsoft edge": ["msedge.exe"],
+    "notepad":      ["notepad.exe"],
+    "calculator":   ["CalculatorApp.exe", "Calculator.exe"],
+    "calc":         ["CalculatorApp.exe", "Calculator.exe"],
+    "spotify":      ["Spotify.exe"],
+    "discord":      ["Discord.exe"],
+    "telegram":     ["Telegram.exe"],
+    "whatsapp":     ["WhatsApp.exe"],
+    "vs code":      ["Code.exe"],
+    "visual studio code": ["Code.exe"],
+    "code":         ["Code.exe"],
+    "word":         ["WINWORD.EXE"],
+    "excel":        ["EXCEL.EXE"],
+    "powerpoint":   ["POWERPNT.EXE"],
+    "file explorer": ["explorer.exe"],
+    "explorer":     ["explorer.exe"],
+    "vlc":          ["vlc.exe"],
+    "obs":          ["obs64.exe", "obs32.exe"],
+    "teams":        ["ms-teams.exe", "Teams.exe"],
+    "zoom":         ["Zoom.exe"],
+    "slack":        ["slack.exe"],
+    "skype":        ["Skype.exe"],
+}
+
+CloseResult = namedtuple("CloseResult", "targets closed failed")
+CloseResult.__doc__ = """targets: image names matched; closed / failed: [(pid, name)]."""
+
+
+def process_key(name):
+    """Normalised process name: lowercase, no .exe, letters and digits only."""
+    name = name.lower()
+    if name.endswith(".exe"):
+        name = name[:-4]
+    return re.sub(r"[^a-z0-9]", "", name)
+
+
+class ProcessController:
+    """Resolves spoken names to running processes and closes them.
+
+    process_map -- spoken name -> [executable names]; PROCESS_MAP by default
+    grace       -- seconds to wait after terminate() before kill()
+    min_score   -- fuzzy similarity needed for a name that isn't mapped
+    """
+
+    def __init__(self, process_map=None, grace=1.0, min_score=0.8):
+        self.process_map = PROCESS_MAP if process_map is None else process_map
+        self.grace = grace
+        self.min_score = min_score
+        self._protected = {os.getpid()}
+        if psutil:
+            try:
+                self._protected.update(p.pid for p in psutil.Process().parents())
+            except psutil.Error:
+                pass
+
+    @staticmethod
+    def available():
+        return psutil is not None
+
+    def mapped_names(self, app_name):
+        """Executable names PROCESS_MAP gives for a spoken name, first match only."""
+        app_lower = app_name.lower().strip()
+        for key, proc_names in self.process_map.items():
+            if key in app_lower or app_lower in key:
+                return list(proc_names)
+        return []
+
+    def snapshot(self):
+        """{process_key: [psutil.Process]} for everything running now."""
+        table = {}
+        for proc in psutil.process_iter(["name"]):
+            name = proc.info.get("name")
+            if not name or proc.pid in self._protected:
+                continue
+            table.setdefault(process_key(name), []).append(proc)
+        return table
+
+    def resolve(self, app_name, table):
+        """Process keys in `table` that `app_name` refers to."""
+        mapped = [process_key(n) for n in self.mapped_names(app_name)]
+        keys = [k for k in mapped if k in table]
+        if keys:
+            return keys
+        search = process_key(app_name)
+        if not search:
+            return []
+        if search in table:
+            return [search]
+        index = FuzzyIndex(table)
+        hits = index.lookup(search, limit=len(table), min_score=self.min_score)
+        # Substring matches only for names long enough not to catch half the
+        # process table ("close a" must not mean "*a*")
+        contained = [name for name, _ in hits if search in name]
+        if contained and len(search) >= 3:
+            return contained
+        fuzzy = [name for name, score in hits if search not in name and score >= self.min_score]
+        return fuzzy[:1]
+
+    def close(self, app_name):
+        """Close every process the name resolves to. Returns a CloseResult."""
+        if psutil is None:
+            return self._close_with_taskkill(app_name)
+        table = self.snapshot()
+        keys = self.resolve(app_name, table)
+        procs = [p for k in keys for p in table[k]]
+        targets = sorted({p.info["name"] for p in procs})
+        closed, failed, pending = [], [], []
+        for proc in procs:
+            try:
+                proc.terminate()
+                pending.append(proc)
+            except psutil.NoSuchProcess:
+                closed.append((proc.pid, proc.info["name"]))
+            except psutil.Error:
+                failed.append((proc.pid, proc.info["name"]))
+        gone, alive = psutil.wait_procs(pending, timeout=self.grace)
+        closed.extend((p.pid, p.info["name"]) for p in gone)
+        for proc in alive:
+            try:
+                proc.kill()
+                proc.wait(self.grace)
+                closed.append((proc.pid, proc.info["name"]))
+            except psutil.NoSuchProcess:
+                closed.append((proc.pid, proc.info["name"]))
+            except psutil.Error:
+                failed.append((proc.pid, proc.info["name"]))
+        return CloseResult(targets, closed, failed)
+
+    def _close_with_taskkill(self, app_name):
+        """Fallback without psutil: one taskkill per image name, no PowerShell."""
+        names = self.mapped_names(app_name)
+        if not names:
+            proc = app_name.lower().strip()
+            names = [proc if proc.endswith(".exe") else proc + ".exe"]
+        closed, failed = [], []
+        for name in names:
+            try:
+                res = subprocess.run(["taskkill", "/F", "/IM", name], capture_output=True)
+            except OSError:
+                failed.append((None, name))
+                continue
+            if res.returncode == 0:
+                closed.append((None, name))
+        return CloseResult(names, closed, failed)
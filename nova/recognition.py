@@ -0,0 +1,317 @@
+"""Speech-recognition backends and audio inputs behind run_loop.
+
+A backend turns an sr.AudioData into text and raises the usual
+sr.UnknownValueError / sr.RequestError. Each one keeps its own latency and
+real-time-factor numbers. ReplaySource and ReplayBackend drive the whole
+wake-to-command pipeline from WAV files, with no microphone or network.
+"""
+import importlib.util
+import json
+import os
+import threading
+import time
+
+import speech_recognition as sr
+
+
+class BackendStats:
+    """Running latency / real-time-factor totals for one backend."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.audio_total = 0.0
+
+    def record(self, latency, audio_seconds, failed=False):
+        with self._lock:
+            self.calls += 1
+            if failed:
+                self.errors += 1
+            self.latency_total += latency
+            self.audio_total += audio_seconds
+            if latency > self.latency_max:
+                self.latency_max = latency
+
+    def snapshot(self):
+        with self._lock:
+            calls = self.calls
+            return {
+                "calls": calls,
+                "errors": self.errors,
+                "avg_latency": self.latency_total / calls if calls else None,
+                "max_latency": self.latency_max if calls else None,
+                "rtf": self.latency_total / self.audio_total if self.audio_total else None,
+            }
+
+
+def audio_duration(audio):
+    return len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+
+
+class RecognizerBackend:
+    """Base class. Subclasses implement recognize()."""
+
+    name = "base"
+
+    def __init__(self):
+        self.stats = BackendStats()
+
+    def recognize(self, recognizer, audio):
+        raise NotImplementedError
+
+    def transcribe(self, recognizer, audio):
+        """recognize() with timing. Errors propagate after being counted."""
+        start = time.perf_counter()
+        failed = True
+        try:
+            text = self.recognize(recognizer, audio)
+            failed = False
+            return text
+        except sr.UnknownValueError:
+            failed = False
+            raise
+        finally:
+            self.stats.record(time.perf_counter() - start, audio_duration(audio), failed)
+
+
+class GoogleBackend(RecognizerBackend):
+    name = "google"
+
+    def __init__(self, language="en-US"):
+        super().__init__()
+        self.language = language
+
+    def recognize(self, recognizer, audio):
+        return recognizer.recognize_google(audio, language=self.language)
+
+
+class VoskBackend(RecognizerBackend):
+    """Offline recognition through SpeechRecognition's Vosk adapter."""
+
+    name = "vosk"
+
+    @staticmethod
+    def available():
+        return importlib.util.find_spec("vosk") is not None
+
+    def recognize(self, recognizer, audio):
+        try:
+            result = recognizer.recognize_vosk(audio)
+        except sr.UnknownValueError:
+            raise
+        except Exception as e:
+            raise sr.RequestError(f"vosk: {e}")
+        if isinstance(result, str) and result.lstrip().startswith("{"):
+            result = json.loads(result).get("text", "")
+        elif not isinstance(result, str):
+            result = getattr(result, "text", "") or ""
+        if not result.strip():
+            raise sr.UnknownValueError()
+        return result
+
+
+class WhisperBackend(RecognizerBackend):
+    """Offline recognition through faster-whisper or openai-whisper."""
+
+    name = "whisper"
+
+    def __init__(self, model="base.en"):
+        super().__init__()
+        self.model = model
+
+    @staticmethod
+    def available():
+        return (importlib.util.find_spec("faster_whisper") is not None
+                or importlib.util.find_spec("whisper") is not None)
+
+    def recognize(self, recognizer, audio):
+        try:
+            if importlib.util.find_spec("faster_whisper") is not None:
+                text = recognizer.recognize_faster_whisper(audio, model=self.model)
+            else:
+                text = recognizer.recognize_whisper(audio, model=self.model)
+        except sr.UnknownValueError:
+            raise
+        except Exception as e:
+            raise sr.RequestError(f"whisper: {e}")
+        if not text or not text.strip():
+            raise sr.UnknownValueError()
+        return text.strip()
+
+
+class FallbackBackend(RecognizerBackend):
+    """Try backends in order, moving on only when one can't be reached."""
+
+    name = "fallback"
+
+    def __init__(self, backends):
+        super().__init__()
+        self.backends = list(backends)
+        self.last_used = None
+
+    def recognize(self, recognizer, audio):
+        error = None
+        for backend in self.backends:
+            try:
+                text = backend.transcribe(recognizer, audio)
+                self.last_used = backend
+                return text
+            except sr.RequestError as e:
+                print(f"[Nova] {backend.name} recognizer unavailable: {e}")
+                error = e
+        raise error or sr.RequestError("no recognizer backends configured")
+
+    def all_stats(self):
+        return {b.name: b.stats.snapshot() for b in self.backends}
+
+
+def create_backend(name="auto"):
+    """Backend for a settings value: google, vosk, whisper or auto.
+
+    auto is Google with whichever offline engine is installed as fallback.
+    """
+    name = (name or "auto").lower()
+    if name == "google":
+        return GoogleBackend()
+    if name == "vosk":
+        return VoskBackend()
+    if name == "whisper":
+        return WhisperBackend()
+    chain = [GoogleBackend()]
+    if VoskBackend.available():
+        chain.append(VoskBackend())
+    elif WhisperBackend.available():
+        chain.append(WhisperBackend())
+    return FallbackBackend(chain) if len(chain) > 1 else chain[0]
+
+
+class _ReplayStream:
+    def __init__(self, owner):
+        self._owner = owner
+
+    def read(self, size):
+        return self._owner._read(size)
+
+    def close(self):
+        pass
+
+
+class ReplaySource(sr.AudioSource):
+    """A fake microphone that plays a list of WAV files back to back.
+
+    Playback starts with `gap` seconds of silence (room for ambient-noise
+    calibration) and every file is followed by another gap. A sidecar .txt
+    next to a WAV holds its transcript for ReplayBackend. With realtime=True
+    reads are paced like a live device. `exhausted` is set once everything
+    has been read, after which only silence is returned.
+    """
+
+    def __init__(self, paths, sample_rate=16000, gap=1.0, chunk_size=1024, realtime=False):
+        from nova.audio import read_wav
+        import numpy as np
+
+        self.SAMPLE_RATE = sample_rate
+        self.SAMPLE_WIDTH = 2
+        self.CHUNK = chunk_size
+        self.realtime = realtime
+        self.stream = None
+        self.exhausted = threading.Event()
+        self.segments = []   # (start_byte, end_byte, transcript, path)
+
+        silence = np.zeros(int(gap * sample_rate), dtype="<i2").tobytes()
+        parts = [silence]
+        offset = len(silence)
+        for path in paths:
+            samples, rate = read_wav(path)
+            if rate != sample_rate and len(samples):
+                n = int(round(len(samples) * sample_rate / rate))
+                samples = np.interp(np.linspace(0, len(samples) - 1, n), np.arange(len(samples)), samples)
+            pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2").tobytes()
+            transcript = None
+            sidecar = os.path.splitext(path)[0] + ".txt"
+            if os.path.exists(sidecar):
+                with open(sidecar, "r", encoding="utf-8") as f:
+                    transcript = f.read().strip()
+            parts.append(pcm)
+            self.segments.append((offset, offset + len(pcm), transcript, path))
+            offset += len(pcm)
+            parts.append(silence)
+            offset += len(silence)
+        self._data = b"".join(parts)
+        self._pos = 0
+        self._started = None
+
+    @classmethod
+    def from_directory(cls, directory, **kwargs):
+        paths = sorted(
+            os.path.join(directory, f) for f in os.listdir(directory)
+            if f.lower().endswith(".wav")
+        )
+        return cls(paths, **kwargs)
+
+    @property
+    def position(self):
+        return self._pos
+
+    @property
+    def total_bytes(self):
+        return len(self._data)
+
+    def __enter__(self):
+        self.stream = _ReplayStream(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stream = None
+
+    def _read(self, size):
+        nbytes = size * self.SAMPLE_WIDTH
+        if self.realtime:
+            due = self._started + self._pos / (self.SAMPLE_RATE * self.SAMPLE_WIDTH)
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        if self._pos >= len(self._data):
+            self.exhausted.set()
+            return b"\x00" * nbytes
+        chunk = self._data[self._pos:self._pos + nbytes]
+        self._pos += len(chunk)
+        if len(chunk) < nbytes:
+            chunk += b"\x00" * (nbytes - len(chunk))
+        return chunk
+
+    def transcript_for(self, end, length):
+        """Transcript of the segment that best overlaps bytes [end - length, end)."""
+        start = end - length
+        best, best_overlap = None, 0
+        for seg_start, seg_end, transcript, _ in self.segments:
+            overlap = min(end, seg_end) - max(start, seg_start)
+            if overlap > best_overlap:
+                best, best_overlap = transcript, overlap
+        return best
+
+
+class ReplayBackend(RecognizerBackend):
+    """Returns the sidecar transcript of whatever ReplaySource just played.
+
+    `cursor` is whatever the recognizer reads through (the ReplaySource
+    itself, or a ring-buffer reader over it); its position marks the end of
+    the audio being recognised.
+    """
+
+    name = "replay"
+
+    def __init__(self, source, cursor=None):
+        super().__init__()
+        self.source = source
+        self.cursor = cursor or source
+
+    def recognize(self, recognizer, audio):
+        text = self.source.transcript_for(self.cursor.position, len(audio.frame_data))
+        if not text:
+            raise sr.UnknownValueError()
+        return text
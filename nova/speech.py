@@ -0,0 +1,221 @@
+"""Text-to-speech worker.
+
+One long-lived thread owns a single pyttsx3 engine. The voice is resolved
+once when the engine is created and utterances are fed through a priority
+queue, so speaking no longer pays for pyttsx3.init(), voice enumeration and
+a COM init/uninit cycle on every sentence.
+"""
+import itertools
+import queue
+import threading
+import time
+
+
+PRIORITY_HIGH = 0      # Wake acknowledgements, barge-in replies
+PRIORITY_NORMAL = 10   # Everything else
+
+_STOP = -1
+
+
+def create_engine(rate=165, voice_hints=("zira", "female"), driver_name=None):
+    """Create a pyttsx3 engine with the preferred voice already selected."""
+    import pyttsx3
+
+    engine = pyttsx3.init(driver_name) if driver_name else pyttsx3.init()
+    engine.setProperty("rate", rate)
+    try:
+        voices = engine.getProperty("voices") or []
+    except Exception:
+        voices = []
+    for v in voices:
+        name = (getattr(v, "name", "") or "").lower()
+        if any(hint in name for hint in voice_hints):
+            engine.setProperty("voice", v.id)
+            break
+    return engine
+
+
+class Utterance:
+    """A queued piece of speech. `done` is set once it finished or was dropped."""
+
+    __slots__ = ("text", "priority", "generation", "enqueued_at", "started_at",
+                 "finished_at", "cancelled", "done")
+
+    def __init__(self, text, priority, generation):
+        self.text = text
+        self.priority = priority
+        self.generation = generation
+        self.enqueued_at = time.perf_counter()
+        self.started_at = None
+        self.finished_at = None
+        self.cancelled = False
+        self.done = threading.Event()
+
+    @property
+    def latency(self):
+        """Seconds from enqueue to first audio, or None if it never started."""
+        if self.started_at is None:
+            return None
+        return self.started_at - self.enqueued_at
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+
+class SpeechWorker:
+    """Serialises all speech through one warm engine on a dedicated thread.
+
+    `engine_factory` is any callable returning an object with the pyttsx3
+    engine surface (say, runAndWait, stop, connect). Pass
+    ``lambda: create_engine(driver_name="espeak")`` or a fake engine to run
+    it on Linux or headless.
+    """
+
+    def __init__(self, engine_factory=None):
+        self._engine_factory = engine_factory or create_engine
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._current = None
+        self._engine = None
+        self._thread = None
+        self._ready = threading.Event()
+
+        self._latency_count = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._latency_last = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="nova-tts", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        """Drop pending speech and shut the worker thread down."""
+        self.cancel()
+        self._queue.put((_STOP, next(self._seq), None))
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wait_ready(self, timeout=None):
+        """Block until the engine has been created (or failed to)."""
+        return self._ready.wait(timeout)
+
+    @property
+    def engine(self):
+        return self._engine
+
+    def say(self, text, priority=PRIORITY_NORMAL, interrupt=False, wait=False, timeout=None):
+        """Queue `text` and return its Utterance.
+
+        interrupt -- cancel whatever is speaking or pending first (barge-in)
+        wait      -- block until the utterance has been spoken or dropped
+        """
+        if interrupt:
+            self.cancel()
+        with self._lock:
+            utt = Utterance(text, priority, self._generation)
+        self._queue.put((priority, next(self._seq), utt))
+        if wait:
+            utt.wait(timeout)
+        return utt
+
+    def cancel(self):
+        """Barge-in: discard every queued utterance and cut off the current one."""
+        with self._lock:
+            self._generation += 1
+            current = self._current
+            if current is not None:
+                current.cancelled = True
+        if current is not None and self._engine is not None:
+            try:
+                self._engine.stop()
+            except Exception:
+                pass
+
+    def latency_stats(self):
+        """Enqueue-to-first-audio latency over everything spoken so far."""
+        count = self._latency_count
+        return {
+            "count": count,
+            "last": self._latency_last,
+            "avg": (self._latency_total / count) if count else None,
+            "max": self._latency_max if count else None,
+        }
+
+    def _on_started(self, name=None):
+        utt = self._current
+        if utt is not None and utt.started_at is None:
+            utt.started_at = time.perf_counter()
+
+    def _record_latency(self, latency):
+        self._latency_count += 1
+        self._latency_total += latency
+        self._latency_last = latency
+        if latency > self._latency_max:
+            self._latency_max = latency
+
+    def _run(self):
+        # Imported here so loading this module stays cheap at startup
+        try:
+            import pythoncom
+        except ImportError:
+            pythoncom = None
+        if pythoncom:
+            pythoncom.CoInitialize()
+        try:
+            try:
+                self._engine = self._engine_factory()
+                try:
+                    self._engine.connect("started-utterance", self._on_started)
+                except Exception:
+                    pass
+            except Exception as e:
+                print(f"[Nova] TTS engine unavailable: {e}")
+                self._engine = None
+            self._ready.set()
+
+            while True:
+                priority, _, utt = self._queue.get()
+                if priority == _STOP:
+                    break
+
+                begin = time.perf_counter()
+                with self._lock:
+                    # say() only queues the text, so it goes in under the lock:
+                    # a cancel() either lands first and the utterance is
+                    # stale, or lands after and its stop() clears it
+                    stale = utt.generation < self._generation or self._engine is None
+                    if not stale:
+                        self._current = utt
+                        try:
+                            self._engine.say(utt.text)
+                        except Exception as e:
+                            print(f"[Nova] TTS error: {e}")
+                if stale:
+                    utt.cancelled = True
+                    utt.done.set()
+                    continue
+
+                try:
+                    self._engine.runAndWait()
+                except Exception as e:
+                    print(f"[Nova] TTS error: {e}")
+
+                with self._lock:
+                    self._current = None
+                utt.finished_at = time.perf_counter()
+                if utt.started_at is None and not utt.cancelled:
+                    # Driver without start callbacks: assume audio began on say().
+                    utt.started_at = begin
+                if utt.latency is not None:
+                    self._record_latency(utt.latency)
+                utt.done.set()
+        finally:
+            self._ready.set()
+            if pythoncom:
+                pythoncom.CoUninitialize()
@@ -0,0 +1,308 @@
+"""Crash-safe JSON persistence for commands and settings.
+
+Every change is appended to a journal next to the JSON file
+(`nova_commands.json.journal`), one JSON line per set, delete or batch, and flushed
+to the OS before the call returns. The full file is rewritten at most once
+per `delay` seconds (or after `compact_every` journal lines) through a temp
+file and os.replace(), and the journal is then emptied. A crash at any
+point leaves either the old or the new file intact, and replaying the
+journal over it on the next load restores every acknowledged change. A torn
+last journal line is ignored.
+
+A file that fails to parse or validate is moved aside to `<name>.corrupt`
+and the store starts from the `.bak` copy kept at each compaction, or from
+the defaults.
+"""
+import json
+import os
+import shutil
+import threading
+
+_OPS = ("set", "del", "batch")
+
+
+def user_data_dir():
+    """%APPDATA%\\NOVA (or ~/NOVA), created if missing. Survives EXE updates."""
+    appdata = os.environ.get("APPDATA", os.path.expanduser("~"))
+    path = os.path.join(appdata, "NOVA")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def atomic_write_json(path, data, indent=None, fsync=False):
+    """Write `data` to `path` through a temp file and os.replace()."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=indent)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def validate_commands(data):
+    """Custom commands: a dict of trigger phrase -> URL or path."""
+    if not isinstance(data, dict):
+        raise ValueError("commands must be a JSON object")
+    return {
+        k.strip().lower(): v.strip()
+        for k, v in data.items()
+        if isinstance(k, str) and isinstance(v, str) and k.strip() and v.strip()
+    }
+
+
+def wake_word_list(value):
+    """A wake_words setting as a list of words. A single string is one
+    word, not a list of letters; anything else that isn't text is dropped."""
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, (list, tuple)):
+        return []
+    return [w.strip() for w in value if isinstance(w, str) and w.strip()]
+
+
+def validate_settings(data):
+    if not isinstance(data, dict):
+        raise ValueError("settings must be a JSON object")
+    if "wake_words" in data:
+        data = dict(data, wake_words=wake_word_list(data["wake_words"]))
+    return data
+
+
+class JsonStore:
+    """A JSON object on disk with journaled, coalesced writes.
+
+    path          -- the JSON file
+    defaults      -- contents when nothing usable is on disk
+    validate      -- callable(data) -> cleaned dict, raising ValueError if unusable
+    legacy_paths  -- older files to migrate from when `path` doesn't exist yet
+    delay         -- seconds to wait after a change before compacting
+    compact_every -- journal lines that force a compaction right away
+    """
+
+    def __init__(self, path, defaults=None, validate=None, legacy_paths=(),
+                 delay=2.0, compact_every=200, indent=4):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.backup_path = path + ".bak"
+        self.defaults = dict(defaults or {})
+        self.validate = validate or (lambda data: data)
+        self.legacy_paths = list(legacy_paths)
+        self.delay = delay
+        self.compact_every = compact_every
+        self.indent = indent
+        self.data = dict(self.defaults)
+        self._lock = threading.RLock()
+        self._journal = None
+        self._pending = 0            # journal lines since the last compaction
+        self._timer = None
+        self.appends = 0
+        self.compactions = 0
+        self.recovered = []          # what load() had to repair, for logging
+
+    # -- loading -------------------------------------------------------------
+
+    def _read(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return self.validate(json.load(f))
+
+    def _quarantine(self, path, error):
+        try:
+            os.replace(path, path + ".corrupt")
+        except OSError:
+            pass
+        self.recovered.append(f"{os.path.basename(path)}: {error}")
+
+    def _replay(self):
+        """Apply journal lines to self.data. Returns how many were applied."""
+        applied = 0
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return 0
+        for i, line in enumerate(lines):
+            try:
+                entry = json.loads(line)
+                op = entry["op"]
+                if op not in _OPS:
+                    raise ValueError(op)
+                if op == "batch":
+                    sets, deletes = dict(entry["set"]), list(entry["del"])
+                else:
+                    key = entry["key"]
+            except (ValueError, KeyError, TypeError):
+                # A crash mid-append tears the last line. Recording it makes
+                # load() compact, so the next append starts on a fresh line.
+                if i == len(lines) - 1:
+                    self.recovered.append("ignored torn last journal line")
+                else:
+                    self.recovered.append(f"journal line {i + 1} unreadable")
+                continue
+            if op == "set":
+                self.data[key] = entry["value"]
+            elif op == "del":
+                self.data.pop(key, None)
+            else:
+                for key in deletes:
+                    self.data.pop(key, None)
+                self.data.update(sets)
+            applied += 1
+        return applied
+
+    def load(self):
+        """Read the file and journal, migrating or recovering as needed. Returns the data."""
+        with self._lock:
+            self.recovered = []
+            data = None
+            if os.path.exists(self.path):
+                try:
+                    data = self._read(self.path)
+                except (OSError, ValueError) as e:
+                    self._quarantine(self.path, e)
+                    try:
+                        data = self._read(self.backup_path)
+                        self.recovered.append("restored from backup")
+                    except (OSError, ValueError):
+                        data = None
+            elif not os.path.exists(self.journal_path):
+                data = self._migrate()
+
+            self.data = dict(self.defaults)
+            if data is not None:
+                self.data.update(data)
+            replayed = self._replay()
+            try:
+                self.data = self.validate(self.data)
+            except ValueError as e:
+                self.recovered.append(f"journal produced invalid data: {e}")
+                self.data = dict(self.defaults)
+            if replayed or self.recovered or not os.path.exists(self.path):
+                self._compact()
+            return self.data
+
+    def _migrate(self):
+        for legacy in self.legacy_paths:
+            if not os.path.exists(legacy):
+                continue
+            try:
+                data = self._read(legacy)
+            except (OSError, ValueError):
+                continue
+            self.recovered.append(f"migrated from {legacy}")
+            return data
+        return None
+
+    # -- changes -------------------------------------------------------------
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def set(self, key, value):
+        with self._lock:
+            if key in self.data and self.data[key] == value:
+                return
+            self.data[key] = value
+            self._append({"op": "set", "key": key, "value": value})
+
+    def delete(self, key):
+        with self._lock:
+            if key not in self.data:
+                return
+            del self.data[key]
+            self._append({"op": "del", "key": key})
+
+    def update(self, mapping):
+        with self._lock:
+            for key, value in mapping.items():
+                self.set(key, value)
+
+    def replace(self, mapping):
+        """Make the stored data equal `mapping`, journaling only the differences."""
+        with self._lock:
+            deletes = [k for k in self.data if k not in mapping]
+            sets = {k: v for k, v in mapping.items() if k not in self.data or self.data[k] != v}
+            if len(deletes) + len(sets) > 1:
+                self.apply(sets, deletes)
+                return
+            for key in deletes:
+                self.delete(key)
+            self.update(sets)
+
+    def apply(self, sets, deletes=()):
+        """Apply many changes as one journal line: after a crash, all or none of them survive."""
+        with self._lock:
+            deletes = [k for k in deletes if k in self.data]
+            if not sets and not deletes:
+                return
+            for key in deletes:
+                del self.data[key]
+            self.data.update(sets)
+            self._append({"op": "batch", "set": dict(sets), "del": deletes})
+
+    def _append(self, entry):
+        # Caller holds self._lock
+        try:
+            if self._journal is None:
+                self._journal = open(self.journal_path, "a", encoding="utf-8")
+            self._journal.write(json.dumps(entry) + "\n")
+            self._journal.flush()
+        except OSError as e:
+            print(f"[Nova] Could not journal change to {self.path}: {e}")
+            self._journal = None
+        self.appends += 1
+        self._pending += 1
+        if self._pending >= self.compact_every:
+            self._compact()
+        else:
+            self._schedule()
+
+    # -- compaction ----------------------------------------------------------
+
+    def _schedule(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Write the full file now and empty the journal."""
+        with self._lock:
+            if self._pending or not os.path.exists(self.path):
+                self._compact()
+
+    def _compact(self):
+        # Caller holds self._lock
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        try:
+            if os.path.exists(self.path):
+                # Copy, not move: the old file has to stay in place until
+                # the new one replaces it
+                shutil.copyfile(self.path, self.backup_path + ".tmp")
+                os.replace(self.backup_path + ".tmp", self.backup_path)
+            atomic_write_json(self.path, self.data, indent=self.indent, fsync=True)
+            # Only now is it safe to drop the journal: a crash before this
+            # line replays it over the new file, which changes nothing.
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            with open(self.journal_path, "w", encoding="utf-8"):
+                pass
+        except OSError as e:
+            print(f"[Nova] Could not save {self.path}: {e}")
+            return
+        self._pending = 0
+        self.compactions += 1
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def stats(self):
+        return {"appends": self.appends, "compactions": self.compactions, "pending": self._pending}
@@ -0,0 +1,80 @@
+"""Thread-safe, coalescing channel from background threads to Tk widgets.
+
+Tkinter must only be touched from the thread running mainloop. Background
+threads therefore post widget changes to a UiBus. The Tk thread calls
+apply() once per frame (from after()) and configures the widgets in one
+batch. Posts to the same widget between two frames merge, so the latest
+value of each option wins. Changes that match what the widget already shows
+are dropped. The bus holds only names and option dicts, so it works
+without a display.
+"""
+import threading
+
+_MISSING = object()
+
+
+class UiBus:
+    """Pending widget updates keyed by widget name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}       # name -> {option: value}, in order of last post
+        self.state = {}          # name -> options as last applied
+        self.posted = 0
+        self.coalesced = 0
+        self.skipped = 0
+        self.applied = 0
+        self.batches = 0
+
+    def post(self, name, **options):
+        """Queue `options` for widget `name`. Safe from any thread."""
+        with self._lock:
+            self.posted += 1
+            pending = self._pending.pop(name, None)
+            if pending is None:
+                pending = {}
+            else:
+                self.coalesced += 1
+            pending.update(options)
+            self._pending[name] = pending
+
+    def drain(self):
+        """Take the pending updates as [(name, changed options)].
+
+        Options equal to the last applied value are left out, and widgets
+        with nothing left to change are skipped entirely.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        updates = []
+        for name, options in pending.items():
+            current = self.state.setdefault(name, {})
+            changed = {k: v for k, v in options.items() if current.get(k, _MISSING) != v}
+            if not changed:
+                self.skipped += 1
+                continue
+            current.update(changed)
+            updates.append((name, changed))
+        return updates
+
+    def apply(self, configure):
+        """Drain and hand each update to configure(name, options). Tk thread only."""
+        updates = self.drain()
+        if updates:
+            self.batches += 1
+        for name, options in updates:
+            try:
+                configure(name, options)
+                self.applied += 1
+            except Exception as e:
+                print(f"[Nova] UI update for {name} failed: {e}")
+        return len(updates)
+
+    def stats(self):
+        return {
+            "posted": self.posted,
+            "coalesced": self.coalesced,
+            "skipped": self.skipped,
+            "applied": self.applied,
+            "batches": self.batches,
+        }
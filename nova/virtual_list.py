@@ -0,0 +1,139 @@
+"""Virtualized list for the command library.
+
+The Settings window used to destroy every card and rebuild all of them
+(a frame, labels, two buttons and new fonts per command) after every add,
+edit or delete. VirtualList only creates row widgets for the rows in view.
+Rows that scroll out of view are reused for the rows that scroll in, and
+changes to the item list are applied as a diff: rows whose item is still
+visible just move, and only new or edited items are rebound.
+
+Row widgets are reached through four callbacks, so the list can run headless
+and be benchmarked with fakes:
+
+    create()          -> a new row widget
+    bind(row, key)    fill the row for `key`
+    place(row, y)     show the row at pixel offset y in the viewport
+    hide(row)         take the row out of view
+"""
+
+
+def filter_commands(commands, query=""):
+    """Command names matching `query` in the name or target, sorted."""
+    query = query.strip().lower()
+    if not query:
+        return sorted(commands)
+    return sorted(
+        name for name, link in commands.items()
+        if query in name.lower() or query in link.lower()
+    )
+
+
+class VirtualList:
+    """Rows for a window of `items`, recycled as the window moves.
+
+    row_height -- fixed pixel height of one row, spacing included
+    overscan   -- extra rows realised above and below the viewport
+    """
+
+    def __init__(self, create, bind, place, hide, row_height=72, overscan=2):
+        self._create = create
+        self._bind = bind
+        self._place = place
+        self._hide = hide
+        self.row_height = row_height
+        self.overscan = overscan
+        self.items = []
+        self.offset = 0             # pixels scrolled from the top
+        self.height = 0             # viewport height in pixels
+        self._rows = {}             # key -> row bound to it and in view
+        self._free = []             # rows not in view, ready for reuse
+        self.created = 0
+        self.bound = 0
+
+    @property
+    def content_height(self):
+        return len(self.items) * self.row_height
+
+    @property
+    def max_offset(self):
+        return max(0, self.content_height - self.height)
+
+    def visible_range(self):
+        """(first, last) item indexes realised for the current scroll position."""
+        if not self.items or self.height <= 0:
+            return 0, 0
+        first = max(0, self.offset // self.row_height - self.overscan)
+        last = min(len(self.items), -(-(self.offset + self.height) // self.row_height) + self.overscan)
+        return first, last
+
+    def fraction(self):
+        """(top, bottom) of the viewport as fractions of the content, for a scrollbar."""
+        total = self.content_height
+        if total <= self.height or total == 0:
+            return 0.0, 1.0
+        return self.offset / total, (self.offset + self.height) / total
+
+    def set_items(self, items, changed=()):
+        """Replace the item list. Keys in `changed` are rebound even if in view."""
+        self.items = list(items)
+        for key in changed:
+            row = self._rows.pop(key, None)
+            if row is not None:
+                self._hide(row)
+                self._free.append(row)
+        self.offset = min(self.offset, self.max_offset)
+        self.layout()
+
+    def refresh(self, key):
+        """Rebind the row showing `key`, if it is in view."""
+        row = self._rows.get(key)
+        if row is not None:
+            self._bind(row, key)
+            self.bound += 1
+
+    def resize(self, height):
+        if height != self.height:
+            self.height = height
+            self.offset = min(self.offset, self.max_offset)
+            self.layout()
+
+    def scroll_to(self, offset):
+        offset = int(max(0, min(offset, self.max_offset)))
+        if offset != self.offset:
+            self.offset = offset
+            self.layout()
+
+    def scroll_by(self, pixels):
+        self.scroll_to(self.offset + pixels)
+
+    def scroll_to_fraction(self, fraction):
+        self.scroll_to(fraction * self.content_height)
+
+    def layout(self):
+        first, last = self.visible_range()
+        wanted = self.items[first:last]
+        keep = set(wanted)
+        for key in [k for k in self._rows if k not in keep]:
+            row = self._rows.pop(key)
+            self._hide(row)
+            self._free.append(row)
+        for i, key in enumerate(wanted, first):
+            row = self._rows.get(key)
+            if row is None:
+                if self._free:
+                    row = self._free.pop()
+                else:
+                    row = self._create()
+                    self.created += 1
+                self._bind(row, key)
+                self.bound += 1
+                self._rows[key] = row
+            self._place(row, i * self.row_height - self.offset)
+
+    def stats(self):
+        return {
+            "items": len(self.items),
+            "rows": self.created,
+            "in_view": len(self._rows),
+            "binds": self.bound,
+        }
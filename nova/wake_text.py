@@ -0,0 +1,122 @@
+"""Wake-word parsing for recognised transcripts.
+
+WakeWordMatcher does more than say yes or no: it returns where the wake word
+sits and whatever was said after it, so "nova open spotify" can go straight
+to the command handler without a second listen.
+
+Known mishearings are compiled into one regex with word boundaries. Any
+other token is compared by phonetic key plus an edit-distance check, and the
+verdict per token is cached, so a long phrase costs one regex scan and a
+few dict lookups.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from nova.matching import similarity
+
+# Ways speech recognition tends to spell "nova". Deliberately no common
+# English words ("over", "now a"): those woke NOVA up mid-conversation.
+NOVA_ALIASES = [
+    "nova", "noah", "nora", "novah", "nover", "novar",
+    "know va", "no va", "now va", "nor va",
+    "no ah", "noaa", "novaa", "novas", "novo", "nava", "neva",
+    "norva", "nova's", "knova", "gnova",
+]
+
+WakeMatch = namedtuple("WakeMatch", "start end residual")
+
+_TOKEN = re.compile(r"[a-z']+")
+_LEADING_JUNK = re.compile(r"^[\s,.!?;:'\-]+")
+
+_CODES = {}
+for _letters, _code in (("bfpv", "F"), ("cgjkqsxz", "K"), ("dt", "T"),
+                        ("l", "L"), ("mn", "N"), ("r", "R")):
+    for _ch in _letters:
+        _CODES[_ch] = _code
+_VOWELS = set("aeiouyhw")
+
+
+def phonetic_key(word):
+    """Soundex-style key tuned for short spoken names.
+
+    Silent leading letters are dropped (knova, gnova). b/v/f/p share a class
+    (noba, nova), vowels and h/w/y vanish, and a final vowel+r is dropped
+    so non-rhotic "nover" keys like "nova". A leading vowel is kept as "A",
+    which keeps "over" well away from "nova".
+    """
+    w = "".join(ch for ch in word.lower() if "a" <= ch <= "z")
+    if not w:
+        return ""
+    if w[:2] in ("kn", "gn", "pn", "wr"):
+        w = w[1:]
+    if len(w) > 2 and w.endswith("r") and w[-2] in "aeiou":
+        w = w[:-1]
+    key = "A" if w[0] in "aeiou" else _CODES.get(w[0], w[0].upper())
+    last = key
+    for ch in w[1:]:
+        code = _CODES.get(ch)
+        if code is None:
+            if ch in _VOWELS:
+                last = None
+            continue
+        if code != last:
+            key += code
+        last = code
+    return key
+
+
+class WakeWordMatcher:
+    """Finds the wake word in a transcript.
+
+    wake_words -- the words to wake on (configurable, default "nova")
+    aliases    -- extra literal spellings; NOVA_ALIASES when waking on "nova"
+    min_ratio  -- edit-distance similarity a phonetic match must also reach
+    """
+
+    def __init__(self, wake_words=("nova",), aliases=None, min_ratio=0.6):
+        if isinstance(wake_words, str):
+            wake_words = [wake_words]
+        self.wake_words = [w.lower().strip() for w in wake_words if isinstance(w, str) and w.strip()]
+        if aliases is None:
+            aliases = NOVA_ALIASES if "nova" in self.wake_words else []
+        spellings = sorted(set(self.wake_words) | {a.lower() for a in aliases}, key=len, reverse=True)
+        self._literal = re.compile(
+            r"(?<![a-z])(?:" + "|".join(re.escape(s) for s in spellings) + r")(?![a-z])"
+        ) if spellings else None
+        self._keys = {phonetic_key(w): w for w in self.wake_words}
+        self.min_ratio = min_ratio
+        self._token_hit = lru_cache(maxsize=4096)(self._token_hit_uncached)
+
+    def _token_hit_uncached(self, token):
+        w = token.replace("'", "")
+        wake = self._keys.get(phonetic_key(w))
+        return wake is not None and similarity(w, wake) >= self.min_ratio
+
+    def parse(self, heard_text):
+        """WakeMatch(start, end, residual) for the earliest wake span, or None."""
+        heard = heard_text.lower().strip()
+        literal = self._literal.search(heard) if self._literal else None
+        limit = literal.start() if literal else len(heard)
+        for token in _TOKEN.finditer(heard, 0, limit):
+            if self._token_hit(token.group()):
+                return WakeMatch(token.start(), token.end(), _residual(heard, token.end()))
+        if literal:
+            return WakeMatch(literal.start(), literal.end(), _residual(heard, literal.end()))
+        return None
+
+    def __call__(self, heard_text):
+        return self.parse(heard_text)
+
+
+def _residual(heard, end):
+    """Text after the wake span, minus separators like "nova, open ..."."""
+    return _LEADING_JUNK.sub("", heard[end:]).strip()
+
+
+_default = WakeWordMatcher()
+
+
+def parse_wake_phrase(heard_text):
+    """parse() with the default "nova" matcher."""
+    return _default.parse(heard_text)
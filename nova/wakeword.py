@@ -0,0 +1,284 @@
+"""Offline, frame-streaming wake-word spotter.
+
+Microphone chunks are turned into MFCC frames as they arrive and compared
+against a few enrolled recordings of the wake word using subsequence DTW.
+Nothing leaves the machine, and the full recognizer is only called after
+a hit.
+
+Enroll templates (three or more takes work best):
+    python -m nova.wakeword enroll <out_dir> [--count 4]
+"""
+import os
+
+import numpy as np
+
+from nova.audio import pcm_to_float, read_wav
+
+DEFAULT_SAMPLE_RATE = 16000
+
+
+def _hz_to_mel(hz):
+    return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+
+def _mel_to_hz(mel):
+    return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+
+def mel_filterbank(n_mels, n_fft, sample_rate, fmin=60.0, fmax=7600.0):
+    fmax = min(fmax, sample_rate / 2.0)
+    mels = np.linspace(_hz_to_mel(fmin), _hz_to_mel(fmax), n_mels + 2)
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    hz = _mel_to_hz(mels)
+    bank = np.zeros((n_mels, len(bins)), dtype=np.float32)
+    for m in range(n_mels):
+        lo, mid, hi = hz[m], hz[m + 1], hz[m + 2]
+        rising = (bins - lo) / (mid - lo)
+        falling = (hi - bins) / (hi - mid)
+        bank[m] = np.maximum(0.0, np.minimum(rising, falling))
+    return bank
+
+
+def dct_matrix(n_out, n_in):
+    """Orthonormal DCT-II as a matrix."""
+    k = np.arange(n_out)[:, None]
+    n = np.arange(n_in)[None, :]
+    mat = np.cos(np.pi * k * (2 * n + 1) / (2 * n_in)) * np.sqrt(2.0 / n_in)
+    mat[0] /= np.sqrt(2.0)
+    return mat.astype(np.float32)
+
+
+class MfccExtractor:
+    """Streaming MFCC front end. Frame sizes are in milliseconds and the mel
+    range is fixed, so features from different sample rates are comparable."""
+
+    def __init__(self, sample_rate=DEFAULT_SAMPLE_RATE, frame_ms=25, hop_ms=10,
+                 n_mels=26, n_mfcc=13, preemphasis=0.97):
+        self.sample_rate = sample_rate
+        self.frame_len = int(sample_rate * frame_ms / 1000)
+        self.hop = int(sample_rate * hop_ms / 1000)
+        self.n_fft = 1 << (self.frame_len - 1).bit_length()
+        self.preemphasis = preemphasis
+        self._window = np.hamming(self.frame_len).astype(np.float32)
+        self._bank = mel_filterbank(n_mels, self.n_fft, sample_rate)
+        self._dct = dct_matrix(n_mfcc, n_mels)
+        self.reset()
+
+    def reset(self):
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._last = 0.0
+
+    def process(self, samples):
+        """Feed float samples; returns (mfcc[n, n_mfcc - 1], log_energy[n])."""
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.size:
+            emphasized = np.empty_like(samples)
+            emphasized[0] = samples[0] - self.preemphasis * self._last
+            emphasized[1:] = samples[1:] - self.preemphasis * samples[:-1]
+            self._last = float(samples[-1])
+            buf = np.concatenate((self._pending, emphasized))
+        else:
+            buf = self._pending
+
+        if buf.size < self.frame_len:
+            self._pending = buf
+            return np.zeros((0, self._dct.shape[0] - 1), np.float32), np.zeros(0, np.float32)
+
+        n_frames = 1 + (buf.size - self.frame_len) // self.hop
+        frames = np.lib.stride_tricks.sliding_window_view(buf, self.frame_len)[::self.hop][:n_frames]
+        self._pending = buf[n_frames * self.hop:].copy()
+
+        power = np.abs(np.fft.rfft(frames * self._window, self.n_fft)) ** 2
+        energy = np.log(power.sum(axis=1) + 1e-10).astype(np.float32)
+        mel = np.log(power @ self._bank.T + 1e-10)
+        mfcc = (mel @ self._dct.T).astype(np.float32)
+        return mfcc[:, 1:], energy
+
+
+def features_from_samples(samples, sample_rate, trim_db=30.0):
+    """MFCCs of a whole recording, trimmed to the voiced part and mean-normalised."""
+    mfcc, energy = MfccExtractor(sample_rate).process(samples)
+    if not len(energy):
+        return mfcc
+    voiced = np.nonzero(energy > energy.max() - trim_db / 4.34)[0]
+    mfcc = mfcc[voiced[0]:voiced[-1] + 1]
+    return mfcc - mfcc.mean(axis=0)
+
+
+def subsequence_dtw(template, query):
+    """Best alignment cost of `template` anywhere inside `query`, per template frame.
+
+    Steps advance the template by one frame and the query by 0, 1 or 2,
+    which keeps every row a pure vector operation.
+    """
+    cost = np.sqrt(((template[:, None, :] - query[None, :, :]) ** 2).sum(axis=2))
+    inf = np.float32(np.inf)
+    acc = cost[0].copy()
+    for i in range(1, len(template)):
+        shifted1 = np.concatenate(([inf], acc[:-1]))
+        shifted2 = np.concatenate(([inf, inf], acc[:-2]))
+        acc = cost[i] + np.minimum(acc, np.minimum(shifted1, shifted2))
+    return float(acc.min()) / len(template)
+
+
+class KeywordSpotter:
+    """Streaming detector: feed() raw PCM chunks and it returns True on a hit.
+
+    templates -- list of MFCC arrays from features_from_samples()
+    threshold -- DTW cost below which a window counts as the wake word;
+                 calibrated from the templates when not given
+    """
+
+    def __init__(self, templates, threshold=None, sample_rate=DEFAULT_SAMPLE_RATE,
+                 step_ms=50, speech_margin=2.5, cooldown_ms=1000, trim_db=30.0):
+        if not templates:
+            raise ValueError("KeywordSpotter needs at least one template")
+        self.templates = [np.asarray(t, dtype=np.float32) for t in templates]
+        self.threshold = threshold if threshold is not None else self.calibrate(self.templates)
+        self.sample_rate = sample_rate
+        self.extractor = MfccExtractor(sample_rate)
+        hop_ms = 1000.0 * self.extractor.hop / sample_rate
+        self.step_frames = max(1, int(step_ms / hop_ms))
+        self.cooldown_frames = int(cooldown_ms / hop_ms)
+        self.speech_margin = speech_margin
+        self.trim_db = trim_db
+        longest = max(len(t) for t in self.templates)
+        self.window = int(longest * 1.6) + 2
+        self.reset()
+
+        self.frames_seen = 0
+        self.comparisons = 0
+        self.hits = 0
+        self.last_score = None
+
+    @classmethod
+    def from_wav_files(cls, paths, **kwargs):
+        templates = []
+        for path in paths:
+            samples, rate = read_wav(path)
+            feats = features_from_samples(samples, rate)
+            if len(feats) >= 5:
+                templates.append(feats)
+        return cls(templates, **kwargs)
+
+    @classmethod
+    def from_directory(cls, directory, **kwargs):
+        """Build from every .wav in `directory`, or return None if there are none."""
+        if not directory or not os.path.isdir(directory):
+            return None
+        paths = sorted(
+            os.path.join(directory, f) for f in os.listdir(directory)
+            if f.lower().endswith(".wav")
+        )
+        if not paths:
+            return None
+        try:
+            return cls.from_wav_files(paths, **kwargs)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def calibrate(templates, margin=1.6, fallback=6.0):
+        """Threshold from how far the enrolled takes are from each other."""
+        if len(templates) < 2:
+            return fallback
+        costs = []
+        for i, a in enumerate(templates):
+            for j, b in enumerate(templates):
+                if i != j:
+                    costs.append(subsequence_dtw(a, np.pad(b, ((2, 2), (0, 0)), mode="edge")))
+        return float(max(costs)) * margin
+
+    def reset(self):
+        self.extractor.reset()
+        dims = self.templates[0].shape[1]
+        self._mfcc = np.zeros((0, dims), dtype=np.float32)
+        self._energy = np.zeros(0, dtype=np.float32)
+        self._noise_floor = None
+        self._since_check = 0
+        self._cooldown = 0
+
+    def _track_noise(self, energy):
+        for e in energy:
+            if self._noise_floor is None or e < self._noise_floor:
+                self._noise_floor = float(e)
+            else:
+                self._noise_floor += 0.002 * (float(e) - self._noise_floor)
+
+    def score(self, mfcc, energy):
+        """Lowest template cost for a window of MFCC frames.
+
+        The window is trimmed and mean-normalised exactly like the templates
+        were, so both sides see the same channel compensation.
+        """
+        voiced = np.nonzero(energy > energy.max() - self.trim_db / 4.34)[0]
+        window = mfcc[max(0, voiced[0] - 2):voiced[-1] + 3]
+        core = mfcc[voiced[0]:voiced[-1] + 1]
+        window = window - core.mean(axis=0)
+        return min(subsequence_dtw(t, window) for t in self.templates)
+
+    def feed(self, data, sample_width=2):
+        """Feed raw PCM bytes (or float samples). Returns True if the wake word was heard."""
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            samples = pcm_to_float(data, sample_width)
+        else:
+            samples = data
+        mfcc, energy = self.extractor.process(samples)
+        if not len(energy):
+            return False
+
+        self.frames_seen += len(energy)
+        self._track_noise(energy)
+        self._mfcc = np.concatenate((self._mfcc, mfcc))[-self.window:]
+        self._energy = np.concatenate((self._energy, energy))[-self.window:]
+
+        if self._cooldown:
+            self._cooldown = max(0, self._cooldown - len(energy))
+            return False
+        self._since_check += len(energy)
+        if self._since_check < self.step_frames or len(self._mfcc) < self.window // 2:
+            return False
+        self._since_check = 0
+
+        # Silence and steady hum never reach the DTW stage
+        if self._energy.max() < self._noise_floor + self.speech_margin:
+            return False
+
+        self.comparisons += 1
+        self.last_score = self.score(self._mfcc, self._energy)
+        if self.last_score <= self.threshold:
+            self.hits += 1
+            self._cooldown = self.cooldown_frames
+            self._mfcc = self._mfcc[:0]
+            self._energy = self._energy[:0]
+            return True
+        return False
+
+
+def _enroll(out_dir, count):
+    import speech_recognition as sr
+
+    os.makedirs(out_dir, exist_ok=True)
+    recognizer = sr.Recognizer()
+    with sr.Microphone(sample_rate=DEFAULT_SAMPLE_RATE) as source:
+        recognizer.adjust_for_ambient_noise(source, duration=0.8)
+        for i in range(count):
+            input(f"[{i + 1}/{count}] Press Enter, then say the wake word once...")
+            audio = recognizer.listen(source, timeout=5, phrase_time_limit=2)
+            path = os.path.join(out_dir, f"wake_{i + 1:02d}.wav")
+            with open(path, "wb") as f:
+                f.write(audio.get_wav_data(convert_rate=DEFAULT_SAMPLE_RATE, convert_width=2))
+            print(f"Saved {path}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="NOVA wake-word templates")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    enroll = sub.add_parser("enroll", help="record wake-word templates from the microphone")
+    enroll.add_argument("out_dir")
+    enroll.add_argument("--count", type=int, default=4)
+    args = parser.parse_args()
+    if args.cmd == "enroll":
+        _enroll(args.out_dir, args.count)
@@ -0,0 +1,237 @@
+"""Cached view of the desktop's top-level windows for "open X" switching.
+
+WindowRegistry keeps one snapshot of the visible, titled windows, ordered
+most recent first, and reuses it for `ttl` seconds. Keyword lookups are
+memoised per snapshot, so repeated or chained commands do no enumeration at
+all, and prefetch() lets the enumeration run while the command is still
+being recognised. The OS side is a provider object: Win32WindowProvider on Windows,
+FakeWindowProvider for tests and benchmarks anywhere else.
+"""
+import threading
+import time
+
+try:
+    import win32gui
+    import win32con
+except ImportError:
+    win32gui = None
+    win32con = None
+
+# Spoken app name -> window-title keywords
+WINDOW_KEYWORDS = {
+    "chrome":        ["google chrome", "chrome"],
+    "google chrome":  ["google chrome", "chrome"],
+    "firefox":       ["mozilla firefox", "firefox"],
+    "edge":          ["microsoft edge", "edge"],
+    "microsoft edge": ["microsoft edge", "edge"],
+    "file explorer":  ["file explorer", "explorer"],
+    "explorer":      ["file explorer", "explorer"],
+    "notepad":       ["notepad"],
+    "vs code":       ["visual studio code"],
+    "visual studio code": ["visual studio code"],
+    "code":          ["visual studio code"],
+    "word":          ["word"],
+    "excel":         ["excel"],
+    "powerpoint":    ["powerpoint"],
+    "spotify":       ["spotify"],
+    "discord":       ["discord"],
+    "telegram":      ["telegram"],
+    "whatsapp":      ["whatsapp"],
+    "calculator":    ["calculator"],
+    "cmd":           ["command prompt", "cmd.exe"],
+    "command prompt": ["command prompt", "cmd.exe"],
+    "terminal":      ["terminal", "windows terminal", "command prompt"],
+}
+
+
+def window_keywords(app_name):
+    """Window-title keywords to search for a given app."""
+    app_lower = app_name.lower()
+    return WINDOW_KEYWORDS.get(app_lower, [app_lower])
+
+
+class WindowProvider:
+    """What WindowRegistry needs from the OS."""
+
+    def list_windows(self):
+        """[(handle, title)] of visible titled windows, front to back."""
+        raise NotImplementedError
+
+    def activate(self, handle):
+        """Restore and focus a window. Returns False if it is gone or refused."""
+        raise NotImplementedError
+
+
+class Win32WindowProvider(WindowProvider):
+    """EnumWindows-backed provider. Requires pywin32."""
+
+    @staticmethod
+    def available():
+        return win32gui is not None and win32con is not None
+
+    def list_windows(self):
+        # Collect handles in the callback and filter afterwards: the callback
+        # is the expensive part, so it does as little as possible.
+        handles = []
+        win32gui.EnumWindows(lambda hwnd, _: handles.append(hwnd), None)
+        visible = win32gui.IsWindowVisible
+        text = win32gui.GetWindowText
+        windows = []
+        for hwnd in handles:
+            if not visible(hwnd):
+                continue
+            title = text(hwnd)
+            if title:
+                windows.append((hwnd, title))
+        return windows
+
+    def activate(self, handle):
+        try:
+            if not win32gui.IsWindow(handle):
+                return False
+            if win32gui.IsIconic(handle):
+                win32gui.ShowWindow(handle, win32con.SW_RESTORE)
+            win32gui.SetForegroundWindow(handle)
+            return True
+        except Exception:
+            return False
+
+
+class FakeWindowProvider(WindowProvider):
+    """In-memory desktop: a list of titles, front to back.
+
+    Counts enumerations and activations so callers can check how often the
+    "OS" was actually asked. Handles are stable integers.
+    """
+
+    def __init__(self, titles=()):
+        self._windows = []
+        self._next = 1
+        self.enumerations = 0
+        self.activations = 0
+        for title in titles:
+            self.open(title)
+
+    def open(self, title):
+        handle = self._next
+        self._next += 1
+        self._windows.insert(0, (handle, title))
+        return handle
+
+    def close(self, handle):
+        self._windows = [w for w in self._windows if w[0] != handle]
+
+    def list_windows(self):
+        self.enumerations += 1
+        return list(self._windows)
+
+    def activate(self, handle):
+        for i, window in enumerate(self._windows):
+            if window[0] == handle:
+                self.activations += 1
+                self._windows.insert(0, self._windows.pop(i))
+                return True
+        return False
+
+
+class WindowRegistry:
+    """Snapshot of open windows with a keyword index.
+
+    provider -- a WindowProvider
+    ttl      -- seconds a snapshot is trusted before the next lookup re-enumerates
+    """
+
+    def __init__(self, provider, ttl=1.5, clock=time.monotonic):
+        self.provider = provider
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._windows = []       # [(handle, lowercase title)], most recent first
+        self._hits = {}          # keyword -> [rank] within this snapshot
+        self._taken = None
+        self.refreshes = 0
+
+    def invalidate(self):
+        """Drop the snapshot, e.g. after launching or closing an app."""
+        with self._lock:
+            self._taken = None
+
+    def _snapshot(self):
+        now = self._clock()
+        if self._taken is not None and now - self._taken < self.ttl:
+            return self._windows
+        try:
+            windows = self.provider.list_windows()
+        except Exception as e:
+            print(f"[Nova] Window enumeration failed: {e}")
+            windows = []
+        self._windows = [(handle, title.lower()) for handle, title in windows]
+        self._hits = {}
+        self._taken = now
+        self.refreshes += 1
+        return self._windows
+
+    def refresh(self):
+        """Take a new snapshot now."""
+        with self._lock:
+            self._taken = None
+            self._snapshot()
+
+    def prefetch(self):
+        """Refresh in the background if the snapshot is stale.
+
+        Called when the wake word is heard, so the enumeration overlaps with
+        recognising the command instead of delaying it.
+        """
+        taken = self._taken
+        if taken is not None and self._clock() - taken < self.ttl:
+            return
+        threading.Thread(target=self.refresh, name="nova-windows", daemon=True).start()
+
+    def windows(self):
+        """[(handle, lowercase title)] of the current snapshot, most recent first."""
+        with self._lock:
+            return list(self._snapshot())
+
+    def find(self, keywords):
+        """Handle of the most recent window whose title contains any keyword, or None."""
+        with self._lock:
+            windows = self._snapshot()
+            best = None
+            for kw in keywords:
+                ranks = self._hits.get(kw)
+                if ranks is None:
+                    ranks = [i for i, (_, title) in enumerate(windows) if kw in title]
+                    self._hits[kw] = ranks
+                if ranks and (best is None or ranks[0] < best):
+                    best = ranks[0]
+            return windows[best][0] if best is not None else None
+
+    def _promote(self, handle):
+        with self._lock:
+            for i, window in enumerate(self._windows):
+                if window[0] == handle:
+                    self._windows.insert(0, self._windows.pop(i))
+                    self._hits = {}
+                    return
+
+    def switch_to(self, app_name, cancelled=None):
+        """Bring an open window of the app to the front. Returns True on success.
+
+        A handle whose window has closed since the snapshot fails to
+        activate; the snapshot is then refreshed and the lookup tried once
+        more. Nothing is activated once the `cancelled` Event is set.
+        """
+        keywords = window_keywords(app_name)
+        for _ in range(2):
+            before = self.refreshes
+            handle = self.find(keywords)
+            if handle is None or (cancelled is not None and cancelled.is_set()):
+                return False
+            if self.provider.activate(handle):
+                self._promote(handle)
+                return True
+            if self.refreshes != before:
+                return False
+            self.invalidate()
+        return False